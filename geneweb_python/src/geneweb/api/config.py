@@ -1,6 +1,6 @@
 """Configuration management for Geneweb API using environment variables."""
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -13,6 +13,15 @@ class SecuritySettings(BaseSettings):
     encryption_key: str = Field(
         default="dev-encryption-key", description="Data encryption key"
     )
+    password_hash_scheme: Literal["argon2", "bcrypt"] = Field(
+        default="argon2", description="Hash scheme for new passwords"
+    )
+    bcrypt_rounds: int = Field(
+        default=12, ge=4, le=31, description="bcrypt cost factor for password hashes"
+    )
+    init_demo_users: bool = Field(
+        default=True, description="Create the default admin and demo users"
+    )
     rate_limit_per_minute: int = Field(default=100, description="Rate limit per minute")
     rate_limit_burst: int = Field(default=20, description="Rate limit burst")
     cors_origins: List[str] = Field(
@@ -3,7 +3,7 @@ Authentication router for login, token refresh, and user management.
 
 This module provides secure authentication endpoints with:
 - JWT-based authentication (access + refresh tokens)
-- Password hashing with bcrypt
+- Password hashing with Argon2id (bcrypt hashes still accepted)
 - Rate limiting protection
 - Audit logging
 - Token refresh and revocation
@@ -21,7 +21,8 @@ from fastapi.security import (
 )
 from pydantic import BaseModel, Field
 
-from ..security.audit import audit_logger
+from ..config import settings
+from ..security.audit import get_audit_logger
 from ..security.auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS,
@@ -88,7 +89,7 @@ async def login(
     Authenticate user and return JWT tokens.
 
     **Security Features:**
-    - Password hashing verification with bcrypt
+    - Password verification (Argon2id or legacy bcrypt)
     - Rate limiting to prevent brute force
     - Failed login attempt tracking
     - Account lockout after multiple failures
@@ -163,7 +164,7 @@ async def login(
 
     # Audit log
     try:
-        await audit_logger.log_user_login(
+        await get_audit_logger().log_user_login(
             user_id=user.id,
             username=user.username,
             ip_address=client_ip,
@@ -358,7 +359,7 @@ async def logout(
 
         # Audit log
         try:
-            await audit_logger.log_user_logout(
+            await get_audit_logger().log_user_logout(
                 user_id=token_data.user_id,
                 username=token_data.username,
                 ip_address=request.client.host if request.client else "unknown",
@@ -439,7 +440,7 @@ async def register(
     - Password strength validation (min 8 characters)
     - Email validation
     - Username uniqueness check
-    - Password hashing with bcrypt
+    - Password hashing with Argon2id
     - Audit logging
 
     **Note:** In production, you may want to:
@@ -484,10 +485,7 @@ async def register(
 
         # Hash password and store user
         hashed_password = auth_service.get_password_hash(user_data.password)
-        auth_service.users_db[user_data.username] = {
-            "user": new_user,
-            "hashed_password": hashed_password,
-        }
+        auth_service.add_user(new_user, hashed_password)
 
         logger.info(
             "New user registered",
@@ -499,7 +497,7 @@ async def register(
 
         # Audit log
         try:
-            await audit_logger.log_user_created(
+            await get_audit_logger().log_user_created(
                 user_id=new_user.id,
                 username=new_user.username,
                 role=new_user.role.value,
@@ -606,7 +604,7 @@ async def change_password(
 
     # Audit log
     try:
-        await audit_logger.log_password_changed(
+        await get_audit_logger().log_password_changed(
             user_id=user.id,
             username=user.username,
             ip_address=request.client.host if request.client else "unknown",
@@ -640,6 +638,6 @@ async def auth_health_check() -> dict:
             "token_type": "JWT",
             "access_token_expiry_minutes": ACCESS_TOKEN_EXPIRE_MINUTES,
             "refresh_token_expiry_days": REFRESH_TOKEN_EXPIRE_DAYS,
-            "password_hashing": "bcrypt",
+            "password_hashing": settings.security.password_hash_scheme,
         },
     }
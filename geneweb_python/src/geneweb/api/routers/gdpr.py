@@ -14,7 +14,7 @@ from ..models.person import (
     PersonConsentUpdate,
     PersonGDPRExport,
 )
-from ..security.audit import audit_logger
+from ..security.audit import get_audit_logger
 from ..security.auth import Permission, SecurityContext
 from ..security.encryption import GDPRAnonymizer
 from ..services.person_service import PersonService
@@ -62,7 +62,9 @@ async def export_person_data(
             )
 
         # Get audit trail for this person
-        audit_trail = await audit_logger.audit_trail.export_gdpr_audit_trail(person_id)
+        audit_trail = await get_audit_logger().audit_trail.export_gdpr_audit_trail(
+            person_id
+        )
 
         # Get GDPR consent history
         consent_history = await person_service.get_consent_history(person_id)
@@ -79,7 +81,7 @@ async def export_person_data(
         )
 
         # Log the export request
-        await audit_logger.log_gdpr_export(
+        await get_audit_logger().log_gdpr_export(
             security_context=security_context, person_id=person_id
         )
 
@@ -176,8 +178,8 @@ async def anonymize_person(
         )
 
         # Log anonymization
-        await audit_logger.audit_trail.log_event(
-            action=audit_logger.audit_trail.AuditAction.ANONYMIZE,
+        await get_audit_logger().audit_trail.log_event(
+            action=get_audit_logger().audit_trail.AuditAction.ANONYMIZE,
             description=f"Person anonymized: {anonymization_request.reason}",
             user_id=security_context.user.user_id,
             username=security_context.user.username,
@@ -191,7 +193,7 @@ async def anonymize_person(
             new_values=anonymized_data,
             data_subject_id=person_id,
             gdpr_lawful_basis=anonymization_request.legal_basis,
-            severity=audit_logger.audit_trail.AuditSeverity.CRITICAL,
+            severity=get_audit_logger().audit_trail.AuditSeverity.CRITICAL,
         )
 
         logger.critical(
@@ -265,11 +267,11 @@ async def update_consent(
 
         # Log consent changes
         for consent in consent_update.consents:
-            await audit_logger.audit_trail.log_event(
+            await get_audit_logger().audit_trail.log_event(
                 action=(
-                    audit_logger.audit_trail.AuditAction.CONSENT_GRANT
+                    get_audit_logger().audit_trail.AuditAction.CONSENT_GRANT
                     if consent.status.value == "granted"
-                    else audit_logger.audit_trail.AuditAction.CONSENT_WITHDRAW
+                    else get_audit_logger().audit_trail.AuditAction.CONSENT_WITHDRAW
                 ),
                 description=f"Consent {consent.status.value} for {consent.purpose}",
                 user_id=security_context.user.user_id,
@@ -16,7 +16,7 @@ from ..models.person import (
     PersonSearchFilters,
     PersonUpdate,
 )
-from ..security.audit import audit_logger
+from ..security.audit import get_audit_logger
 from ..security.auth import (
     Permission,
     SecurityContext,
@@ -88,7 +88,7 @@ async def create_person(
         )
 
         # Log audit event
-        await audit_logger.log_person_created(
+        await get_audit_logger().log_person_created(
             security_context=security_context,
             person_id=person.id,
             person_data=validated_data,
@@ -143,7 +143,7 @@ async def get_person(
             )
 
         # Log access
-        await audit_logger.log_person_accessed(
+        await get_audit_logger().log_person_accessed(
             security_context=security_context, person_id=person_id, access_type="view"
         )
 
@@ -154,7 +154,7 @@ async def get_person(
             status_code=status.HTTP_404_NOT_FOUND, detail="Person not found"
         )
     except PersonAccessDeniedError:
-        await audit_logger.log_access_denied(
+        await get_audit_logger().log_access_denied(
             security_context=security_context,
             resource_type="person",
             resource_id=person_id,
@@ -243,7 +243,7 @@ async def update_person(
         )
 
         # Log audit event with before/after values
-        await audit_logger.log_person_updated(
+        await get_audit_logger().log_person_updated(
             security_context=security_context,
             person_id=person_id,
             old_data=current_person.dict(),
@@ -264,7 +264,7 @@ async def update_person(
             status_code=status.HTTP_404_NOT_FOUND, detail="Person not found"
         )
     except PersonAccessDeniedError:
-        await audit_logger.log_access_denied(
+        await get_audit_logger().log_access_denied(
             security_context=security_context,
             resource_type="person",
             resource_id=person_id,
@@ -310,7 +310,7 @@ async def delete_person(
             await person_service.soft_delete_person(person_id, security_context)
 
         # Log audit event
-        await audit_logger.log_person_deleted(
+        await get_audit_logger().log_person_deleted(
             security_context=security_context,
             person_id=person_id,
             person_data=person.dict(),
@@ -329,7 +329,7 @@ async def delete_person(
             status_code=status.HTTP_404_NOT_FOUND, detail="Person not found"
         )
     except PersonAccessDeniedError:
-        await audit_logger.log_access_denied(
+        await get_audit_logger().log_access_denied(
             security_context=security_context,
             resource_type="person",
             resource_id=person_id,
@@ -5,9 +5,11 @@ Secure audit trail system with cryptographic signatures for GDPR compliance.
 import hashlib
 import hmac
 import json
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
 import structlog
@@ -89,19 +91,134 @@ class AuditEvent(BaseModel):
     metadata: Optional[str] = None  # Encrypted JSON for additional context
 
 
+@dataclass
+class _AuditEventCore:
+    """Validation-free mirror of AuditEvent used on the audit write path.
+
+    Built and signed by ``AuditTrail.log_event``; the Pydantic model is only
+    materialized (via ``model_construct``) once the event is ready to store.
+    """
+
+    __slots__ = tuple(AuditEvent.model_fields)
+
+    id: UUID
+    timestamp: datetime
+    action: AuditAction
+    severity: AuditSeverity
+    description: str
+    user_id: Optional[UUID]
+    username: Optional[str]
+    user_role: Optional[str]
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+    request_id: Optional[UUID]
+    session_id: Optional[str]
+    resource_type: Optional[str]
+    resource_id: Optional[UUID]
+    parent_resource_id: Optional[UUID]
+    old_values: Optional[str]
+    new_values: Optional[str]
+    gdpr_lawful_basis: Optional[str]
+    data_subject_id: Optional[UUID]
+    consent_reference: Optional[str]
+    checksum: Optional[str]
+    chain_hash: Optional[str]
+    metadata: Optional[str]
+
+    def to_event(self) -> AuditEvent:
+        """Materialize the Pydantic event without re-running validation."""
+        return AuditEvent.model_construct(
+            **{name: getattr(self, name) for name in self.__slots__}
+        )
+
+
+@dataclass(frozen=True)
+class _AuditCtx:
+    """Request-scoped user/request fields copied once from a security context."""
+
+    __slots__ = (
+        "user_id",
+        "username",
+        "user_role",
+        "ip_address",
+        "user_agent",
+        "request_id",
+    )
+
+    user_id: Optional[UUID]
+    username: Optional[str]
+    user_role: Optional[str]
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+    request_id: Optional[UUID]
+
+
+def _get_audit_ctx(security_context) -> _AuditCtx:
+    """Return the audit context cached on ``security_context``, building it once."""
+    ctx = getattr(security_context, "_audit_ctx", None)
+    if isinstance(ctx, _AuditCtx):
+        return ctx
+
+    user = security_context.user
+    ctx = _AuditCtx(
+        user_id=user.user_id,
+        username=user.username,
+        user_role=user.role.value,
+        ip_address=security_context.ip_address,
+        user_agent=security_context.user_agent,
+        request_id=security_context.request_id,
+    )
+    security_context._audit_ctx = ctx
+    return ctx
+
+
+# (whole UTC seconds since 0001-01-01, ISO prefix without fraction or offset)
+_iso_cache: Tuple[int, str] = (-1, "")
+
+
+def _fast_utc_iso(dt: datetime) -> str:
+    """Return ``dt.isoformat()``, reusing the formatted prefix within a second.
+
+    Only UTC datetimes take the cached path; anything else falls back to
+    ``isoformat()`` so the output is always identical to it.
+    """
+    global _iso_cache
+    if dt.tzinfo is not timezone.utc:
+        return dt.isoformat()
+
+    key = dt.toordinal() * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+    if _iso_cache[0] != key:
+        _iso_cache = (key, dt.replace(microsecond=0).isoformat()[:-6])
+
+    microsecond = dt.microsecond
+    if microsecond:
+        return f"{_iso_cache[1]}.{microsecond:06d}+00:00"
+    return f"{_iso_cache[1]}+00:00"
+
+
+@lru_cache(maxsize=4)
+def _encode_secret_key(secret_key: str) -> bytes:
+    """Encode the HMAC secret once per distinct key value."""
+    return secret_key.encode()
+
+
 class AuditTrail:
     """Secure audit trail manager with cryptographic integrity."""
 
     def __init__(self):
-        self.secret_key = settings.security.secret_key.encode()
+        self.secret_key = _encode_secret_key(settings.security.secret_key)
         self._last_hash: Optional[str] = None
 
-    def _generate_checksum(self, event: AuditEvent) -> str:
+    def _generate_checksum(self, event: Union[AuditEvent, _AuditEventCore]) -> str:
         """Generate HMAC signature for audit event integrity."""
+        return self._checksum_digest(event).hex()
+
+    def _checksum_digest(self, event: Union[AuditEvent, _AuditEventCore]) -> bytes:
+        """Compute the raw HMAC-SHA256 digest of the canonical event form."""
         # Create canonical representation
         data_to_sign = {
             "id": str(event.id),
-            "timestamp": event.timestamp.isoformat(),
+            "timestamp": _fast_utc_iso(event.timestamp),
             "action": event.action.value,
             "user_id": str(event.user_id) if event.user_id else None,
             "resource_type": event.resource_type,
@@ -115,7 +232,7 @@ class AuditTrail:
 
         return hmac.new(
             self.secret_key, canonical_json.encode("utf-8"), hashlib.sha256
-        ).hexdigest()
+        ).digest()
 
     def _generate_chain_hash(self, current_checksum: str) -> str:
         """Generate hash linking to previous audit event."""
@@ -200,50 +317,79 @@ class AuditTrail:
                     error=str(e),
                 )
 
-        event = AuditEvent(
+        core = _AuditEventCore(
+            id=uuid4(),
+            timestamp=datetime.now(timezone.utc),
             action=action,
-            description=description,
             severity=severity,
+            description=description,
             user_id=user_id,
             username=username,
             user_role=user_role,
             ip_address=ip_address,
             user_agent=user_agent,
             request_id=request_id,
+            session_id=None,
             resource_type=resource_type,
             resource_id=resource_id,
+            parent_resource_id=None,
             old_values=self._encrypt_data_changes(old_values),
             new_values=self._encrypt_data_changes(new_values),
             gdpr_lawful_basis=gdpr_lawful_basis,
             data_subject_id=data_subject_id,
+            consent_reference=None,
+            checksum=None,
+            chain_hash=None,
             metadata=encrypted_metadata,
         )
 
         # Generate cryptographic signatures
-        event.checksum = self._generate_checksum(event)
-        event.chain_hash = self._generate_chain_hash(event.checksum)
+        core.checksum = self._generate_checksum(core)
+        core.chain_hash = self._generate_chain_hash(core.checksum)
 
         # Update chain state
-        self._last_hash = event.chain_hash
+        self._last_hash = core.chain_hash
 
         # Log to structured logger
         logger.info(
             "Audit event",
-            event_id=str(event.id),
+            event_id=str(core.id),
             action=action.value,
             user_id=str(user_id) if user_id else None,
             resource_type=resource_type,
             resource_id=str(resource_id) if resource_id else None,
             severity=severity.value,
             ip_address=ip_address,
-            checksum=event.checksum[:16],  # First 16 chars for logging
+            checksum=core.checksum[:16],  # First 16 chars for logging
         )
 
+        event = core.to_event()
+
         # Store in database (implement database storage)
         await self._store_audit_event(event)
 
         return event
 
+    async def log_event_ctx(
+        self,
+        ctx: _AuditCtx,
+        action: AuditAction,
+        description: str,
+        **resource_kwargs: Any,
+    ) -> AuditEvent:
+        """Log an audit event using a precomputed request context."""
+        return await self.log_event(
+            action=action,
+            description=description,
+            user_id=ctx.user_id,
+            username=ctx.username,
+            user_role=ctx.user_role,
+            ip_address=ctx.ip_address,
+            user_agent=ctx.user_agent,
+            request_id=ctx.request_id,
+            **resource_kwargs,
+        )
+
     async def _store_audit_event(self, event: AuditEvent):
         """Store audit event in database."""
         # TODO: Implement database storage
@@ -253,12 +399,19 @@ class AuditTrail:
     def verify_event_integrity(self, event: AuditEvent) -> bool:
         """Verify cryptographic integrity of audit event."""
         try:
-            expected_checksum = self._generate_checksum(event)
-            return hmac.compare_digest(expected_checksum, event.checksum or "")
+            expected_digest = self._checksum_digest(event)
         except Exception as e:
             logger.error("Audit integrity verification failed", error=str(e))
             return False
 
+        try:
+            stored_digest = bytes.fromhex(event.checksum or "")
+        except ValueError:
+            # Not a hex digest, so it cannot have been produced by this trail
+            return False
+
+        return hmac.compare_digest(expected_digest, stored_digest)
+
     async def get_audit_trail(
         self,
         resource_type: Optional[str] = None,
@@ -311,13 +464,19 @@ class AuditTrail:
 
             decrypted_events.append(event_dict)
 
+        # Stop at the first tampered event instead of verifying the whole trail
+        failed_event_id = next(
+            (e.id for e in events if not self.verify_event_integrity(e)), None
+        )
+
         return {
             "data_subject_id": str(data_subject_id),
-            "export_timestamp": datetime.now(timezone.utc).isoformat(),
+            "export_timestamp": _fast_utc_iso(datetime.now(timezone.utc)),
             "total_events": len(decrypted_events),
             "events": decrypted_events,
-            "integrity_verified": all(
-                self.verify_event_integrity(event) for event in events
+            "integrity_verified": failed_event_id is None,
+            "first_tampered_event": (
+                str(failed_event_id) if failed_event_id is not None else None
             ),
         }
 
@@ -332,18 +491,13 @@ class AuditLogger:
         self, security_context, person_id: UUID, person_data: Dict[str, Any]
     ):
         """Log person creation."""
-        await self.audit_trail.log_event(
+        await self.audit_trail.log_event_ctx(
+            _get_audit_ctx(security_context),
             action=AuditAction.CREATE,
             description=(
                 f"Person created: {person_data.get('first_name', '')} "
                 f"{person_data.get('last_name', '')}"
             ),
-            user_id=security_context.user.user_id,
-            username=security_context.user.username,
-            user_role=security_context.user.role.value,
-            ip_address=security_context.ip_address,
-            user_agent=security_context.user_agent,
-            request_id=security_context.request_id,
             resource_type="person",
             resource_id=person_id,
             new_values=person_data,
@@ -359,15 +513,10 @@ class AuditLogger:
         new_data: Dict[str, Any],
     ):
         """Log person update."""
-        await self.audit_trail.log_event(
+        await self.audit_trail.log_event_ctx(
+            _get_audit_ctx(security_context),
             action=AuditAction.UPDATE,
             description=f"Person updated: {person_id}",
-            user_id=security_context.user.user_id,
-            username=security_context.user.username,
-            user_role=security_context.user.role.value,
-            ip_address=security_context.ip_address,
-            user_agent=security_context.user_agent,
-            request_id=security_context.request_id,
             resource_type="person",
             resource_id=person_id,
             old_values=old_data,
@@ -380,15 +529,10 @@ class AuditLogger:
         self, security_context, person_id: UUID, person_data: Dict[str, Any]
     ):
         """Log person deletion/anonymization."""
-        await self.audit_trail.log_event(
+        await self.audit_trail.log_event_ctx(
+            _get_audit_ctx(security_context),
             action=AuditAction.DELETE,
             description=f"Person deleted/anonymized: {person_id}",
-            user_id=security_context.user.user_id,
-            username=security_context.user.username,
-            user_role=security_context.user.role.value,
-            ip_address=security_context.ip_address,
-            user_agent=security_context.user_agent,
-            request_id=security_context.request_id,
             resource_type="person",
             resource_id=person_id,
             old_values=person_data,
@@ -401,15 +545,10 @@ class AuditLogger:
         self, security_context, person_id: UUID, access_type: str = "view"
     ):
         """Log person data access."""
-        await self.audit_trail.log_event(
+        await self.audit_trail.log_event_ctx(
+            _get_audit_ctx(security_context),
             action=AuditAction.READ,
             description=f"Person data accessed: {access_type}",
-            user_id=security_context.user.user_id,
-            username=security_context.user.username,
-            user_role=security_context.user.role.value,
-            ip_address=security_context.ip_address,
-            user_agent=security_context.user_agent,
-            request_id=security_context.request_id,
             resource_type="person",
             resource_id=person_id,
             data_subject_id=person_id,
@@ -418,15 +557,10 @@ class AuditLogger:
 
     async def log_gdpr_export(self, security_context, person_id: UUID):
         """Log GDPR data export."""
-        await self.audit_trail.log_event(
+        await self.audit_trail.log_event_ctx(
+            _get_audit_ctx(security_context),
             action=AuditAction.EXPORT,
             description="GDPR data export requested",
-            user_id=security_context.user.user_id,
-            username=security_context.user.username,
-            user_role=security_context.user.role.value,
-            ip_address=security_context.ip_address,
-            user_agent=security_context.user_agent,
-            request_id=security_context.request_id,
             resource_type="person",
             resource_id=person_id,
             data_subject_id=person_id,
@@ -442,15 +576,10 @@ class AuditLogger:
         reason: str,
     ):
         """Log access denied attempts."""
-        await self.audit_trail.log_event(
+        await self.audit_trail.log_event_ctx(
+            _get_audit_ctx(security_context),
             action=AuditAction.ACCESS_DENIED,
             description=f"Access denied: {reason}",
-            user_id=security_context.user.user_id,
-            username=security_context.user.username,
-            user_role=security_context.user.role.value,
-            ip_address=security_context.ip_address,
-            user_agent=security_context.user_agent,
-            request_id=security_context.request_id,
             resource_type=resource_type,
             resource_id=resource_id,
             severity=AuditSeverity.WARNING,
@@ -549,5 +678,13 @@ class AuditLogger:
         )
 
 
-# Global audit logger instance
-audit_logger = AuditLogger()
+# Global audit logger instance, created on first use
+_audit_logger: Optional[AuditLogger] = None
+
+
+def get_audit_logger() -> AuditLogger:
+    """Get or create global audit logger instance."""
+    global _audit_logger
+    if _audit_logger is None:
+        _audit_logger = AuditLogger()
+    return _audit_logger
@@ -2,72 +2,114 @@
 Role-Based Access Control (RBAC) system for Geneweb API.
 """
 
+import base64
+import binascii
+import hashlib
+import hmac
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 from uuid import UUID, uuid4
 
+import bcrypt
+import orjson
 import structlog
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer
 from jose import JWTError, jwt
-from pydantic import BaseModel, Field
+from jose.exceptions import JWTClaimsError
+from pydantic import BaseModel, Field, PrivateAttr
 
 from ..config import settings
 
-# Configure bcrypt to handle long passwords before importing passlib
-# This prevents errors during passlib's backend initialization
-try:
-    import bcrypt
-
-    # Fix bcrypt version detection for newer versions
-    if not hasattr(bcrypt, "__about__"):
-        # Create a mock __about__ module to prevent passlib warnings
-        class _About:
-            __version__ = (
-                bcrypt.__version__ if hasattr(bcrypt, "__version__") else "4.0.0"
-            )
+logger = structlog.get_logger(__name__)
 
-        bcrypt.__about__ = _About()
+# Argon2id hasher for new password hashes
+_argon2_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
 
-    # Monkey-patch bcrypt.hashpw to truncate passwords
-    _original_hashpw = bcrypt.hashpw
-    _original_checkpw = bcrypt.checkpw
+# bcrypt only uses the first 72 bytes of a password (newer releases raise
+# ValueError instead of silently truncating), so truncate explicitly.
+BCRYPT_MAX_PASSWORD_BYTES = 72
 
-    def _safe_hashpw(password, salt):
-        """Wrap bcrypt.hashpw to truncate passwords to 72 bytes."""
-        if isinstance(password, str):
-            password = password.encode("utf-8")
-        if len(password) > 72:
-            password = password[:72]
-        return _original_hashpw(password, salt)
 
-    def _safe_checkpw(password, hashed_password):
-        """Wrap bcrypt.checkpw to truncate passwords to 72 bytes."""
-        if isinstance(password, str):
-            password = password.encode("utf-8")
-        if len(password) > 72:
-            password = password[:72]
-        return _original_checkpw(password, hashed_password)
+def _password_bytes(password: Union[str, bytes]) -> bytes:
+    """Encode a password for bcrypt, truncated to 72 bytes."""
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+    if len(password) > BCRYPT_MAX_PASSWORD_BYTES:
+        password = password[:BCRYPT_MAX_PASSWORD_BYTES]
+    return password
 
-    bcrypt.hashpw = _safe_hashpw
-    bcrypt.checkpw = _safe_checkpw
-except ImportError:
-    pass  # bcrypt not available, passlib will handle it
 
-from passlib.context import CryptContext
+def _uses_bcrypt() -> bool:
+    """Whether new hashes should use bcrypt instead of Argon2id."""
+    return settings.security.password_hash_scheme == "bcrypt"
 
-logger = structlog.get_logger(__name__)
 
+def hash_password(password: Union[str, bytes]) -> str:
+    """Hash a password with the configured scheme (Argon2id by default)."""
+    if _uses_bcrypt():
+        salt = bcrypt.gensalt(rounds=settings.security.bcrypt_rounds)
+        return bcrypt.hashpw(_password_bytes(password), salt).decode("utf-8")
+    return _argon2_hasher.hash(password)
+
+
+def check_password(password: Union[str, bytes], hashed_password: str) -> bool:
+    """Check a password against an Argon2id or bcrypt hash."""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _argon2_hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    try:
+        return bcrypt.checkpw(
+            _password_bytes(password), hashed_password.encode("utf-8")
+        )
+    except ValueError:
+        # Malformed or unknown hash
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a hash was made with another scheme or outdated parameters."""
+    if _uses_bcrypt():
+        return not hashed_password.startswith(
+            f"$2b${settings.security.bcrypt_rounds:02d}$"
+        )
+
+    if not hashed_password.startswith("$argon2"):
+        return True
+    try:
+        return _argon2_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+
+# Hash checked for unknown usernames so that failed logins cost the same
+# whether or not the user exists; computed once, on first use
+_dummy_password_hash: Optional[str] = None
+
+
+def get_dummy_password_hash() -> str:
+    """Get or create the hash used to equalize unknown-user login timing."""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = hash_password(secrets.token_urlsafe(16))
+    return _dummy_password_hash
 
-# Password hashing context
-# Note: bcrypt is monkey-patched above to handle passwords > 72 bytes
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # JWT settings
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+_ACCESS_TOKEN_LIFETIME = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_TOKEN_LIFETIME = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
 
 
 class UserRole(str, Enum):
@@ -103,15 +145,25 @@ class Permission(str, Enum):
 
 # Role-permission mapping
 # Simplified: Both USER and ADMIN have all permissions
-ROLE_PERMISSIONS: Dict[UserRole, Set[Permission]] = {
-    UserRole.USER: {
+ROLE_PERMISSIONS: Dict[UserRole, FrozenSet[Permission]] = {
+    UserRole.USER: frozenset(
         # All permissions for regular users
-        *Permission.__members__.values()
-    },
-    UserRole.ADMIN: {
+        Permission.__members__.values()
+    ),
+    UserRole.ADMIN: frozenset(
         # All permissions for admins
-        *Permission.__members__.values()
-    },
+        Permission.__members__.values()
+    ),
+}
+
+# Claim value -> enum member, used when decoding tokens
+_STR_TO_ROLE: Dict[str, UserRole] = {r.value: r for r in UserRole}
+_STR_TO_PERMISSION: Dict[str, Permission] = {p.value: p for p in Permission}
+
+# Token "permissions" claim per role, in Permission declaration order
+_ROLE_PERMISSION_VALUES: Dict[UserRole, List[str]] = {
+    role: [p.value for p in Permission if p in perms]
+    for role, perms in ROLE_PERMISSIONS.items()
 }
 
 
@@ -177,18 +229,163 @@ class TokenData(BaseModel):
     family_person_id: Optional[UUID] = None
     related_person_ids: Set[UUID] = Field(default_factory=set)
 
+    # Set view of ``permissions`` for O(1) membership checks
+    _permissions_set: FrozenSet[Permission] = PrivateAttr(default_factory=frozenset)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._permissions_set = frozenset(self.permissions)
+
+    def has_permission(self, permission: Permission) -> bool:
+        """Check if the token grants a permission."""
+        return permission in self._permissions_set
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _fast_verify_hs256(token: str, secret_key: str) -> Dict[str, Any]:
+    """
+    Verify an HS256 JWT and return its claims.
+
+    Only checks what our own access tokens need (algorithm, signature, claim
+    types), which is much cheaper than ``jwt.decode``; expiry is left to the
+    caller. Refresh tokens still go through python-jose.
+
+    Raises:
+        JWTError: If the token is malformed or the signature does not match
+    """
+    if token.count(".") != 2:
+        raise JWTError("Not enough segments")
+
+    signing_input, _, signature_segment = token.rpartition(".")
+    header_segment, _, payload_segment = signing_input.partition(".")
+    try:
+        header = orjson.loads(_b64url_decode(header_segment))
+        signature = _b64url_decode(signature_segment)
+    except (binascii.Error, ValueError):
+        raise JWTError("Invalid header or signature padding")
+
+    if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+        raise JWTError("The specified alg value is not allowed")
+
+    expected = hmac.new(
+        secret_key.encode("utf-8"), signing_input.encode("utf-8"), hashlib.sha256
+    ).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise JWTError("Signature verification failed.")
+
+    try:
+        payload = orjson.loads(_b64url_decode(payload_segment))
+    except (binascii.Error, ValueError):
+        raise JWTError("Invalid payload string")
+
+    if not isinstance(payload, dict):
+        raise JWTError("Invalid payload string: must be a json object")
+
+    exp = payload.get("exp")
+    if exp is not None and (isinstance(exp, bool) or not isinstance(exp, int)):
+        raise JWTClaimsError("Expiration Time claim (exp) must be an integer.")
+
+    return payload
+
+
+@lru_cache(maxsize=4096)
+def _decode_access_token(
+    token: str, secret_key: str
+) -> Tuple[TokenData, Optional[str], Optional[int]]:
+    """
+    Decode and validate an access token.
+
+    Results are cached per (token, key) since a signed token never changes;
+    callers must still check the returned expiry and the blacklist.
+
+    Returns:
+        Tuple of (token data, JWT ID, expiry as a Unix timestamp)
+
+    Raises:
+        JWTError: If the signature or claims are invalid
+        HTTPException: If required claims are missing or the type is wrong
+    """
+    payload = _fast_verify_hs256(token, secret_key)
+
+    user_id = payload.get("sub")
+    username = payload.get("username")
+    role = payload.get("role")
+    permissions = payload.get("permissions", [])
+    token_type = payload.get("type", "access")
+
+    if user_id is None or username is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+
+    if token_type != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type",
+        )
+
+    # Convert strings back to proper types
+    family_person_id = None
+    if payload.get("family_person_id"):
+        family_person_id = UUID(payload["family_person_id"])
+
+    related_person_ids = set(map(UUID, payload.get("related_person_ids") or ()))
+
+    try:
+        token_role = _STR_TO_ROLE[role]
+        token_permissions = [_STR_TO_PERMISSION[p] for p in permissions]
+    except (KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+
+    # Every field is already converted from our own signed claims, so skip
+    # re-validating them
+    token_data = TokenData.model_construct(
+        user_id=UUID(user_id),
+        username=username,
+        role=token_role,
+        permissions=token_permissions,
+        family_person_id=family_person_id,
+        related_person_ids=related_person_ids,
+    )
+    return token_data, payload.get("jti"), payload.get("exp")
+
 
 class AuthService:
     """Authentication service for user management."""
 
+    # Default users (with hashed passwords) shared by every instance, so the
+    # bcrypt work in _initialize_default_users only happens once per process
+    _default_users: Optional[Dict[str, Dict]] = None
+
     def __init__(self):
         self.security = HTTPBearer()
         # In-memory user database (in production, use real database)
         self.users_db: Dict[str, Dict] = {}
-        self._initialize_default_users()
+        # Same entries as users_db, keyed by lower-cased email
+        self.users_by_email: Dict[str, Dict] = {}
+        if settings.security.init_demo_users:
+            self._initialize_default_users()
 
     def _initialize_default_users(self):
         """Initialize default admin and demo users."""
+        if AuthService._default_users is None:
+            AuthService._default_users = self._build_default_users()
+
+        # Copy so that per-instance changes (logins, password changes) stay local
+        for user_data in AuthService._default_users.values():
+            self.add_user(
+                user_data["user"].model_copy(deep=True), user_data["hashed_password"]
+            )
+
+        logger.info("Default users initialized", users=list(self.users_db.keys()))
+
+    def _build_default_users(self) -> Dict[str, Dict]:
+        """Create the default admin and demo users with hashed passwords."""
         # Create default admin user
         admin_user = User(
             username="admin",
@@ -197,12 +394,6 @@ class AuthService:
             role=UserRole.ADMIN,
             is_active=True,
         )
-        self.users_db["admin"] = {
-            "user": admin_user,
-            "hashed_password": self.get_password_hash(
-                "admin123"
-            ),  # Change in production!
-        }
 
         # Create demo family user
         demo_user = User(
@@ -212,43 +403,54 @@ class AuthService:
             role=UserRole.USER,
             is_active=True,
         )
-        self.users_db["demo"] = {
-            "user": demo_user,
-            "hashed_password": self.get_password_hash(
-                "demo1234"
-            ),  # Changed to meet 8-char minimum
+
+        return {
+            "admin": {
+                "user": admin_user,
+                "hashed_password": self.get_password_hash(
+                    "admin123"
+                ),  # Change in production!
+            },
+            "demo": {
+                "user": demo_user,
+                "hashed_password": self.get_password_hash(
+                    "demo1234"
+                ),  # Changed to meet 8-char minimum
+            },
         }
 
-        logger.info("Default users initialized", users=list(self.users_db.keys()))
+    def add_user(self, user: User, hashed_password: str) -> None:
+        """Store a user in the database and the email index."""
+        user_data = {"user": user, "hashed_password": hashed_password}
+        self.users_db[user.username] = user_data
+        self.users_by_email[user.email.lower()] = user_data
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        return pwd_context.verify(plain_password, hashed_password)
+        return check_password(plain_password, hashed_password)
 
     def get_password_hash(self, password: str) -> str:
         """Hash a password."""
-        return pwd_context.hash(password)
+        return hash_password(password)
 
     def create_access_token(self, user: User) -> str:
         """Create JWT access token with JTI for revocation support."""
-        permissions = list(ROLE_PERMISSIONS.get(user.role, set()))
-
         # Generate unique token ID for blacklist tracking
-        token_id = str(uuid4())
+        token_id = secrets.token_urlsafe(16)
+        now = datetime.now(timezone.utc)
 
         payload = {
             "jti": token_id,  # JWT ID for blacklist
             "sub": str(user.id),
             "username": user.username,
             "role": user.role.value,
-            "permissions": [p.value for p in permissions],
+            "permissions": _ROLE_PERMISSION_VALUES.get(user.role, []),
             "family_person_id": (
                 str(user.family_person_id) if user.family_person_id else None
             ),
             "related_person_ids": [str(pid) for pid in user.related_person_ids],
-            "exp": datetime.now(timezone.utc)
-            + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-            "iat": datetime.now(timezone.utc),
+            "exp": now + _ACCESS_TOKEN_LIFETIME,
+            "iat": now,
             "type": "access",
         }
 
@@ -257,15 +459,15 @@ class AuthService:
     def create_refresh_token(self, user: User) -> str:
         """Create JWT refresh token with JTI for revocation support."""
         # Generate unique token ID for blacklist tracking
-        token_id = str(uuid4())
+        token_id = secrets.token_urlsafe(16)
+        now = datetime.now(timezone.utc)
 
         payload = {
             "jti": token_id,  # JWT ID for blacklist
             "sub": str(user.id),
             "username": user.username,
-            "exp": datetime.now(timezone.utc)
-            + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
-            "iat": datetime.now(timezone.utc),
+            "exp": now + _REFRESH_TOKEN_LIFETIME,
+            "iat": now,
             "type": "refresh",
         }
 
@@ -286,68 +488,39 @@ class AuthService:
             HTTPException: If token is invalid, expired, or blacklisted
         """
         try:
-            payload = jwt.decode(
-                token, settings.security.secret_key, algorithms=[ALGORITHM]
+            token_data, token_id, expires_at = _decode_access_token(
+                token, settings.security.secret_key
+            )
+        except JWTError as e:
+            logger.warning("JWT verification failed", error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
 
-            user_id = payload.get("sub")
-            username = payload.get("username")
-            role = payload.get("role")
-            permissions = payload.get("permissions", [])
-            token_type = payload.get("type", "access")
-            token_id = payload.get("jti")
+        # A cached decode may outlive the token, so re-check expiry on every call
+        if expires_at is not None and expires_at <= time.time():
+            logger.warning("JWT verification failed", error="Signature has expired.")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            )
 
-            if user_id is None or username is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-                )
+        # Check if token is blacklisted (revoked)
+        if check_blacklist and token_id:
+            from .token_blacklist import token_blacklist
 
-            if token_type != "access":
+            if token_blacklist.is_blacklisted(token_id):
+                logger.warning(
+                    "Attempt to use blacklisted token",
+                    token_id=token_id[:8] + "...",
+                    username=token_data.username,
+                )
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token type",
+                    detail="Token has been revoked",
                 )
 
-            # Check if token is blacklisted (revoked)
-            if check_blacklist and token_id:
-                from .token_blacklist import token_blacklist
-
-                if token_blacklist.is_blacklisted(token_id):
-                    logger.warning(
-                        "Attempt to use blacklisted token",
-                        token_id=token_id[:8] + "...",
-                        username=username,
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token has been revoked",
-                    )
-
-            # Convert strings back to proper types
-            family_person_id = None
-            if payload.get("family_person_id"):
-                family_person_id = UUID(payload["family_person_id"])
-
-            related_person_ids = set()
-            if payload.get("related_person_ids"):
-                related_person_ids = {
-                    UUID(pid) for pid in payload["related_person_ids"]
-                }
-
-            return TokenData(
-                user_id=UUID(user_id),
-                username=username,
-                role=UserRole(role),
-                permissions=[Permission(p) for p in permissions],
-                family_person_id=family_person_id,
-                related_person_ids=related_person_ids,
-            )
-
-        except JWTError as e:
-            logger.warning("JWT verification failed", error=str(e))
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-            )
+        # Hand out a copy so callers never share the cached instance
+        return token_data.model_copy()
 
     def verify_refresh_token(self, token: str) -> TokenData:
         """Verify and decode refresh JWT token."""
@@ -392,11 +565,18 @@ class AuthService:
         """Authenticate user credentials."""
         user_data = self.users_db.get(username)
         if not user_data:
+            # Still pay for a hash check so response time does not reveal
+            # which usernames exist
+            self.verify_password(password, get_dummy_password_hash())
             return None
 
         if not self.verify_password(password, user_data["hashed_password"]):
             return None
 
+        # Migrate legacy (bcrypt) or outdated hashes now that we know the password
+        if password_needs_rehash(user_data["hashed_password"]):
+            user_data["hashed_password"] = self.get_password_hash(password)
+
         return user_data["user"]
 
     def get_user_by_username(self, username: str) -> Optional[User]:
@@ -406,14 +586,12 @@ class AuthService:
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email from database."""
-        for user_data in self.users_db.values():
-            if user_data["user"].email == email:
-                return user_data["user"]
-        return None
+        user_data = self.users_by_email.get(email.lower())
+        return user_data["user"] if user_data else None
 
     def has_permission(self, user_role: UserRole, permission: Permission) -> bool:
         """Check if user role has specific permission."""
-        return permission in ROLE_PERMISSIONS.get(user_role, set())
+        return permission in ROLE_PERMISSIONS.get(user_role, frozenset())
 
     def can_access_person(
         self, user: TokenData, person_id: UUID, action: Permission
@@ -448,11 +626,10 @@ class SecurityContext:
 
     def has_permission(self, permission: Permission) -> bool:
         """Check if current user has permission."""
-        return permission in self.user.permissions
+        return self.user.has_permission(permission)
 
     def can_access_person(self, person_id: UUID, action: Permission) -> bool:
         """Check if current user can access person for action."""
-        auth_service = AuthService()
         return auth_service.can_access_person(self.user, person_id, action)
 
     def require_permission(self, permission: Permission):
@@ -2,20 +2,37 @@
 Advanced encryption system for sensitive personal data with GDPR compliance.
 """
 
-import base64
 import hashlib
-import json
 import os
-from typing import Any, Optional, Union
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Union
 
+import orjson
 import structlog
 from cryptography.fernet import Fernet
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+try:
+    # SIMD base64 codec with the same API as the standard library module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 logger = structlog.get_logger(__name__)
 
+# Leading byte of AES-GCM payloads; legacy Fernet tokens start with "g" instead
+_GCM_VERSION = b"\x01"
+_GCM_NONCE_SIZE = 12
+
+
+def _dumps_json(data: Any) -> bytes:
+    """Serialize to UTF-8 JSON; UUIDs/datetimes natively, other objects via str."""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
 
 class EncryptionError(Exception):
     """Custom exception for encryption errors."""
@@ -23,6 +40,20 @@ class EncryptionError(Exception):
     pass
 
 
+@lru_cache(maxsize=8)
+def _derive_master_key(master_key: bytes) -> bytes:
+    """Stretch the master key with PBKDF2 (once per process and key)."""
+    salt = b"geneweb_salt_2024"  # In production, use random salt per installation
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+        backend=default_backend(),
+    )
+    return kdf.derive(master_key)
+
+
 class DataEncryptor:
     """AES-256 encryption for sensitive personal data."""
 
@@ -38,20 +69,23 @@ class DataEncryptor:
         self.master_key = (
             master_key.encode() if isinstance(master_key, str) else master_key
         )
-        self._fernet = self._create_fernet()
+        self._aead = self._create_aead()
+        self._legacy_fernet: Optional[Fernet] = None
 
-    def _create_fernet(self) -> Fernet:
-        """Create Fernet instance from master key."""
-        # Derive key using PBKDF2
-        salt = b"geneweb_salt_2024"  # In production, use random salt per installation
-        kdf = PBKDF2HMAC(
+    def _create_aead(self) -> AESGCM:
+        """Create AES-256-GCM cipher from a subkey of the stretched master key."""
+        hkdf = HKDF(
             algorithm=hashes.SHA256(),
             length=32,
-            salt=salt,
-            iterations=100000,
+            salt=None,
+            info=b"geneweb-data-enc",
             backend=default_backend(),
         )
-        key = base64.urlsafe_b64encode(kdf.derive(self.master_key))
+        return AESGCM(hkdf.derive(_derive_master_key(self.master_key)))
+
+    def _create_fernet(self) -> Fernet:
+        """Create Fernet instance used to read data encrypted before AES-GCM."""
+        key = base64.urlsafe_b64encode(_derive_master_key(self.master_key))
         return Fernet(key)
 
     def encrypt(self, data: Union[str, bytes, None]) -> Optional[str]:
@@ -63,8 +97,11 @@ class DataEncryptor:
             if isinstance(data, str):
                 data = data.encode("utf-8")
 
-            encrypted = self._fernet.encrypt(data)
-            return base64.urlsafe_b64encode(encrypted).decode("utf-8")
+            nonce = os.urandom(_GCM_NONCE_SIZE)
+            encrypted = self._aead.encrypt(nonce, data, None)
+            return base64.urlsafe_b64encode(_GCM_VERSION + nonce + encrypted).decode(
+                "ascii"
+            )
 
         except Exception as e:
             logger.error("Encryption failed", error=str(e))
@@ -76,22 +113,32 @@ class DataEncryptor:
             return None
 
         try:
-            encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode("utf-8"))
-            decrypted = self._fernet.decrypt(encrypted_bytes)
-            return decrypted.decode("utf-8")
+            return self._decrypt_bytes(encrypted_data).decode("utf-8")
 
         except Exception as e:
             logger.error("Decryption failed", error=str(e))
             raise EncryptionError(f"Failed to decrypt data: {str(e)}")
 
+    def _decrypt_bytes(self, encrypted_data: str) -> bytes:
+        """Decrypt to raw bytes, accepting both AES-GCM and legacy Fernet data."""
+        encrypted_bytes = base64.urlsafe_b64decode(encrypted_data)
+        if encrypted_bytes[:1] == _GCM_VERSION:
+            nonce_end = 1 + _GCM_NONCE_SIZE
+            return self._aead.decrypt(
+                encrypted_bytes[1:nonce_end], encrypted_bytes[nonce_end:], None
+            )
+
+        if self._legacy_fernet is None:
+            self._legacy_fernet = self._create_fernet()
+        return self._legacy_fernet.decrypt(encrypted_bytes)
+
     def encrypt_json(self, data: Any) -> Optional[str]:
         """Encrypt complex data as JSON."""
         if data is None:
             return None
 
         try:
-            json_data = json.dumps(data, default=str)
-            return self.encrypt(json_data)
+            return self.encrypt(_dumps_json(data))
 
         except Exception as e:
             logger.error("JSON encryption failed", error=str(e))
@@ -103,15 +150,97 @@ class DataEncryptor:
             return None
 
         try:
-            json_data = self.decrypt(encrypted_data)
-            if json_data is None:
-                return None
-            return json.loads(json_data)
+            return orjson.loads(self._decrypt_bytes(encrypted_data))
 
         except Exception as e:
             logger.error("JSON decryption failed", error=str(e))
             raise EncryptionError(f"Failed to decrypt JSON data: {str(e)}")
 
+    def _encrypt_many(self, payloads: Iterable[Optional[bytes]]) -> List[Optional[str]]:
+        """Encrypt many payloads, sharing the cipher and a single nonce draw."""
+        payloads = list(payloads)
+        nonces = os.urandom(_GCM_NONCE_SIZE * len(payloads))
+        aead_encrypt = self._aead.encrypt
+        b64encode = base64.urlsafe_b64encode
+
+        results: List[Optional[str]] = []
+        for index, payload in enumerate(payloads):
+            if payload is None:
+                results.append(None)
+                continue
+
+            offset = index * _GCM_NONCE_SIZE
+            nonce = nonces[offset : offset + _GCM_NONCE_SIZE]
+            encrypted = aead_encrypt(nonce, payload, None)
+            results.append(b64encode(_GCM_VERSION + nonce + encrypted).decode("ascii"))
+
+        return results
+
+    def encrypt_batch(
+        self, values: Iterable[Union[str, bytes, None]]
+    ) -> List[Optional[str]]:
+        """Encrypt many values in one pass; ``None`` values stay ``None``."""
+        try:
+            return self._encrypt_many(
+                value.encode("utf-8") if isinstance(value, str) else value
+                for value in values
+            )
+
+        except Exception as e:
+            logger.error("Batch encryption failed", error=str(e))
+            raise EncryptionError(f"Failed to encrypt batch: {str(e)}")
+
+    def decrypt_batch(
+        self, encrypted_values: Iterable[Optional[str]]
+    ) -> List[Optional[str]]:
+        """Decrypt many values encrypted by this encryptor."""
+        try:
+            return [
+                (
+                    None
+                    if encrypted is None
+                    else self._decrypt_bytes(encrypted).decode("utf-8")
+                )
+                for encrypted in encrypted_values
+            ]
+
+        except Exception as e:
+            logger.error("Batch decryption failed", error=str(e))
+            raise EncryptionError(f"Failed to decrypt batch: {str(e)}")
+
+    def encrypt_json_batch(self, records: Iterable[Any]) -> List[Optional[str]]:
+        """Encrypt many records as JSON in one pass.
+
+        Shares the cipher and draws all nonces with a single ``os.urandom``
+        call; ``None`` records stay ``None``.
+        """
+        try:
+            return self._encrypt_many(
+                None if record is None else _dumps_json(record) for record in records
+            )
+
+        except Exception as e:
+            logger.error("Batch JSON encryption failed", error=str(e))
+            raise EncryptionError(f"Failed to encrypt JSON batch: {str(e)}")
+
+    def decrypt_json_batch(
+        self, encrypted_records: Iterable[Optional[str]]
+    ) -> List[Any]:
+        """Decrypt many JSON records encrypted by this encryptor."""
+        try:
+            return [
+                (
+                    None
+                    if encrypted is None
+                    else orjson.loads(self._decrypt_bytes(encrypted))
+                )
+                for encrypted in encrypted_records
+            ]
+
+        except Exception as e:
+            logger.error("Batch JSON decryption failed", error=str(e))
+            raise EncryptionError(f"Failed to decrypt JSON batch: {str(e)}")
+
 
 # Global encryptor instance
 _encryptor: Optional[DataEncryptor] = None
@@ -154,6 +283,36 @@ def decrypt_sensitive_data(encrypted_data: Optional[str]) -> Optional[str]:
         return encrypted_data
 
 
+def encrypt_sensitive_data_batch(
+    values: Iterable[Union[str, bytes, None]],
+) -> List[Optional[str]]:
+    """Convenience function to encrypt many sensitive values at once."""
+    values = list(values)
+    try:
+        return get_encryptor().encrypt_batch(values)
+    except Exception as e:
+        logger.warning(
+            "Encryption unavailable, returning plaintext (development fallback)",
+            error=str(e),
+        )
+        return [
+            value if value is None or isinstance(value, str) else value.decode("utf-8")
+            for value in values
+        ]
+
+
+def decrypt_sensitive_data_batch(
+    encrypted_values: Iterable[Optional[str]],
+) -> List[Optional[str]]:
+    """Convenience function to decrypt many sensitive values at once."""
+    encrypted_values = list(encrypted_values)
+    try:
+        return get_encryptor().decrypt_batch(encrypted_values)
+    except Exception:
+        # Fall back per value, so one bad value does not hide the others
+        return [decrypt_sensitive_data(value) for value in encrypted_values]
+
+
 def encrypt_json_data(data: Any) -> Optional[str]:
     """Convenience function to encrypt JSON data."""
     try:
@@ -163,7 +322,7 @@ def encrypt_json_data(data: Any) -> Optional[str]:
             "JSON encryption unavailable, returning json dump as fallback", error=str(e)
         )
         try:
-            return json.dumps(data, default=str)
+            return _dumps_json(data).decode("utf-8")
         except Exception:
             return None
 
@@ -212,43 +371,47 @@ class EncryptedField:
                 raise
 
 
+# SHA-256 states pre-seeded with the constant prefixes; copied per hash
+_ANON_ID_HASH = hashlib.sha256(b"anon_")
+_GDPR_ANON_HASH = hashlib.sha256(b"gdpr_anon_")
+
+
 class GDPRAnonymizer:
     """GDPR-compliant data anonymization."""
 
     @staticmethod
     def anonymize_person_data(person_data: dict) -> dict:
         """Anonymize person data according to GDPR Article 17."""
-        anonymized = person_data.copy()
-
         # Generate consistent anonymous ID
         original_id = str(person_data.get("id", ""))
-        anonymous_id = hashlib.sha256(f"anon_{original_id}".encode()).hexdigest()[:16]
-
-        # Anonymize identifiable fields
-        anonymized.update(
-            {
-                "first_name": f"Anonymous_{anonymous_id[:8]}",
-                "last_name": "Person",
-                "nickname": None,
-                "email": None,
-                "phone": None,
-                "address": None,
-                "birth_place": "Unknown",
-                "death_place": "Unknown" if person_data.get("death_place") else None,
-                "notes": "Data anonymized per GDPR Article 17",
-                "occupation": "Unknown",
-                # Keep statistical data (anonymized)
-                "birth_date": person_data.get("birth_date"),  # Keep for demographics
-                "death_date": person_data.get("death_date"),
-                "sex": person_data.get("sex"),
-                # Mark as anonymized
-                "anonymized": True,
-                "anonymized_at": person_data.get("anonymized_at"),
-                "is_deleted": True,  # Soft delete
-            }
-        )
+        id_hash = _ANON_ID_HASH.copy()
+        id_hash.update(original_id.encode())
+        anonymous_id = id_hash.hexdigest()[:16]
 
-        return anonymized
+        # Build the result in one pass: other fields are kept as they are,
+        # identifiable ones are overwritten
+        return {
+            **person_data,
+            # Anonymize identifiable fields
+            "first_name": f"Anonymous_{anonymous_id[:8]}",
+            "last_name": "Person",
+            "nickname": None,
+            "email": None,
+            "phone": None,
+            "address": None,
+            "birth_place": "Unknown",
+            "death_place": "Unknown" if person_data.get("death_place") else None,
+            "notes": "Data anonymized per GDPR Article 17",
+            "occupation": "Unknown",
+            # Keep statistical data (anonymized)
+            "birth_date": person_data.get("birth_date"),  # Keep for demographics
+            "death_date": person_data.get("death_date"),
+            "sex": person_data.get("sex"),
+            # Mark as anonymized
+            "anonymized": True,
+            "anonymized_at": person_data.get("anonymized_at"),
+            "is_deleted": True,  # Soft delete
+        }
 
     @staticmethod
     def is_anonymization_reversible() -> bool:
@@ -258,12 +421,14 @@ class GDPRAnonymizer:
     @staticmethod
     def get_anonymization_hash(person_id: str) -> str:
         """Generate anonymization hash for audit trail."""
-        return hashlib.sha256(f"gdpr_anon_{person_id}".encode()).hexdigest()
+        person_hash = _GDPR_ANON_HASH.copy()
+        person_hash.update(str(person_id).encode())
+        return person_hash.hexdigest()
 
 
 def create_encryption_key() -> str:
     """Generate a new encryption key for installation."""
-    return base64.urlsafe_b64encode(os.urandom(32)).decode("utf-8")
+    return base64.urlsafe_b64encode(os.urandom(32)).decode("ascii")
 
 
 def verify_encryption_strength() -> dict:
@@ -278,7 +443,7 @@ def verify_encryption_strength() -> dict:
         return {
             "encryption_working": decrypted == test_data,
             "key_length": 256,  # AES-256
-            "algorithm": "AES-256-GCM via Fernet",
+            "algorithm": "AES-256-GCM",
             "pbkdf2_iterations": 100000,
             "test_passed": True,
         }
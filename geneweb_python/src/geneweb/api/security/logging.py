@@ -3,16 +3,116 @@ Secure logging configuration for Geneweb API
 Filters sensitive data and provides structured logging
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import re
 import sys
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Pattern, Tuple
 
 import structlog
 
 from ..config import settings
 
+try:
+    # Linear-time RE2 engine (google-re2), used for log scrubbing if installed
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+# JSON keys whose string values are masked in log messages
+_SENSITIVE_KEYS = (
+    # Password keys
+    "password",
+    "passwd",
+    "pwd",
+    # Token keys
+    "token",
+    "access_token",
+    "refresh_token",
+    "bearer",
+    # API key keys
+    "api_key",
+    "apikey",
+    "key",
+    # Secret keys
+    "secret",
+    "client_secret",
+    # Authorization header
+    "authorization",
+)
+
+# All sensitive patterns in one alternation, so a message is scanned once;
+# the name of the matching group tells how to mask it. The pattern sticks to
+# syntax that both RE2 and ``re`` accept.
+_SENSITIVE_PATTERN = _regex_engine.compile(
+    "(?i)"
+    + "|".join(
+        [
+            r'(?P<key_value>(?P<kv_prefix>"(?:%s)"\s*:\s*")[^"]*(?P<kv_suffix>"))'
+            % "|".join(_SENSITIVE_KEYS),
+            # Email patterns (PII)
+            r"(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)",
+            # Credit card patterns
+            r"(?P<card>\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b)",
+            # SSN patterns
+            r"(?P<ssn>\b\d{3}-\d{2}-\d{4}\b)",
+        ]
+    )
+)
+
+
+# Every match of _SENSITIVE_PATTERN contains one of these characters and is at
+# least as long as the shortest email ("a@b.cc"), so text failing this cheap
+# check can skip the full scan
+_SENSITIVE_CHARS = re.compile(r'[@"\d]')
+_MIN_SENSITIVE_LENGTH = 6
+
+
+def _needs_scan(pattern: Any, text: str) -> bool:
+    """Whether ``pattern`` could match ``text`` (gates the built-in pattern)."""
+    if pattern is not _SENSITIVE_PATTERN:
+        return True
+    return (
+        len(text) >= _MIN_SENSITIVE_LENGTH and _SENSITIVE_CHARS.search(text) is not None
+    )
+
+
+def _mask_match(match: Any) -> str:
+    """Replacement for a sensitive match, keeping JSON structure intact."""
+    prefix = match.group("kv_prefix")
+    if prefix is not None:
+        return f"{prefix}***MASKED***{match.group('kv_suffix')}"
+    return "***MASKED***"
+
+
+# Attributes every LogRecord has; anything else came from ``extra=``
+_BUILTIN_LOGRECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+
+@lru_cache(maxsize=8)
+def _sensitive_field_pattern(sensitive_fields: Tuple[str, ...]) -> Pattern[str]:
+    """Compile the configured sensitive field names into one substring search."""
+    return re.compile(
+        "|".join(re.escape(field) for field in sensitive_fields), re.IGNORECASE
+    )
+
+
+# Request fields copied into security events, user_agent being truncated
+_SAFE_REQUEST_KEYS = ("method", "path", "user_agent", "client_ip", "request_id")
+_MAX_USER_AGENT_LENGTH = 100
+
+# Background thread that filters and writes the records queued by setup_logging
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+# Security logger, created once so that structlog's cache_logger_on_first_use
+# can keep its bound logger across events; reset by setup_logging
+_security_logger: Optional[Any] = None
+
 
 class SensitiveDataFilter(logging.Filter):
     """
@@ -21,32 +121,7 @@ class SensitiveDataFilter(logging.Filter):
 
     def __init__(self):
         super().__init__()
-        self.sensitive_patterns = [
-            # Password patterns
-            re.compile(r'("password"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("passwd"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("pwd"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            # Token patterns
-            re.compile(r'("token"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("access_token"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("refresh_token"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("bearer"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            # API Key patterns
-            re.compile(r'("api_key"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("apikey"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("key"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            # Secret patterns
-            re.compile(r'("secret"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            re.compile(r'("client_secret"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            # Authorization header
-            re.compile(r'("authorization"\s*:\s*")[^"]*(")', re.IGNORECASE),
-            # Email patterns (PII)
-            re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
-            # Credit card patterns
-            re.compile(r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b"),
-            # SSN patterns
-            re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
-        ]
+        self.sensitive_patterns = [_SENSITIVE_PATTERN]
 
     def filter(self, record: logging.LogRecord) -> bool:
         """
@@ -57,7 +132,10 @@ class SensitiveDataFilter(logging.Filter):
 
             # Apply filters to message
             for pattern in self.sensitive_patterns:
-                if pattern.groups >= 2:
+                if pattern is _SENSITIVE_PATTERN:
+                    if _needs_scan(pattern, message):
+                        message = pattern.sub(_mask_match, message)
+                elif pattern.groups >= 2:
                     # Replace with masked value, keeping structure
                     message = pattern.sub(r"\1***MASKED***\2", message)
                 else:
@@ -68,22 +146,37 @@ class SensitiveDataFilter(logging.Filter):
             record.msg = message
             record.args = ()
 
-        # Filter sensitive data from extra fields
+        # Filter sensitive data from extra fields (built-in attributes such as
+        # the message, which was scrubbed above, are left alone)
         if hasattr(record, "__dict__"):
-            for key, value in record.__dict__.items():
-                if any(
-                    sensitive in key.lower()
-                    for sensitive in settings.logging.sensitive_fields
-                ):
-                    setattr(record, key, "***MASKED***")
-                elif isinstance(value, str):
-                    for pattern in self.sensitive_patterns:
-                        if pattern.search(value):
-                            setattr(record, key, "***MASKED***")
+            extra_keys = record.__dict__.keys() - _BUILTIN_LOGRECORD_ATTRS
+            if extra_keys:
+                sensitive_fields = settings.logging.sensitive_fields
+                field_pattern = (
+                    _sensitive_field_pattern(tuple(sensitive_fields))
+                    if sensitive_fields
+                    else None
+                )
+                for key in extra_keys:
+                    value = record.__dict__[key]
+                    if field_pattern is not None and field_pattern.search(key):
+                        setattr(record, key, "***MASKED***")
+                    elif isinstance(value, str) and any(
+                        _needs_scan(pattern, value) and pattern.search(value)
+                        for pattern in self.sensitive_patterns
+                    ):
+                        setattr(record, key, "***MASKED***")
 
         return True
 
 
+# Event types flagged by SecurityEventProcessor
+_HIGH_PRIORITY_EVENTS = frozenset(
+    ["login", "logout", "auth_failure", "rate_limit", "security_violation"]
+)
+_COMPLIANCE_EVENTS = frozenset(["data_access", "data_modification", "admin_action"])
+
+
 class SecurityEventProcessor:
     """
     Processor for security-related events
@@ -98,27 +191,44 @@ class SecurityEventProcessor:
             event_type = event_dict["event"]
 
             # Add security classification
-            if event_type in [
-                "login",
-                "logout",
-                "auth_failure",
-                "rate_limit",
-                "security_violation",
-            ]:
+            if event_type in _HIGH_PRIORITY_EVENTS:
                 event_dict["security_event"] = True
                 event_dict["priority"] = "high"
 
             # Add compliance tags
-            if event_type in ["data_access", "data_modification", "admin_action"]:
+            elif event_type in _COMPLIANCE_EVENTS:
                 event_dict["compliance_relevant"] = True
 
         return event_dict
 
 
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+
+def _render_exception_info(logger, name, event_dict):
+    """
+    Render stack and exception info, only for events that carry them
+    """
+    if event_dict.get("stack_info") or event_dict.get("exc_info"):
+        event_dict = _stack_info_renderer(logger, name, event_dict)
+        return structlog.processors.format_exc_info(logger, name, event_dict)
+    return event_dict
+
+
 def setup_logging():
     """
     Configure structured logging with security features
     """
+    global _log_listener, _security_logger
+    # Loggers bound under a previous configuration must not be reused
+    _security_logger = None
+
+    renderer = (
+        structlog.processors.JSONRenderer()
+        if settings.logging.log_format == "json"
+        else structlog.dev.ConsoleRenderer()
+    )
+
     # Configure structlog
     structlog.configure(
         processors=[
@@ -129,14 +239,9 @@ def setup_logging():
             structlog.stdlib.PositionalArgumentsFormatter(),
             SecurityEventProcessor(),
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
+            _render_exception_info,
             structlog.processors.UnicodeDecoder(),
-            (
-                structlog.processors.JSONRenderer()
-                if settings.logging.log_format == "json"
-                else structlog.dev.ConsoleRenderer()
-            ),
+            renderer,
         ],
         wrapper_class=structlog.stdlib.BoundLogger,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -159,10 +264,12 @@ def setup_logging():
     # Remove default handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_log_listener()
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.addFilter(sensitive_filter)
+    handlers = [console_handler]
 
     # File handler with rotation (if configured)
     if settings.logging.log_file:
@@ -172,9 +279,16 @@ def setup_logging():
             backupCount=settings.logging.log_backup_count,
         )
         file_handler.addFilter(sensitive_filter)
-        root_logger.addHandler(file_handler)
-
-    root_logger.addHandler(console_handler)
+        handlers.insert(0, file_handler)
+
+    # Logging calls only enqueue records; filtering and I/O run on the
+    # listener thread
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _log_listener.start()
     root_logger.setLevel(getattr(logging, settings.logging.log_level.upper()))
 
     # Configure specific loggers
@@ -199,11 +313,27 @@ def setup_logging():
     return root_logger
 
 
+def _stop_log_listener():
+    """
+    Flush queued log records and stop the listener thread, if running
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
 def get_security_logger():
     """
     Get configured security logger
     """
-    return structlog.get_logger("geneweb.security")
+    global _security_logger
+    if _security_logger is None:
+        _security_logger = structlog.get_logger("geneweb.security")
+    return _security_logger
 
 
 def get_api_logger():
@@ -227,15 +357,11 @@ def log_security_event(
         **details,
     }
 
-    if request_info:
+    if request_info and not request_info.keys().isdisjoint(_SAFE_REQUEST_KEYS):
         # Add request context (filtered for security)
-        safe_request_info = {
-            "method": request_info.get("method"),
-            "path": request_info.get("path"),
-            "user_agent": request_info.get("user_agent", "")[:100],  # Truncate
-            "client_ip": request_info.get("client_ip"),
-            "request_id": request_info.get("request_id"),
-        }
+        safe_request_info = {key: request_info.get(key) for key in _SAFE_REQUEST_KEYS}
+        user_agent = safe_request_info["user_agent"] or ""
+        safe_request_info["user_agent"] = user_agent[:_MAX_USER_AGENT_LENGTH]
         log_data["request"] = safe_request_info
 
     logger.info("Security event", **log_data)
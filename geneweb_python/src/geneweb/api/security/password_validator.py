@@ -10,6 +10,7 @@ This module provides comprehensive password security validation:
 """
 
 import re
+import string
 from enum import Enum
 from typing import List, Tuple
 
@@ -29,48 +30,164 @@ class PasswordStrength(str, Enum):
 
 
 # Common passwords to reject (top 100 most common)
-COMMON_PASSWORDS = {
-    "password",
-    "123456",
-    "123456789",
-    "12345678",
-    "12345",
-    "1234567",
-    "password1",
-    "qwerty",
-    "abc123",
-    "111111",
-    "123123",
-    "admin",
-    "letmein",
-    "welcome",
-    "monkey",
-    "1234567890",
-    "123321",
-    "password123",
-    "qwerty123",
-    "admin123",
-    "letmein123",
-    "welcome123",
-    "iloveyou",
-    "princess",
-    "dragon",
-    "sunshine",
-    "master",
-    "shadow",
-    "12345678910",
-    "football",
-    "baseball",
-    "trustno1",
-    "superman",
-    "batman",
-    "starwars",
-    "geneweb",
-    "genealogy",
-    "family",
-    "tree",
-    "ancestry",
-}
+COMMON_PASSWORDS = frozenset(
+    {
+        "password",
+        "123456",
+        "123456789",
+        "12345678",
+        "12345",
+        "1234567",
+        "password1",
+        "qwerty",
+        "abc123",
+        "111111",
+        "123123",
+        "admin",
+        "letmein",
+        "welcome",
+        "monkey",
+        "1234567890",
+        "123321",
+        "password123",
+        "qwerty123",
+        "admin123",
+        "letmein123",
+        "welcome123",
+        "iloveyou",
+        "princess",
+        "dragon",
+        "sunshine",
+        "master",
+        "shadow",
+        "12345678910",
+        "football",
+        "baseball",
+        "trustno1",
+        "superman",
+        "batman",
+        "starwars",
+        "geneweb",
+        "genealogy",
+        "family",
+        "tree",
+        "ancestry",
+    }
+)
+
+
+# Characters accepted as "special"
+SPECIAL_CHARACTERS = frozenset("!@#$%^&*(),.?\":{}|<>_-+=[]\\/;'`~")
+
+_UPPERCASE_CHARACTERS = frozenset(string.ascii_uppercase)
+_LOWERCASE_CHARACTERS = frozenset(string.ascii_lowercase)
+_ASCII_DIGITS = frozenset(string.digits)
+
+# Every ascending run of three digits or letters ("012" ... "xyz"), and three
+# identical characters in a row, for the ASCII fast path of _scan_password
+_ASCII_SEQUENCE_PATTERN = re.compile(
+    "|".join(
+        alphabet[i : i + 3]  # noqa: E203
+        for alphabet in (string.digits, string.ascii_lowercase)
+        for i in range(len(alphabet) - 2)
+    )
+)
+_REPEAT_PATTERN = re.compile(r"(.)\1\1", re.DOTALL)
+
+# Flags returned by _scan_password
+_HAS_UPPERCASE = 1
+_HAS_LOWERCASE = 2
+_HAS_DIGIT = 4
+_HAS_SPECIAL = 8
+_HAS_SEQUENCE = 16
+_HAS_REPEAT = 32
+_IS_COMMON = 64
+
+# Kinds of characters that can form a sequence such as "123" or "abc"
+_DIGIT_KIND = 1
+_LETTER_KIND = 2
+
+
+def _scan_password(password: str, min_sequence: int = 3, max_repeats: int = 3) -> int:
+    """
+    Check every character-level rule in a single pass over the password.
+
+    Args:
+        password: Password to scan
+        min_sequence: Length of an ascending digit/letter run to flag
+        max_repeats: Number of identical consecutive characters to flag
+
+    Returns:
+        Bitmask of the ``_HAS_*``/``_IS_COMMON`` flags that apply
+    """
+    lowered_password = password.lower()
+    if min_sequence == 3 and max_repeats == 3 and password.isascii():
+        return _scan_ascii_password(password, lowered_password)
+
+    flags = _IS_COMMON if lowered_password in COMMON_PASSWORDS else 0
+    previous = ""
+    previous_kind = 0
+    previous_code = -2
+    sequence = 0
+    repeat = 0
+
+    for char in password:
+        # Character classes
+        if char in _LOWERCASE_CHARACTERS:
+            flags |= _HAS_LOWERCASE
+        elif char in _UPPERCASE_CHARACTERS:
+            flags |= _HAS_UPPERCASE
+        elif char.isdecimal():
+            flags |= _HAS_DIGIT
+        elif char in SPECIAL_CHARACTERS:
+            flags |= _HAS_SPECIAL
+
+        # Repeated characters (e.g., 'aaa')
+        repeat = repeat + 1 if char == previous else 1
+        if repeat >= max_repeats:
+            flags |= _HAS_REPEAT
+        previous = char
+
+        # Ascending runs of digits or case-insensitive letters (e.g., '123', 'aBc')
+        lowered = char.lower()
+        if char.isdecimal():
+            kind = _DIGIT_KIND
+            code = int(char)
+        elif lowered.isalpha():
+            kind = _LETTER_KIND
+            code = ord(lowered) if len(lowered) == 1 else -2
+        else:
+            kind = 0
+            code = -2
+
+        if kind and kind == previous_kind and code == previous_code + 1:
+            sequence += 1
+        else:
+            sequence = 1 if kind else 0
+        if sequence >= min_sequence:
+            flags |= _HAS_SEQUENCE
+        previous_kind = kind
+        previous_code = code
+
+    return flags
+
+
+def _scan_ascii_password(password: str, lowered_password: str) -> int:
+    """``_scan_password`` with default limits, using C-level set/regex checks."""
+    flags = _IS_COMMON if lowered_password in COMMON_PASSWORDS else 0
+    if not _UPPERCASE_CHARACTERS.isdisjoint(password):
+        flags |= _HAS_UPPERCASE
+    if not _LOWERCASE_CHARACTERS.isdisjoint(password):
+        flags |= _HAS_LOWERCASE
+    if not _ASCII_DIGITS.isdisjoint(password):
+        flags |= _HAS_DIGIT
+    if not SPECIAL_CHARACTERS.isdisjoint(password):
+        flags |= _HAS_SPECIAL
+    if _ASCII_SEQUENCE_PATTERN.search(lowered_password):
+        flags |= _HAS_SEQUENCE
+    if _REPEAT_PATTERN.search(password):
+        flags |= _HAS_REPEAT
+    return flags
 
 
 class PasswordValidator:
@@ -122,33 +239,33 @@ class PasswordValidator:
         if len(password) > self.max_length:
             errors.append(f"Password must be at most {self.max_length} characters long")
 
+        flags = _scan_password(password)
+
         # Complexity checks
-        if self.require_uppercase and not re.search(r"[A-Z]", password):
+        if self.require_uppercase and not flags & _HAS_UPPERCASE:
             errors.append("Password must contain at least one uppercase letter")
 
-        if self.require_lowercase and not re.search(r"[a-z]", password):
+        if self.require_lowercase and not flags & _HAS_LOWERCASE:
             errors.append("Password must contain at least one lowercase letter")
 
-        if self.require_numbers and not re.search(r"\d", password):
+        if self.require_numbers and not flags & _HAS_DIGIT:
             errors.append("Password must contain at least one number")
 
-        if self.require_special and not re.search(
-            r"[!@#$%^&*(),.?\":{}|<>_\-+=\[\]\\\/;'`~]", password
-        ):
+        if self.require_special and not flags & _HAS_SPECIAL:
             errors.append("Password must contain at least one special character")
 
         # Common password check
-        if password.lower() in COMMON_PASSWORDS:
+        if flags & _IS_COMMON:
             errors.append("Password is too common and easily guessable")
 
         # Check for sequential characters
-        if self._has_sequential_chars(password):
+        if flags & _HAS_SEQUENCE:
             errors.append(
                 "Password contains sequential characters (e.g., '123', 'abc')"
             )
 
         # Check for repeated characters
-        if self._has_repeated_chars(password):
+        if flags & _HAS_REPEAT:
             errors.append("Password contains too many repeated characters")
 
         is_valid = len(errors) == 0
@@ -164,6 +281,12 @@ class PasswordValidator:
         Returns:
             Tuple of (strength_level, score out of 100)
         """
+        return self._strength_from_flags(password, _scan_password(password))
+
+    def _strength_from_flags(
+        self, password: str, flags: int
+    ) -> Tuple[PasswordStrength, int]:
+        """Score a password whose ``_scan_password`` flags are already known."""
         score = 0
 
         # Length scoring (max 30 points)
@@ -175,13 +298,13 @@ class PasswordValidator:
             score += 10
 
         # Character variety scoring (max 40 points)
-        if re.search(r"[a-z]", password):
+        if flags & _HAS_LOWERCASE:
             score += 10
-        if re.search(r"[A-Z]", password):
+        if flags & _HAS_UPPERCASE:
             score += 10
-        if re.search(r"\d", password):
+        if flags & _HAS_DIGIT:
             score += 10
-        if re.search(r"[!@#$%^&*(),.?\":{}|<>_\-+=\[\]\\\/;'`~]", password):
+        if flags & _HAS_SPECIAL:
             score += 10
 
         # Complexity scoring (max 30 points)
@@ -194,11 +317,11 @@ class PasswordValidator:
             score += 10
 
         # Penalties
-        if password.lower() in COMMON_PASSWORDS:
+        if flags & _IS_COMMON:
             score -= 50
-        if self._has_sequential_chars(password):
+        if flags & _HAS_SEQUENCE:
             score -= 20
-        if self._has_repeated_chars(password):
+        if flags & _HAS_REPEAT:
             score -= 15
 
         # Ensure score is between 0 and 100
@@ -220,37 +343,11 @@ class PasswordValidator:
 
     def _has_sequential_chars(self, password: str, min_sequence: int = 3) -> bool:
         """Check for sequential characters (e.g., '123', 'abc')."""
-        password_lower = password.lower()
-
-        for i in range(len(password_lower) - min_sequence + 1):
-            # Check for sequential numbers
-            if password[i : i + min_sequence].isdigit():  # noqa: E203
-                chars = password[i : i + min_sequence]  # noqa: E203
-                is_sequential = all(
-                    int(chars[j + 1]) == int(chars[j]) + 1
-                    for j in range(len(chars) - 1)
-                )
-                if is_sequential:
-                    return True
-
-            # Check for sequential letters
-            if password_lower[i : i + min_sequence].isalpha():  # noqa: E203
-                chars = password_lower[i : i + min_sequence]  # noqa: E203
-                is_sequential = all(
-                    ord(chars[j + 1]) == ord(chars[j]) + 1
-                    for j in range(len(chars) - 1)
-                )
-                if is_sequential:
-                    return True
-
-        return False
+        return bool(_scan_password(password, min_sequence=min_sequence) & _HAS_SEQUENCE)
 
     def _has_repeated_chars(self, password: str, max_repeats: int = 3) -> bool:
         """Check for excessive character repetition (e.g., 'aaaa')."""
-        for i in range(len(password) - max_repeats + 1):
-            if len(set(password[i : i + max_repeats])) == 1:  # noqa: E203
-                return True
-        return False
+        return bool(_scan_password(password, max_repeats=max_repeats) & _HAS_REPEAT)
 
     def get_suggestions(self, password: str) -> List[str]:
         """
@@ -263,33 +360,34 @@ class PasswordValidator:
             List of suggestions for improving the password
         """
         suggestions = []
-        strength, score = self.calculate_strength(password)
+        flags = _scan_password(password)
+        strength, score = self._strength_from_flags(password, flags)
 
         if strength in [PasswordStrength.VERY_WEAK, PasswordStrength.WEAK]:
             suggestions.append("Consider using a longer password (12+ characters)")
 
-        if not re.search(r"[A-Z]", password):
+        if not flags & _HAS_UPPERCASE:
             suggestions.append("Add uppercase letters for better security")
 
-        if not re.search(r"[a-z]", password):
+        if not flags & _HAS_LOWERCASE:
             suggestions.append("Add lowercase letters for better security")
 
-        if not re.search(r"\d", password):
+        if not flags & _HAS_DIGIT:
             suggestions.append("Add numbers for better security")
 
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>_\-+=\[\]\\\/;'`~]", password):
+        if not flags & _HAS_SPECIAL:
             suggestions.append("Add special characters for better security")
 
         if len(password) < 12:
             suggestions.append("Use at least 12 characters for strong security")
 
-        if password.lower() in COMMON_PASSWORDS:
+        if flags & _IS_COMMON:
             suggestions.append("Avoid common passwords - use something unique")
 
-        if self._has_sequential_chars(password):
+        if flags & _HAS_SEQUENCE:
             suggestions.append("Avoid sequential characters like '123' or 'abc'")
 
-        if self._has_repeated_chars(password):
+        if flags & _HAS_REPEAT:
             suggestions.append("Avoid repeating the same character multiple times")
 
         # General suggestions
@@ -5,15 +5,38 @@ Handles encryption, key derivation, and secure storage
 
 import base64
 import hashlib
+import hmac
 import secrets
+from functools import lru_cache
 from typing import Dict, Optional
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from ..config import settings
 
+# PBKDF2 iterations for secret key derivation and password hashes
+PBKDF2_ITERATIONS = 100000
+
+
+@lru_cache(maxsize=8)
+def _derive_fernet(master_key: str) -> Fernet:
+    """
+    Derive the Fernet instance for a master key.
+
+    The 100k-iteration PBKDF2 stretch runs once per master key and process
+    rather than once per SecretsManager instance.
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b"geneweb_salt_2024",  # In production, use random salt per secret
+        iterations=PBKDF2_ITERATIONS,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
+    return Fernet(key)
+
 
 class SecretsManager:
     """
@@ -33,14 +56,7 @@ class SecretsManager:
         """
         if self._fernet is None:
             # Derive key from master key
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=b"geneweb_salt_2024",  # In production, use random salt per secret
-                iterations=100000,
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(self.master_key.encode()))
-            self._fernet = Fernet(key)
+            self._fernet = _derive_fernet(self.master_key)
 
         return self._fernet
 
@@ -48,17 +64,19 @@ class SecretsManager:
         """
         Encrypt a secret value
         """
-        fernet = self._get_fernet()
-        encrypted = fernet.encrypt(secret.encode())
-        return base64.urlsafe_b64encode(encrypted).decode()
+        # Fernet tokens are already urlsafe base64 text
+        return self._get_fernet().encrypt(secret.encode()).decode("ascii")
 
     def decrypt_secret(self, encrypted_secret: str) -> str:
         """
         Decrypt a secret value
         """
         fernet = self._get_fernet()
-        encrypted_bytes = base64.urlsafe_b64decode(encrypted_secret.encode())
-        decrypted = fernet.decrypt(encrypted_bytes)
+        try:
+            decrypted = fernet.decrypt(encrypted_secret.encode())
+        except InvalidToken:
+            # Secrets encrypted before were base64-encoded a second time
+            decrypted = fernet.decrypt(base64.urlsafe_b64decode(encrypted_secret))
         return decrypted.decode()
 
     def generate_secure_token(self, length: int = 32) -> str:
@@ -76,22 +94,17 @@ class SecretsManager:
         if salt is None:
             salt = secrets.token_hex(16)
 
-        # Use PBKDF2 with SHA256
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt.encode(),
-            iterations=100000,
+        # Use PBKDF2 with SHA256 (hashlib calls OpenSSL directly)
+        hash_bytes = hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), salt.encode(), PBKDF2_ITERATIONS, 32
         )
-
-        hash_bytes = kdf.derive(password.encode())
         password_hash = base64.urlsafe_b64encode(hash_bytes).decode()
 
         return {
             "hash": password_hash,
             "salt": salt,
             "algorithm": "pbkdf2_sha256",
-            "iterations": "100000",
+            "iterations": str(PBKDF2_ITERATIONS),
         }
 
     def verify_password(self, password: str, stored_hash: Dict[str, str]) -> bool:
@@ -99,8 +112,15 @@ class SecretsManager:
         Verify a password against stored hash
         """
         try:
-            computed_hash = self.hash_password(password, stored_hash["salt"])
-            return secrets.compare_digest(computed_hash["hash"], stored_hash["hash"])
+            expected = base64.urlsafe_b64decode(stored_hash["hash"])
+            computed = hashlib.pbkdf2_hmac(
+                "sha256",
+                password.encode(),
+                stored_hash["salt"].encode(),
+                int(stored_hash.get("iterations", PBKDF2_ITERATIONS)),
+                32,
+            )
+            return hmac.compare_digest(computed, expected)
         except Exception:
             return False
 
@@ -126,8 +146,11 @@ class SecretsManager:
         """
         Verify an API key against stored hash
         """
-        computed_hash = hashlib.sha256(api_key.encode()).hexdigest()
-        return secrets.compare_digest(computed_hash, stored_hash)
+        try:
+            expected = bytes.fromhex(stored_hash)
+        except ValueError:
+            return False
+        return hmac.compare_digest(hashlib.sha256(api_key.encode()).digest(), expected)
 
 
 class CertificatePinning:
@@ -141,28 +164,46 @@ class CertificatePinning:
         """
         self.pins = pins or settings.security.cert_pins
 
+    @property
+    def pins(self) -> list:
+        """
+        Configured certificate pins, in insertion order
+        """
+        return self._pins
+
+    @pins.setter
+    def pins(self, pins: list):
+        # Copy so add_pin never mutates the caller's (or the settings') list
+        self._pins = list(pins)
+        self._pin_set = frozenset(self._pins)
+        self._hpkp_headers: Dict[int, str] = {}
+
     def add_pin(self, pin: str):
         """
         Add a certificate pin
         """
-        if pin not in self.pins:
-            self.pins.append(pin)
+        if pin not in self._pin_set:
+            self.pins = [*self._pins, pin]
 
     def verify_pin(self, cert_fingerprint: str) -> bool:
         """
         Verify certificate against pins
         """
-        return cert_fingerprint in self.pins
+        return cert_fingerprint in self._pin_set
 
     def get_hpkp_header(self, max_age: int = 2592000) -> str:
         """
         Generate HPKP header value
         """
-        if not self.pins:
+        if not self._pins:
             return ""
 
-        pins_str = "; ".join([f'pin-sha256="{pin}"' for pin in self.pins])
-        return f"{pins_str}; max-age={max_age}; includeSubDomains"
+        header = self._hpkp_headers.get(max_age)
+        if header is None:
+            pins_str = "; ".join([f'pin-sha256="{pin}"' for pin in self._pins])
+            header = f"{pins_str}; max-age={max_age}; includeSubDomains"
+            self._hpkp_headers[max_age] = header
+        return header
 
 
 # Global instances
@@ -11,8 +11,10 @@ In production, use Redis for scalability and performance.
 For now, using in-memory storage.
 """
 
+import heapq
+import time
 from datetime import datetime, timezone
-from typing import Optional, Set
+from typing import List, Optional, Set, Tuple
 from uuid import UUID
 
 import structlog
@@ -20,6 +22,10 @@ import structlog
 logger = structlog.get_logger(__name__)
 
 
+# Minimum seconds between expiry cleanups triggered by is_blacklisted
+CLEANUP_INTERVAL_SECONDS = 30.0
+
+
 class TokenBlacklist:
     """
     In-memory token blacklist with automatic cleanup.
@@ -42,9 +48,24 @@ class TokenBlacklist:
         # Map of token ID to expiration time for cleanup
         self._token_expiry: dict[str, datetime] = {}
 
+        # Min-heap of (expiration time, token ID), so cleanup only looks at
+        # tokens that actually expired. Entries whose expiry no longer matches
+        # _token_expiry (token re-added or cleared) are skipped when popped.
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+
+        # Latest expiration time added, for get_stats
+        self._newest_expiry: Optional[datetime] = None
+
         # Map of user ID to set of their revoked tokens (for bulk revocation)
         self._user_tokens: dict[UUID, Set[str]] = {}
 
+        # Reverse map of token ID to user ID, to update _user_tokens on expiry
+        self._token_to_user: dict[str, UUID] = {}
+
+        # time.monotonic() of the last cleanup run by is_blacklisted
+        self._last_cleanup = 0.0
+        self._cleanup_interval = CLEANUP_INTERVAL_SECONDS
+
         logger.info("Token blacklist initialized (in-memory)")
 
     def add_token(
@@ -62,11 +83,15 @@ class TokenBlacklist:
 
         self._blacklisted_tokens.add(token_id)
         self._token_expiry[token_id] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, token_id))
+        if self._newest_expiry is None or expires_at > self._newest_expiry:
+            self._newest_expiry = expires_at
 
         if user_id:
             if user_id not in self._user_tokens:
                 self._user_tokens[user_id] = set()
             self._user_tokens[user_id].add(token_id)
+            self._token_to_user[token_id] = user_id
 
         logger.info(
             "Token added to blacklist",
@@ -85,7 +110,14 @@ class TokenBlacklist:
         Returns:
             True if token is blacklisted, False otherwise
         """
-        self._cleanup_expired()  # Clean up before checking
+        # Fast path: most tokens checked were never revoked
+        if token_id not in self._blacklisted_tokens:
+            return False
+
+        now = time.monotonic()
+        if now - self._last_cleanup > self._cleanup_interval:
+            self._cleanup_expired()
+            self._last_cleanup = now
         return token_id in self._blacklisted_tokens
 
     def revoke_user_tokens(self, user_id: UUID) -> int:
@@ -128,27 +160,34 @@ class TokenBlacklist:
             Number of tokens cleaned up
         """
         now = datetime.now(timezone.utc)
-        expired_tokens = []
-
-        for token_id, expiry in self._token_expiry.items():
-            if expiry < now:
-                expired_tokens.append(token_id)
-
-        if expired_tokens:
-            for token_id in expired_tokens:
-                self._blacklisted_tokens.discard(token_id)
-                del self._token_expiry[token_id]
-
-                # Clean up from user_tokens map
-                for user_tokens in self._user_tokens.values():
+        heap = self._expiry_heap
+        count = 0
+
+        while heap and heap[0][0] < now:
+            expiry, token_id = heapq.heappop(heap)
+            if self._token_expiry.get(token_id) != expiry:
+                continue  # Stale entry
+
+            self._blacklisted_tokens.discard(token_id)
+            del self._token_expiry[token_id]
+            count += 1
+
+            # Clean up from user_tokens map
+            user_id = self._token_to_user.pop(token_id, None)
+            if user_id is not None:
+                user_tokens = self._user_tokens.get(user_id)
+                if user_tokens is not None:
                     user_tokens.discard(token_id)
+                    if not user_tokens:
+                        del self._user_tokens[user_id]
+
+        if not self._token_expiry:
+            self._newest_expiry = None
 
-            logger.debug(
-                "Cleaned up expired tokens from blacklist",
-                count=len(expired_tokens),
-            )
+        if count:
+            logger.debug("Cleaned up expired tokens from blacklist", count=count)
 
-        return len(expired_tokens)
+        return count
 
     def get_stats(self) -> dict:
         """
@@ -159,18 +198,17 @@ class TokenBlacklist:
         """
         self._cleanup_expired()
 
+        # Drop stale entries so the heap head is the oldest live token
+        heap = self._expiry_heap
+        while heap and self._token_expiry.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
         return {
             "total_blacklisted": len(self._blacklisted_tokens),
             "total_users_with_revoked_tokens": len(self._user_tokens),
-            "oldest_token_expires": (
-                min(self._token_expiry.values()).isoformat()
-                if self._token_expiry
-                else None
-            ),
+            "oldest_token_expires": heap[0][0].isoformat() if heap else None,
             "newest_token_expires": (
-                max(self._token_expiry.values()).isoformat()
-                if self._token_expiry
-                else None
+                self._newest_expiry.isoformat() if self._newest_expiry else None
             ),
         }
 
@@ -183,7 +221,10 @@ class TokenBlacklist:
         count = len(self._blacklisted_tokens)
         self._blacklisted_tokens.clear()
         self._token_expiry.clear()
+        self._expiry_heap.clear()
+        self._newest_expiry = None
         self._user_tokens.clear()
+        self._token_to_user.clear()
 
         logger.warning("All tokens cleared from blacklist", count=count)
 
@@ -4,10 +4,25 @@ Provides global input validation and sanitization
 """
 
 import re
+from functools import lru_cache
 from ipaddress import AddressValueError, ip_address
 from typing import Any, Dict, Optional
+from urllib.parse import urlparse
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+
+# Precompiled patterns used by the validators below
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_DOMAIN_RE = re.compile(
+    r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?"
+    r"(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$"
+)
+_FILENAME_BAD_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+# Dangerous characters, and control characters except common whitespace
+_SANITIZE_COMBINED_RE = re.compile(r'[<>"\'\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+_KEY_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_ALLOWED_URL_SCHEMES = frozenset(["http", "https", "ftp", "ftps"])
+_NAME_RE = re.compile(r"^[a-zA-ZÀ-ÿ\s\-\'\.]+$")
 
 
 class InputValidator:
@@ -15,10 +30,21 @@ class InputValidator:
     Global input validator for security
     """
 
+    # Keyword patterns, the only dangerous patterns that need no punctuation
+    _SQL_KEYWORD_PATTERN = (
+        r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE)\b)"
+    )
+    _COMMAND_KEYWORD_PATTERN = (
+        r"(\b(exec|eval|system|shell_exec|passthru|proc_open|popen)\b)"
+    )
+
+    # Every other dangerous pattern contains at least one of these characters
+    _TRIGGER_CHARS = re.compile(r"[<>;'\"|&()./%\\=#:-]")
+
     # Dangerous patterns to block
     DANGEROUS_PATTERNS = [
         # SQL Injection patterns
-        r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE)\b)",
+        _SQL_KEYWORD_PATTERN,
         r"([\';\"]\s*(\b(OR|AND)\b\s+[\'\"]?\d+[\'\"]?\s*=\s*[\'\"]?\d+[\'\"]?))",
         r"(UNION\s+SELECT)",
         r"(--|\#|/\*)",
@@ -30,7 +56,7 @@ class InputValidator:
         r"(<object[^>]*>)",
         r"(<embed[^>]*>)",
         # Command injection patterns
-        r"(\b(exec|eval|system|shell_exec|passthru|proc_open|popen)\b)",
+        _COMMAND_KEYWORD_PATTERN,
         r"(\||\&\&|\|\|)",
         r"(;\s*(rm|del|format|shutdown|reboot))",
         # Path traversal patterns
@@ -41,8 +67,17 @@ class InputValidator:
         r"(\)\s*\(\s*\|)",
     ]
 
+    # Reserved device names on Windows
+    _RESERVED_FILENAMES = frozenset(
+        ["CON", "PRN", "AUX", "NUL"]
+        + [f"COM{i}" for i in range(1, 10)]
+        + [f"LPT{i}" for i in range(1, 10)]
+    )
+
     # Compiled regex patterns for efficiency
     _compiled_patterns = None
+    _combined_pattern = None
+    _keyword_pattern = None
 
     @classmethod
     def _get_patterns(cls):
@@ -54,6 +89,26 @@ class InputValidator:
             ]
         return cls._compiled_patterns
 
+    @classmethod
+    def _get_combined_pattern(cls):
+        """Get all dangerous patterns compiled as one alternation"""
+        if cls._combined_pattern is None:
+            cls._combined_pattern = re.compile(
+                "|".join(f"(?:{pattern})" for pattern in cls.DANGEROUS_PATTERNS),
+                re.IGNORECASE | re.MULTILINE,
+            )
+        return cls._combined_pattern
+
+    @classmethod
+    def _get_keyword_pattern(cls):
+        """Get the keyword-only dangerous patterns compiled as one alternation"""
+        if cls._keyword_pattern is None:
+            cls._keyword_pattern = re.compile(
+                f"(?:{cls._SQL_KEYWORD_PATTERN})|(?:{cls._COMMAND_KEYWORD_PATTERN})",
+                re.IGNORECASE | re.MULTILINE,
+            )
+        return cls._keyword_pattern
+
     @classmethod
     def is_safe_input(cls, value: str, max_length: int = 1000) -> bool:
         """
@@ -66,13 +121,18 @@ class InputValidator:
         if len(value) > max_length:
             return False
 
-        # Check for dangerous patterns
-        patterns = cls._get_patterns()
-        for pattern in patterns:
-            if pattern.search(value):
-                return False
+        return cls._has_no_dangerous_pattern(value)
 
-        return True
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _has_no_dangerous_pattern(cls, value: str) -> bool:
+        """Scan a string for dangerous patterns, memoizing recent results"""
+        # Without any trigger character only the keyword patterns can match
+        if cls._TRIGGER_CHARS.search(value) is None:
+            return cls._get_keyword_pattern().search(value) is None
+
+        # Check for dangerous patterns, in a single pass over the input
+        return cls._get_combined_pattern().search(value) is None
 
     @classmethod
     def sanitize_string(cls, value: str, max_length: int = 1000) -> str:
@@ -86,11 +146,8 @@ class InputValidator:
         if len(value) > max_length:
             value = value[:max_length]
 
-        # Remove dangerous characters
-        value = re.sub(r'[<>"\']', "", value)
-
-        # Remove control characters except common whitespace
-        value = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", value)
+        # Remove dangerous and control characters in a single pass
+        value = _SANITIZE_COMBINED_RE.sub("", value)
 
         return value.strip()
 
@@ -99,8 +156,7 @@ class InputValidator:
         """
         Validate email format
         """
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return bool(re.match(pattern, email)) and len(email) <= 254
+        return bool(_EMAIL_RE.match(email)) and len(email) <= 254
 
     @classmethod
     def validate_ip_address(cls, ip: str) -> bool:
@@ -118,11 +174,7 @@ class InputValidator:
         """
         Validate domain name format
         """
-        pattern = (
-            r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?"
-            r"(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$"
-        )
-        return bool(re.match(pattern, domain)) and len(domain) <= 253
+        return bool(_DOMAIN_RE.match(domain)) and len(domain) <= 253
 
     @classmethod
     def validate_filename(cls, filename: str) -> bool:
@@ -133,38 +185,12 @@ class InputValidator:
             return False
 
         # Check for dangerous patterns
-        dangerous_chars = r'[<>:"/\\|?*\x00-\x1f]'
-        if re.search(dangerous_chars, filename):
+        if _FILENAME_BAD_RE.search(filename):
             return False
 
         # Check for reserved names (Windows)
-        reserved_names = {
-            "CON",
-            "PRN",
-            "AUX",
-            "NUL",
-            "COM1",
-            "COM2",
-            "COM3",
-            "COM4",
-            "COM5",
-            "COM6",
-            "COM7",
-            "COM8",
-            "COM9",
-            "LPT1",
-            "LPT2",
-            "LPT3",
-            "LPT4",
-            "LPT5",
-            "LPT6",
-            "LPT7",
-            "LPT8",
-            "LPT9",
-        }
-
-        base_name = filename.split(".")[0].upper()
-        if base_name in reserved_names:
+        base_name = filename.partition(".")[0].upper()
+        if base_name in cls._RESERVED_FILENAMES:
             return False
 
         return True
@@ -175,26 +201,24 @@ class SecureBaseModel(BaseModel):
     Base model with security validation
     """
 
-    @model_validator(mode="before")
+    @field_validator("*", mode="before")
     @classmethod
-    def validate_string_fields(cls, values):
+    def validate_string_fields(cls, v: Any, info: ValidationInfo) -> Any:
         """
-        Validate all string fields for security
+        Validate string fields for security, one field at a time
         """
-        if isinstance(values, dict):
-            for field_name, v in values.items():
-                if isinstance(v, str):
-                    if not InputValidator.is_safe_input(v):
-                        raise ValueError(
-                            f"Field {field_name} contains potentially dangerous content"
-                        )
-
-                    # Basic max length check
-                    if len(v) > 1000:  # Default max length
-                        raise ValueError(
-                            f"Field {field_name} exceeds maximum length of 1000"
-                        )
-        return values
+        if isinstance(v, str):
+            # Basic max length check, before the pattern scan
+            if len(v) > 1000:  # Default max length
+                raise ValueError(
+                    f"Field {info.field_name} exceeds maximum length of 1000"
+                )
+
+            if not InputValidator.is_safe_input(v):
+                raise ValueError(
+                    f"Field {info.field_name} contains potentially dangerous content"
+                )
+        return v
 
     model_config = ConfigDict(
         # Prevent extra fields
@@ -219,7 +243,7 @@ class PersonNameModel(SecureBaseModel):
     @classmethod
     def validate_name_format(cls, v):
         """Validate name contains only allowed characters"""
-        if v and not re.match(r"^[a-zA-ZÀ-ÿ\s\-\'\.]+$", v):
+        if v and not _NAME_RE.match(v):
             raise ValueError("Name contains invalid characters")
         return v
 
@@ -251,23 +275,20 @@ class URLModel(SecureBaseModel):
     @classmethod
     def validate_url_format(cls, v):
         """Validate URL format and scheme"""
-        import urllib.parse
-
         try:
-            parsed = urllib.parse.urlparse(v)
+            parsed = urlparse(v)
+        except ValueError:
+            raise ValueError("Invalid URL format") from None
 
-            # Only allow safe schemes
-            if parsed.scheme not in ["http", "https", "ftp", "ftps"]:
-                raise ValueError("URL scheme not allowed")
+        # Only allow safe schemes
+        if parsed.scheme not in _ALLOWED_URL_SCHEMES:
+            raise ValueError("URL scheme not allowed")
 
-            # Validate domain
-            if parsed.netloc and not InputValidator.validate_domain(
-                parsed.netloc.split(":")[0]
-            ):
-                raise ValueError("Invalid domain in URL")
-
-        except Exception:
-            raise ValueError("Invalid URL format")
+        # Validate domain
+        if parsed.netloc and not InputValidator.validate_domain(
+            parsed.netloc.split(":")[0]
+        ):
+            raise ValueError("Invalid domain in URL")
 
         return v
 
@@ -277,36 +298,49 @@ def validate_request_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate request data for security issues
     """
+    is_safe_input = InputValidator.is_safe_input
+    sanitize_string = InputValidator.sanitize_string
     validated_data = {}
 
-    for key, value in data.items():
-        # Validate key name
-        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", key):
-            raise ValueError(f"Invalid field name: {key}")
-
-        # Validate value
-        if isinstance(value, str):
-            if not InputValidator.is_safe_input(value):
-                raise ValueError(f"Field {key} contains potentially dangerous content")
-            validated_data[key] = InputValidator.sanitize_string(value)
-        elif isinstance(value, (int, float, bool)):
-            validated_data[key] = value
-        elif isinstance(value, dict):
-            validated_data[key] = validate_request_data(value)
-        elif isinstance(value, list):
-            validated_data[key] = [
-                (
-                    validate_request_data(item)
-                    if isinstance(item, dict)
-                    else (
-                        InputValidator.sanitize_string(item)
-                        if isinstance(item, str)
-                        else item
+    # Nested dicts are walked with an explicit stack of (remaining items,
+    # output dict) frames, in the same order a recursive walk would use
+    stack = [(iter(data.items()), validated_data)]
+    while stack:
+        items, validated = stack[-1]
+        for key, value in items:
+            # Validate key name
+            if not _KEY_RE.match(key):
+                raise ValueError(f"Invalid field name: {key}")
+
+            # Validate value
+            if isinstance(value, str):
+                if not is_safe_input(value):
+                    raise ValueError(
+                        f"Field {key} contains potentially dangerous content"
                     )
-                )
-                for item in value
-            ]
+                validated[key] = sanitize_string(value)
+            elif isinstance(value, dict):
+                validated[key] = {}
+                stack.append((iter(value.items()), validated[key]))
+                break
+            elif isinstance(value, list):
+                validated_items = []
+                nested = []
+                for item in value:
+                    if isinstance(item, dict):
+                        validated_item = {}
+                        nested.append((iter(item.items()), validated_item))
+                        item = validated_item
+                    elif isinstance(item, str):
+                        item = sanitize_string(item)
+                    validated_items.append(item)
+                validated[key] = validated_items
+                if nested:
+                    stack.extend(reversed(nested))
+                    break
+            else:
+                validated[key] = value
         else:
-            validated_data[key] = value
+            stack.pop()
 
     return validated_data
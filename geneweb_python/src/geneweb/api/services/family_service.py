@@ -1,6 +1,8 @@
 """Family service for business logic and database operations."""
 
-from typing import Dict, List, Optional
+from datetime import date
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import structlog
@@ -14,6 +16,7 @@ from ...core.family import FamilyEventName as CoreFamilyEventName
 from ...core.family import RelationKind as CoreRelationKind
 from ...core.family import WitnessInfo as CoreWitnessInfo
 from ...core.family import WitnessKind as CoreWitnessKind
+from ...core.person import Person
 from ...core.place import Place
 from ...db.database import Database
 from ..models.family import (
@@ -33,71 +36,101 @@ logger = structlog.get_logger(__name__)
 _FAMILIES_STORAGE: Dict[str, CoreFamily] = {}
 
 
+def _parse_ymd(value: str) -> Optional[Tuple[int, int, int]]:
+    """Parse a YYYY-MM-DD date into (year, month, day), or None if malformed."""
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            parsed = date.fromisoformat(value)
+            return parsed.year, parsed.month, parsed.day
+        except ValueError:
+            pass
+
+    # Partial or unpadded dates such as "1850-00-00" or "1850-6-1"
+    parts = value.split("-")
+    if len(parts) != 3:
+        return None
+    try:
+        return int(parts[0]), int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+
+
 class FamilyService:
     """Service for managing families in the database."""
 
+    # API enum -> core enum conversions, built once
+    _RELATION_KIND_MAP = {
+        RelationKind.MARRIED: CoreRelationKind.MARRIED,
+        RelationKind.NOT_MARRIED: CoreRelationKind.NOT_MARRIED,
+        RelationKind.ENGAGED: CoreRelationKind.ENGAGED,
+        RelationKind.NO_MENTION: CoreRelationKind.NO_MENTION,
+        RelationKind.MARRIAGE_BANN: CoreRelationKind.MARRIAGE_BANN,
+        RelationKind.MARRIAGE_CONTRACT: CoreRelationKind.MARRIAGE_CONTRACT,
+        RelationKind.MARRIAGE_LICENSE: CoreRelationKind.MARRIAGE_LICENSE,
+        RelationKind.PACS: CoreRelationKind.PACS,
+        RelationKind.RESIDENCE: CoreRelationKind.RESIDENCE,
+    }
+    _DIVORCE_STATUS_MAP = {
+        DivorceStatus.NOT_DIVORCED: CoreDivorceStatus.NOT_DIVORCED,
+        DivorceStatus.DIVORCED: CoreDivorceStatus.DIVORCED,
+        DivorceStatus.SEPARATED: CoreDivorceStatus.SEPARATED,
+    }
+    _EVENT_NAME_MAP = {
+        FamilyEventName.MARRIAGE: CoreFamilyEventName.MARRIAGE,
+        FamilyEventName.NO_MARRIAGE: CoreFamilyEventName.NO_MARRIAGE,
+        FamilyEventName.NO_MENTION: CoreFamilyEventName.NO_MENTION,
+        FamilyEventName.ENGAGE: CoreFamilyEventName.ENGAGE,
+        FamilyEventName.DIVORCE: CoreFamilyEventName.DIVORCE,
+        FamilyEventName.SEPARATED: CoreFamilyEventName.SEPARATED,
+        FamilyEventName.ANNULATION: CoreFamilyEventName.ANNULATION,
+        FamilyEventName.MARRIAGE_BANN: CoreFamilyEventName.MARRIAGE_BANN,
+        FamilyEventName.MARRIAGE_CONTRACT: CoreFamilyEventName.MARRIAGE_CONTRACT,
+        FamilyEventName.MARRIAGE_LICENSE: CoreFamilyEventName.MARRIAGE_LICENSE,
+        FamilyEventName.PACS: CoreFamilyEventName.PACS,
+        FamilyEventName.RESIDENCE: CoreFamilyEventName.RESIDENCE,
+        FamilyEventName.CUSTOM: CoreFamilyEventName.CUSTOM,
+    }
+    _WITNESS_KIND_MAP = {
+        WitnessKind.WITNESS: CoreWitnessKind.WITNESS,
+        WitnessKind.WITNESS_GODPARENT: CoreWitnessKind.WITNESS_GODPARENT,
+        WitnessKind.WITNESS_CIVILOFFICER: CoreWitnessKind.WITNESS_CIVIL_OFFICER,
+        WitnessKind.WITNESS_RELIGIOUSOFFICER: (
+            CoreWitnessKind.WITNESS_RELIGIOUS_OFFICER
+        ),
+        WitnessKind.WITNESS_INFORMANT: CoreWitnessKind.WITNESS_INFORMANT,
+        WitnessKind.WITNESS_ATTENDING: CoreWitnessKind.WITNESS_ATTENDING,
+        WitnessKind.WITNESS_MENTIONED: CoreWitnessKind.WITNESS_MENTIONED,
+        WitnessKind.WITNESS_OTHER: CoreWitnessKind.WITNESS_OTHER,
+    }
+    _WITNESS_KIND_TO_API = {core: api for api, core in _WITNESS_KIND_MAP.items()}
+
     def __init__(self, db: Database):
         """Initialize family service with database connection."""
         self.db = db
 
     def _convert_relation_kind(self, relation: RelationKind) -> CoreRelationKind:
         """Convert API RelationKind to core RelationKind."""
-        mapping = {
-            RelationKind.MARRIED: CoreRelationKind.MARRIED,
-            RelationKind.NOT_MARRIED: CoreRelationKind.NOT_MARRIED,
-            RelationKind.ENGAGED: CoreRelationKind.ENGAGED,
-            RelationKind.NO_MENTION: CoreRelationKind.NO_MENTION,
-            RelationKind.MARRIAGE_BANN: CoreRelationKind.MARRIAGE_BANN,
-            RelationKind.MARRIAGE_CONTRACT: CoreRelationKind.MARRIAGE_CONTRACT,
-            RelationKind.MARRIAGE_LICENSE: CoreRelationKind.MARRIAGE_LICENSE,
-            RelationKind.PACS: CoreRelationKind.PACS,
-            RelationKind.RESIDENCE: CoreRelationKind.RESIDENCE,
-        }
-        return mapping[relation]
+        return self._RELATION_KIND_MAP[relation]
 
     def _convert_divorce_status(self, status: DivorceStatus) -> CoreDivorceStatus:
         """Convert API DivorceStatus to core DivorceStatus."""
-        mapping = {
-            DivorceStatus.NOT_DIVORCED: CoreDivorceStatus.NOT_DIVORCED,
-            DivorceStatus.DIVORCED: CoreDivorceStatus.DIVORCED,
-            DivorceStatus.SEPARATED: CoreDivorceStatus.SEPARATED,
-        }
-        return mapping[status]
+        return self._DIVORCE_STATUS_MAP[status]
 
     def _convert_event_name(self, event_name: FamilyEventName) -> CoreFamilyEventName:
         """Convert API FamilyEventName to core FamilyEventName."""
-        mapping = {
-            FamilyEventName.MARRIAGE: CoreFamilyEventName.MARRIAGE,
-            FamilyEventName.NO_MARRIAGE: CoreFamilyEventName.NO_MARRIAGE,
-            FamilyEventName.NO_MENTION: CoreFamilyEventName.NO_MENTION,
-            FamilyEventName.ENGAGE: CoreFamilyEventName.ENGAGE,
-            FamilyEventName.DIVORCE: CoreFamilyEventName.DIVORCE,
-            FamilyEventName.SEPARATED: CoreFamilyEventName.SEPARATED,
-            FamilyEventName.ANNULATION: CoreFamilyEventName.ANNULATION,
-            FamilyEventName.MARRIAGE_BANN: CoreFamilyEventName.MARRIAGE_BANN,
-            FamilyEventName.MARRIAGE_CONTRACT: CoreFamilyEventName.MARRIAGE_CONTRACT,
-            FamilyEventName.MARRIAGE_LICENSE: CoreFamilyEventName.MARRIAGE_LICENSE,
-            FamilyEventName.PACS: CoreFamilyEventName.PACS,
-            FamilyEventName.RESIDENCE: CoreFamilyEventName.RESIDENCE,
-            FamilyEventName.CUSTOM: CoreFamilyEventName.CUSTOM,
-        }
-        return mapping[event_name]
+        return self._EVENT_NAME_MAP[event_name]
 
     def _convert_witness_kind(self, witness_kind: WitnessKind) -> CoreWitnessKind:
         """Convert API WitnessKind to core WitnessKind."""
-        mapping = {
-            WitnessKind.WITNESS: CoreWitnessKind.WITNESS,
-            WitnessKind.WITNESS_GODPARENT: CoreWitnessKind.WITNESS_GODPARENT,
-            WitnessKind.WITNESS_CIVILOFFICER: (CoreWitnessKind.WITNESS_CIVILOFFICER),
-            WitnessKind.WITNESS_RELIGIOUSOFFICER: (
-                CoreWitnessKind.WITNESS_RELIGIOUSOFFICER
-            ),
-            WitnessKind.WITNESS_INFORMANT: CoreWitnessKind.WITNESS_INFORMANT,
-            WitnessKind.WITNESS_ATTENDING: CoreWitnessKind.WITNESS_ATTENDING,
-            WitnessKind.WITNESS_MENTIONED: CoreWitnessKind.WITNESS_MENTIONED,
-            WitnessKind.WITNESS_OTHER: CoreWitnessKind.WITNESS_OTHER,
-        }
-        return mapping[witness_kind]
+        return self._WITNESS_KIND_MAP[witness_kind]
+
+    def _set_event_date(self, event: Event, value: str, field: str) -> None:
+        """Set a YYYY-MM-DD date on an event, logging a warning if malformed."""
+        ymd = _parse_ymd(value)
+        if ymd is None:
+            logger.warning("Invalid date", field=field, value=value)
+        else:
+            event.set_date_from_components(*ymd)
 
     def _create_event_from_data(self, event_data: FamilyEventCreate) -> CoreFamilyEvent:
         """Create a core FamilyEvent from API data."""
@@ -110,14 +143,7 @@ class FamilyService:
 
         # Set date if provided
         if event_data.date:
-            try:
-                # Parse date (assuming YYYY-MM-DD format)
-                parts = event_data.date.split("-")
-                if len(parts) == 3:
-                    year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
-                    base_event.set_date_from_components(year, month, day)
-            except (ValueError, IndexError):
-                logger.warning(f"Invalid date format: {event_data.date}")
+            self._set_event_date(base_event, event_data.date, "date")
 
         # Create witnesses
         witnesses = []
@@ -130,7 +156,7 @@ class FamilyService:
                     witness_kind = self._convert_witness_kind(witness_data.witness_kind)
                     witnesses.append(CoreWitnessInfo(person, witness_kind))
             except (ValueError, AttributeError):
-                logger.warning(f"Could not find person {witness_data.person_id}")
+                logger.warning("Witness not found", person_id=witness_data.person_id)
 
         # Create family event
         event_name = self._convert_event_name(event_data.event_name)
@@ -142,37 +168,45 @@ class FamilyService:
             witnesses=witnesses,
         )
 
+    def _get_persons_by_ids(self, *id_lists: Optional[List[str]]) -> Dict[int, Person]:
+        """Fetch every person referenced by the given ID lists in one lookup."""
+        person_ids = set()
+        for ids in id_lists:
+            for pid in ids or ():
+                try:
+                    person_ids.add(int(pid))
+                except ValueError:
+                    pass
+        return self.db.get_persons(person_ids)
+
+    def _resolve_persons(
+        self, ids: List[str], persons: Dict[int, Person], role: str
+    ) -> List[Person]:
+        """Map IDs to persons fetched by _get_persons_by_ids, in order."""
+        resolved = []
+        for pid in ids:
+            try:
+                person = persons.get(int(pid))
+            except ValueError:
+                person = None
+            if person is None:
+                logger.warning("Person not found", role=role, person_id=pid)
+            else:
+                resolved.append(person)
+        return resolved
+
     def create_family(self, family_data: FamilyCreate) -> FamilyResponse:
         """Create a new family in the database."""
         logger.info("Creating new family", relation=family_data.relation)
 
         # Get persons from database
-        fathers = []
-        for pid in family_data.father_ids:
-            try:
-                person = self.db.get_person(int(pid))
-                if person:
-                    fathers.append(person)
-            except (ValueError, AttributeError):
-                logger.warning(f"Father {pid} not found")
-
-        mothers = []
-        for pid in family_data.mother_ids:
-            try:
-                person = self.db.get_person(int(pid))
-                if person:
-                    mothers.append(person)
-            except (ValueError, AttributeError):
-                logger.warning(f"Mother {pid} not found")
+        persons = self._get_persons_by_ids(
+            family_data.father_ids, family_data.mother_ids, family_data.children_ids
+        )
 
-        children = []
-        for pid in family_data.children_ids:
-            try:
-                person = self.db.get_person(int(pid))
-                if person:
-                    children.append(person)
-            except (ValueError, AttributeError):
-                logger.warning(f"Child {pid} not found")
+        fathers = self._resolve_persons(family_data.father_ids, persons, "father")
+        mothers = self._resolve_persons(family_data.mother_ids, persons, "mother")
+        children = self._resolve_persons(family_data.children_ids, persons, "child")
 
         # Convert relation kind
         relation = self._convert_relation_kind(family_data.relation)
@@ -185,15 +219,9 @@ class FamilyService:
             )
             divorce_event = Event()
             if family_data.divorce_info.divorce_date:
-                try:
-                    parts = family_data.divorce_info.divorce_date.split("-")
-                    if len(parts) == 3:
-                        year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
-                        divorce_event.set_date_from_components(year, month, day)
-                except (ValueError, IndexError):
-                    logger.warning(
-                        f"Invalid divorce date: {family_data.divorce_info.divorce_date}"
-                    )
+                self._set_event_date(
+                    divorce_event, family_data.divorce_info.divorce_date, "divorce_date"
+                )
 
             divorce_info = CoreDivorceInfo(
                 status=divorce_status,
@@ -209,13 +237,9 @@ class FamilyService:
                 place=Place(family_data.marriage_place or ""),
                 src=family_data.marriage_source or "",
             )
-            try:
-                parts = family_data.marriage_date.split("-")
-                if len(parts) == 3:
-                    year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
-                    marriage_event.set_date_from_components(year, month, day)
-            except (ValueError, IndexError):
-                logger.warning(f"Invalid marriage date: {family_data.marriage_date}")
+            self._set_event_date(
+                marriage_event, family_data.marriage_date, "marriage_date"
+            )
 
             events.insert(
                 0,
@@ -256,11 +280,8 @@ class FamilyService:
         self, offset: int = 0, limit: int = 100
     ) -> Dict[str, List[FamilyResponse]]:
         """List all families with pagination."""
-        # Get all families from storage
-        all_families = list(_FAMILIES_STORAGE.items())
-
-        # Apply pagination
-        paginated = all_families[offset : offset + limit]  # noqa: E203
+        # Apply pagination without copying the whole storage
+        paginated = islice(_FAMILIES_STORAGE.items(), offset, offset + limit)
 
         families = [self._family_to_response(fid, fam) for fid, fam in paginated]
 
@@ -284,15 +305,9 @@ class FamilyService:
             )
             divorce_event = Event()
             if update_data.divorce_info.divorce_date:
-                try:
-                    parts = update_data.divorce_info.divorce_date.split("-")
-                    if len(parts) == 3:
-                        year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
-                        divorce_event.set_date_from_components(year, month, day)
-                except (ValueError, IndexError):
-                    logger.warning(
-                        f"Invalid divorce date: {update_data.divorce_info.divorce_date}"
-                    )
+                self._set_event_date(
+                    divorce_event, update_data.divorce_info.divorce_date, "divorce_date"
+                )
 
             family.divorce = CoreDivorceInfo(
                 status=divorce_status,
@@ -308,47 +323,41 @@ class FamilyService:
             ]
 
         # Update parents and children
+        persons = self._get_persons_by_ids(
+            update_data.father_ids, update_data.mother_ids, update_data.children_ids
+        )
+
         if update_data.father_ids is not None:
-            fathers = []
-            for pid in update_data.father_ids:
-                try:
-                    person = self.db.get_person(int(pid))
-                    if person:
-                        fathers.append(person)
-                except (ValueError, AttributeError):
-                    pass
+            fathers = self._resolve_persons(update_data.father_ids, persons, "father")
             family.father = fathers if fathers else None
 
         if update_data.mother_ids is not None:
-            mothers = []
-            for pid in update_data.mother_ids:
-                try:
-                    person = self.db.get_person(int(pid))
-                    if person:
-                        mothers.append(person)
-                except (ValueError, AttributeError):
-                    pass
+            mothers = self._resolve_persons(update_data.mother_ids, persons, "mother")
             family.mother = mothers if mothers else None
 
         if update_data.children_ids is not None:
-            children = []
-            for pid in update_data.children_ids:
-                try:
-                    person = self.db.get_person(int(pid))
-                    if person:
-                        children.append(person)
-                except (ValueError, AttributeError):
-                    pass
-            family.children = children
+            family.children = self._resolve_persons(
+                update_data.children_ids, persons, "child"
+            )
 
         return self._family_to_response(family_id, family)
 
     def delete_family(self, family_id: str) -> bool:
         """Delete a family."""
-        if family_id in _FAMILIES_STORAGE:
-            del _FAMILIES_STORAGE[family_id]
-            return True
-        return False
+        return _FAMILIES_STORAGE.pop(family_id, None) is not None
+
+    def _serialize_witnesses(
+        self, witnesses: List[CoreWitnessInfo]
+    ) -> List[Dict[str, str]]:
+        """Convert core event witnesses to API witness dicts."""
+        to_api = self._WITNESS_KIND_TO_API
+        return [
+            {
+                "person_id": str(w.person.id),
+                "witness_kind": to_api[w.witness_type].value,
+            }
+            for w in witnesses
+        ]
 
     def _family_to_response(self, family_id: str, family: CoreFamily) -> FamilyResponse:
         """Convert core Family to API FamilyResponse."""
@@ -357,41 +366,44 @@ class FamilyService:
         mother_ids = [str(m.id) for m in (family.mother or [])]
         children_ids = [str(c.id) for c in family.children]
 
-        # Convert events
+        # Convert events, taking marriage info from the first marriage event
         events = []
-        for event in family.events:
-            event_dict = {
-                "event_name": event.event_name.value,
-                "custom_name": event.custom_name if event.custom_name else None,
-                "date": event.event.date if event.event else None,
-                "place": (
-                    event.event.place.name
-                    if event.event and event.event.place
-                    else None
-                ),
-                "note": event.event.note if event.event else None,
-                "source": event.event.src if event.event else None,
-                "reason": event.reason if event.reason else None,
-                "witnesses": [
-                    {
-                        "person_id": str(w.person.index),
-                        "witness_kind": w.witness_kind.value,
-                    }
-                    for w in event.witnesses
-                ],
-            }
-            events.append(event_dict)
-
-        # Get marriage info from events if available
         marriage_date = None
         marriage_place = None
         marriage_source = None
+        found_marriage = False
         for event in family.events:
-            if event.event_name == CoreFamilyEventName.MARRIAGE and event.event:
-                marriage_date = event.event.date
-                marriage_place = event.event.place.name if event.event.place else None
-                marriage_source = event.event.src
-                break
+            base_event = event.event
+            if base_event:
+                event_date = base_event.date
+                place = base_event.place.name if base_event.place else None
+                note = base_event.note
+                source = base_event.src
+            else:
+                event_date = place = note = source = None
+
+            events.append(
+                {
+                    "event_name": event.event_name.value,
+                    "custom_name": event.custom_name if event.custom_name else None,
+                    "date": event_date,
+                    "place": place,
+                    "note": note,
+                    "source": source,
+                    "reason": event.reason if event.reason else None,
+                    "witnesses": self._serialize_witnesses(event.witnesses),
+                }
+            )
+
+            if (
+                base_event
+                and not found_marriage
+                and event.event_name == CoreFamilyEventName.MARRIAGE
+            ):
+                marriage_date = event_date
+                marriage_place = place
+                marriage_source = source
+                found_marriage = True
 
         # Create divorce info
         divorce_info = None
@@ -2,14 +2,31 @@
 Person service with secure database operations and GDPR compliance.
 """
 
-from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import asyncio
+import heapq
+from bisect import bisect_left, insort
+from datetime import date, datetime, timezone
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 from uuid import UUID, uuid4
 
 import structlog
 
 from ..models.person import (
     GDPRConsent,
+    GDPRConsentStatus,
     PersonListResponse,
     PersonResponse,
     PersonSearchFilters,
@@ -17,8 +34,8 @@ from ..models.person import (
 )
 from ..security.auth import SecurityContext
 from ..security.encryption import (
-    decrypt_sensitive_data,
-    encrypt_sensitive_data,
+    decrypt_sensitive_data_batch,
+    encrypt_sensitive_data_batch,
 )
 
 if TYPE_CHECKING:
@@ -26,6 +43,57 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+# Maximum number of persons with cached get_person responses
+_RESPONSE_CACHE_SIZE = 1024
+
+# Fields stored encrypted, under "<field>_encrypted"
+_SENSITIVE_FIELDS = frozenset(
+    [
+        "birth_date",
+        "birth_place",
+        "death_date",
+        "death_place",
+        "email",
+        "phone",
+        "address",
+    ]
+)
+_ENCRYPTED_FIELDS = {f"{field}_encrypted": field for field in _SENSITIVE_FIELDS}
+_DATE_FIELDS = ("birth_date", "death_date")
+
+# Fields visible to users without family or editor access
+_PUBLIC_FIELDS = frozenset(
+    [
+        "id",
+        "first_name",
+        "last_name",
+        "sex",
+        "birth_date",
+        "death_date",
+        "is_living",
+        "age",
+        "created_at",
+        "updated_at",
+    ]
+)
+
+# Fields hidden from family members viewing persons outside their family
+_FAMILY_FILTERED_FIELDS = frozenset(
+    ["email", "phone", "address", "birth_place", "death_place"]
+)
+
+# Writes within this many seconds of each other are saved together
+_SAVE_DELAY_SECONDS = 0.05
+
+
+def _stringify_dates(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert birth and death dates to ISO strings in place, for Pydantic."""
+    for field in _DATE_FIELDS:
+        value = data.get(field)
+        if isinstance(value, date):
+            data[field] = value.isoformat()
+    return data
+
 
 class PersonNotFoundError(Exception):
     """Person not found exception."""
@@ -51,9 +119,26 @@ class PersonService:
     def __init__(self, database: Optional["Database"] = None):
         # Initialize in-memory storage (in production, use proper database)
         self._persons: Dict[UUID, Dict[str, Any]] = {}
+        # Plaintext filter fields per person, so listing needs no decryption
+        self._index: Dict[UUID, Dict[str, Any]] = {}
+        # Lookup indexes over the entries, for prefix, equality and range filters
+        self._first_names: List[Tuple[str, UUID]] = []
+        self._last_names: List[Tuple[str, UUID]] = []
+        self._by_sex: Dict[Any, Set[UUID]] = {}
+        self._birth_years: List[Tuple[int, UUID]] = []
+        self._no_birth_year: Set[UUID] = set()
+        # Persons in last name order, ties in creation order, for listings
+        self._by_last_name: List[Tuple[str, int, UUID]] = []
+        self._next_position = 0
+        # Validated get_person responses per person and role
+        self._response_cache: Dict[UUID, Dict[str, PersonResponse]] = {}
         self._consent_history: Dict[UUID, List[GDPRConsent]] = {}
         self.database = database
 
+        # Pending save to the Geneweb database, coalescing bursts of writes
+        self._dirty = False
+        self._save_task: Optional["asyncio.Task[None]"] = None
+
         # Initialize in-memory collection for core.person.Person objects
         self._persons_collection: List[Any] = []  # List[core.person.Person]
         self._uuid_to_index: Dict[UUID, int] = {}
@@ -71,72 +156,194 @@ class PersonService:
         except Exception as e:
             logger.warning("Failed to load existing database", error=str(e))
 
+    def _build_index_entry(
+        self, person_data: Dict[str, Any], birth_year: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Build the plaintext filter entry for an unencrypted person record.
+
+        ``birth_year`` is kept when the record carries no plaintext birth date,
+        as after an update that left the encrypted birth date untouched.
+        """
+        if "birth_date" in person_data:
+            birth_date = person_data["birth_date"]
+            if isinstance(birth_date, str):
+                try:
+                    birth_date = date.fromisoformat(birth_date)
+                except ValueError:
+                    birth_date = None
+            birth_year = birth_date.year if isinstance(birth_date, date) else None
+
+        return {
+            "first_name_lc": (person_data.get("first_name") or "").lower(),
+            "last_name": person_data.get("last_name") or "",
+            "last_name_lc": (person_data.get("last_name") or "").lower(),
+            "sex": person_data.get("sex"),
+            "birth_year": birth_year,
+            "is_living": person_data.get("is_living"),
+            "is_deleted": person_data.get("is_deleted", False),
+        }
+
+    def _set_index_entry(self, person_id: UUID, entry: Dict[str, Any]) -> None:
+        """Store a person's index entry and add it to the lookup indexes."""
+        previous = self._index.get(person_id)
+        if previous is None:
+            entry["position"] = self._next_position
+            self._next_position += 1
+        else:
+            # Keep the listing order of the person being replaced
+            entry["position"] = previous["position"]
+            self._unindex_person(person_id)
+
+        self._index[person_id] = entry
+        insort(self._first_names, (entry["first_name_lc"], person_id))
+        insort(self._last_names, (entry["last_name_lc"], person_id))
+        self._by_sex.setdefault(entry["sex"], set()).add(person_id)
+        if entry["birth_year"] is None:
+            self._no_birth_year.add(person_id)
+        else:
+            insort(self._birth_years, (entry["birth_year"], person_id))
+        insort(self._by_last_name, (entry["last_name"], entry["position"], person_id))
+
+    def _unindex_person(self, person_id: UUID) -> None:
+        """Remove a person's index entry from the lookup indexes."""
+        entry = self._index[person_id]
+        for keys, key in (
+            (self._first_names, (entry["first_name_lc"], person_id)),
+            (self._last_names, (entry["last_name_lc"], person_id)),
+        ):
+            del keys[bisect_left(keys, key)]
+
+        self._by_sex[entry["sex"]].discard(person_id)
+        if entry["birth_year"] is None:
+            self._no_birth_year.discard(person_id)
+        else:
+            birth_years = self._birth_years
+            del birth_years[bisect_left(birth_years, (entry["birth_year"], person_id))]
+        by_last_name = self._by_last_name
+        del by_last_name[
+            bisect_left(by_last_name, (entry["last_name"], entry["position"]))
+        ]
+
+    def _ids_by_last_name(self, reverse: bool) -> Iterator[UUID]:
+        """Yield every person id in last name order, ties in creation order.
+
+        Matches a stable sort on last name, in either direction.
+        """
+        if not reverse:
+            return (person_id for _, _, person_id in self._by_last_name)
+        return (
+            person_id
+            for _, ties in groupby(reversed(self._by_last_name), key=itemgetter(0))
+            for _, _, person_id in reversed(list(ties))
+        )
+
+    @staticmethod
+    def _prefix_matches(keys: List[Tuple[str, UUID]], prefix: str) -> Set[UUID]:
+        """Collect the persons whose sorted key starts with a prefix."""
+        matches = set()
+        for i in range(bisect_left(keys, (prefix,)), len(keys)):
+            key, person_id = keys[i]
+            if not key.startswith(prefix):
+                break
+            matches.add(person_id)
+        return matches
+
+    def _indexed_candidates(self, filters: PersonSearchFilters) -> Optional[Set[UUID]]:
+        """Narrow the persons to scan using the lookup indexes.
+
+        Returns None when no indexed filter is set and every person must be
+        scanned. Candidates still go through ``_matches_filters``.
+        """
+        candidate_sets = []
+        if filters.last_name:
+            candidate_sets.append(
+                self._prefix_matches(self._last_names, filters.last_name.lower())
+            )
+        if filters.first_name:
+            candidate_sets.append(
+                self._prefix_matches(self._first_names, filters.first_name.lower())
+            )
+        if filters.sex:
+            candidate_sets.append(self._by_sex.get(filters.sex, set()))
+        if filters.birth_year_min or filters.birth_year_max:
+            birth_years = self._birth_years
+            start = 0
+            end = len(birth_years)
+            if filters.birth_year_min:
+                start = bisect_left(birth_years, (filters.birth_year_min,))
+            if filters.birth_year_max:
+                end = bisect_left(birth_years, (filters.birth_year_max + 1,))
+            # Persons without a known birth year are not excluded by the range
+            in_range = {person_id for _, person_id in birth_years[start:end]}
+            candidate_sets.append(in_range | self._no_birth_year)
+
+        if not candidate_sets:
+            return None
+        candidate_sets.sort(key=len)
+        return candidate_sets[0].intersection(*candidate_sets[1:])
+
     def _encrypt_person_data(self, person_data: Dict[str, Any]) -> Dict[str, Any]:
         """Encrypt sensitive person data fields."""
-        encrypted_data = person_data.copy()
-
-        # Fields that need encryption
-        sensitive_fields = [
-            "birth_date",
-            "birth_place",
-            "death_date",
-            "death_place",
-            "email",
-            "phone",
-            "address",
-        ]
+        # Copy everything but the plaintext of sensitive fields
+        encrypted_data = {}
+        fields = []
+        values = []
+        for key, value in person_data.items():
+            if value is not None and key in _SENSITIVE_FIELDS:
+                fields.append(key)
+                values.append(str(value))
+            else:
+                encrypted_data[key] = value
+        if not fields:
+            return encrypted_data
 
-        for field in sensitive_fields:
-            if field in encrypted_data and encrypted_data[field] is not None:
-                encrypted_data[f"{field}_encrypted"] = encrypt_sensitive_data(
-                    str(encrypted_data[field])
-                )
-                # Remove plaintext
-                del encrypted_data[field]
+        # Encrypt every field with one batch call
+        encrypted_values = encrypt_sensitive_data_batch(values)
+        for field, encrypted_value in zip(fields, encrypted_values):
+            encrypted_data[f"{field}_encrypted"] = encrypted_value
 
         return encrypted_data
 
     def _decrypt_person_data(self, encrypted_data: Dict[str, Any]) -> Dict[str, Any]:
         """Decrypt sensitive person data fields."""
-        decrypted_data = encrypted_data.copy()
-
-        # Fields that were encrypted
-        sensitive_fields = [
-            "birth_date",
-            "birth_place",
-            "death_date",
-            "death_place",
-            "email",
-            "phone",
-            "address",
-        ]
+        # Copy everything but the encrypted fields, which stay out of responses
+        decrypted_data = {}
+        fields = []
+        encrypted_values = []
+        for key, value in encrypted_data.items():
+            field = _ENCRYPTED_FIELDS.get(key)
+            if field is None:
+                decrypted_data[key] = value
+            else:
+                fields.append(field)
+                encrypted_values.append(value)
+        if not fields:
+            return decrypted_data
+
+        try:
+            decrypted_values = decrypt_sensitive_data_batch(encrypted_values)
+        except Exception as e:
+            # Encrypted fields are dropped, but plaintext is not exposed
+            logger.warning("Failed to decrypt fields", fields=fields, error=str(e))
+            return decrypted_data
 
-        for field in sensitive_fields:
-            encrypted_field = f"{field}_encrypted"
-            if encrypted_field in decrypted_data:
+        for field, decrypted_value in zip(fields, decrypted_values):
+            if decrypted_value is None:
+                continue
+            # Convert back to proper type
+            if field in _DATE_FIELDS and decrypted_value:
                 try:
-                    decrypted_value = decrypt_sensitive_data(
-                        decrypted_data[encrypted_field]
-                    )
-                    if decrypted_value is not None:
-                        # Convert back to proper type
-                        if field in ["birth_date", "death_date"] and decrypted_value:
-                            try:
-                                decrypted_data[field] = datetime.fromisoformat(
-                                    decrypted_value.replace("Z", "+00:00")
-                                ).date()
-                            except ValueError:
-                                decrypted_data[field] = decrypted_value
-                        else:
-                            decrypted_data[field] = decrypted_value
-
-                    # Remove encrypted field from response
-                    del decrypted_data[encrypted_field]
-
-                except Exception as e:
-                    logger.warning(f"Failed to decrypt field {field}", error=str(e))
-                    # Keep encrypted field but don't expose plaintext
-                    del decrypted_data[encrypted_field]
+                    # Dates are stored as YYYY-MM-DD; accept full timestamps too
+                    if len(decrypted_value) == 10:
+                        decrypted_data[field] = date.fromisoformat(decrypted_value)
+                    else:
+                        decrypted_data[field] = datetime.fromisoformat(
+                            decrypted_value.replace("Z", "+00:00")
+                        ).date()
+                except ValueError:
+                    decrypted_data[field] = decrypted_value
+            else:
+                decrypted_data[field] = decrypted_value
 
         return decrypted_data
 
@@ -144,48 +351,40 @@ class PersonService:
         self, person_data: Dict[str, Any], security_context: SecurityContext
     ) -> Dict[str, Any]:
         """Filter person data based on user access level."""
+        return self._build_access_filter(security_context)(person_data)
+
+    @staticmethod
+    def _build_access_filter(
+        security_context: SecurityContext,
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Build the person data filter for a user, once per request."""
+        role = security_context.user.role.value
 
         # Admin and editor see everything
-        if security_context.user.role.value in ["admin", "editor"]:
-            return person_data
+        if role in ("admin", "editor"):
+            return lambda person_data: person_data
 
         # Family members see family data
-        if security_context.user.role.value == "family":
-            person_id = person_data.get("id")
-            if (
-                person_id == security_context.user.family_person_id
-                or person_id in security_context.user.related_person_ids
-            ):
-                return person_data
-
-            # For non-family members, filter sensitive data
-            filtered = person_data.copy()
-            sensitive_fields = [
-                "email",
-                "phone",
-                "address",
-                "birth_place",
-                "death_place",
-            ]
-            for field in sensitive_fields:
-                if field in filtered:
-                    filtered[field] = None
-            return filtered
-
-        public_fields = [
-            "id",
-            "first_name",
-            "last_name",
-            "sex",
-            "birth_date",
-            "death_date",
-            "is_living",
-            "age",
-            "created_at",
-            "updated_at",
-        ]
+        if role == "family":
+            family_ids = frozenset(security_context.user.related_person_ids) | {
+                security_context.user.family_person_id
+            }
+
+            def filter_family(person_data: Dict[str, Any]) -> Dict[str, Any]:
+                if person_data.get("id") in family_ids:
+                    return person_data
+
+                # For non-family members, filter sensitive data
+                return {
+                    key: None if key in _FAMILY_FILTERED_FIELDS else value
+                    for key, value in person_data.items()
+                }
 
-        return {k: v for k, v in person_data.items() if k in public_fields}
+            return filter_family
+
+        return lambda person_data: {
+            k: v for k, v in person_data.items() if k in _PUBLIC_FIELDS
+        }
 
     async def create_person(
         self,
@@ -218,17 +417,20 @@ class PersonService:
             # Convert birth_date string to date object for calculation
             birth_date_str = person_record["birth_date"]
             if isinstance(birth_date_str, str):
-                from datetime import date
-
                 birth_date = date.fromisoformat(birth_date_str)
+                # Keep the parsed date so indexing does not parse it again
+                person_record["birth_date"] = birth_date
             else:
                 birth_date = birth_date_str
-            age = (datetime.now().date() - birth_date).days // 365
+            age = (date.today() - birth_date).days // 365
             person_record["age"] = age
             person_record["is_living"] = True
         else:
             person_record["is_living"] = False
 
+        # Index filter fields before they are encrypted
+        self._set_index_entry(person_id, self._build_index_entry(person_record))
+
         # Encrypt sensitive data
         encrypted_record = self._encrypt_person_data(person_record)
 
@@ -248,26 +450,13 @@ class PersonService:
             self._consent_history[person_id] = person_data["gdpr_consents"]
 
         # Save to Geneweb format
-        await self._save_to_geneweb_db()
+        self._schedule_save()
 
         # Return decrypted response
         decrypted_data = self._decrypt_person_data(encrypted_record)
 
         # Convert date objects to strings for Pydantic
-        if "birth_date" in decrypted_data and not isinstance(
-            decrypted_data["birth_date"], str
-        ):
-            from datetime import date
-
-            if isinstance(decrypted_data["birth_date"], date):
-                decrypted_data["birth_date"] = decrypted_data["birth_date"].isoformat()
-        if "death_date" in decrypted_data and not isinstance(
-            decrypted_data["death_date"], str
-        ):
-            from datetime import date
-
-            if isinstance(decrypted_data["death_date"], date):
-                decrypted_data["death_date"] = decrypted_data["death_date"].isoformat()
+        _stringify_dates(decrypted_data)
 
         return PersonResponse(**decrypted_data)
 
@@ -276,17 +465,24 @@ class PersonService:
     ) -> Optional[PersonResponse]:
         """Get person by ID with access control."""
 
-        if person_id not in self._persons:
+        encrypted_data = self._persons.get(person_id)
+        if encrypted_data is None:
             return None
 
-        encrypted_data = self._persons[person_id]
-
         # Check if person is deleted
         if encrypted_data.get("is_deleted", False):
             # Only admins can see deleted persons
             if security_context.user.role.value != "admin":
                 return None
 
+        # Family access depends on the user, so only role-wide views are cached
+        role = security_context.user.role.value
+        cacheable = role != "family"
+        if cacheable:
+            cached = self._response_cache.get(person_id, {}).get(role)
+            if cached is not None:
+                return cached.model_copy()
+
         # Decrypt data
         decrypted_data = self._decrypt_person_data(encrypted_data)
 
@@ -296,22 +492,22 @@ class PersonService:
         )
 
         # Convert date objects to strings for Pydantic
-        if "birth_date" in filtered_data and not isinstance(
-            filtered_data["birth_date"], str
-        ):
-            from datetime import date
-
-            if isinstance(filtered_data["birth_date"], date):
-                filtered_data["birth_date"] = filtered_data["birth_date"].isoformat()
-        if "death_date" in filtered_data and not isinstance(
-            filtered_data["death_date"], str
-        ):
-            from datetime import date
-
-            if isinstance(filtered_data["death_date"], date):
-                filtered_data["death_date"] = filtered_data["death_date"].isoformat()
-
-        return PersonResponse(**filtered_data)
+        _stringify_dates(filtered_data)
+
+        response = PersonResponse(**filtered_data)
+        if cacheable:
+            self._cache_response(person_id, role, response)
+            response = response.model_copy()
+        return response
+
+    def _cache_response(
+        self, person_id: UUID, role: str, response: PersonResponse
+    ) -> None:
+        """Cache a validated response, evicting the oldest person when full."""
+        cache = self._response_cache
+        if person_id not in cache and len(cache) >= _RESPONSE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache.setdefault(person_id, {})[role] = response
 
     async def get_person_complete(
         self,
@@ -321,11 +517,10 @@ class PersonService:
     ) -> Optional[PersonResponse]:
         """Get complete person data including encrypted fields for admin operations."""
 
-        if person_id not in self._persons:
+        encrypted_data = self._persons.get(person_id)
+        if encrypted_data is None:
             return None
 
-        encrypted_data = self._persons[person_id]
-
         if decrypt_sensitive:
             data = self._decrypt_person_data(encrypted_data)
         else:
@@ -342,10 +537,11 @@ class PersonService:
     ) -> PersonResponse:
         """Update person with version control and audit trail."""
 
-        if person_id not in self._persons:
+        stored_data = self._persons.get(person_id)
+        if stored_data is None:
             raise PersonNotFoundError(f"Person {person_id} not found")
 
-        current_data = self._persons[person_id].copy()
+        current_data = stored_data.copy()
 
         # Version control check
         current_version = current_data.get("version", 1)
@@ -358,11 +554,20 @@ class PersonService:
         current_data["version"] = current_version + 1
         current_data["updated_by"] = updated_by
 
-        # Re-encrypt sensitive data
+        self._set_index_entry(
+            person_id,
+            self._build_index_entry(current_data, self._index[person_id]["birth_year"]),
+        )
+
+        # Updated sensitive fields replace their stored ciphertext; the others
+        # stay encrypted as they are and are not encrypted again
+        for field in _SENSITIVE_FIELDS.intersection(update_data):
+            current_data.pop(f"{field}_encrypted", None)
         encrypted_data = self._encrypt_person_data(current_data)
 
         # Store updated data
         self._persons[person_id] = encrypted_data
+        self._response_cache.pop(person_id, None)
 
         # Also update _persons_collection if person exists there
         if person_id in self._uuid_to_index:
@@ -370,7 +575,7 @@ class PersonService:
             self._persons_collection[index] = encrypted_data
 
         # Save to Geneweb format
-        await self._save_to_geneweb_db()
+        self._schedule_save()
 
         # Return decrypted response
         decrypted_data = self._decrypt_person_data(encrypted_data)
@@ -378,6 +583,9 @@ class PersonService:
             decrypted_data, security_context
         )
 
+        # Convert date objects to strings for Pydantic
+        _stringify_dates(filtered_data)
+
         return PersonResponse(**filtered_data)
 
     async def soft_delete_person(
@@ -385,13 +593,16 @@ class PersonService:
     ):
         """Soft delete person (mark as deleted)."""
 
-        if person_id not in self._persons:
+        encrypted_data = self._persons.get(person_id)
+        if encrypted_data is None:
             raise PersonNotFoundError(f"Person {person_id} not found")
 
-        self._persons[person_id]["is_deleted"] = True
-        self._persons[person_id]["deleted_at"] = datetime.now(timezone.utc)
+        encrypted_data["is_deleted"] = True
+        encrypted_data["deleted_at"] = datetime.now(timezone.utc)
+        self._index[person_id]["is_deleted"] = True
+        self._response_cache.pop(person_id, None)
 
-        await self._save_to_geneweb_db()
+        self._schedule_save()
 
     async def hard_delete_person(
         self, person_id: UUID, security_context: SecurityContext
@@ -402,10 +613,13 @@ class PersonService:
             raise PersonNotFoundError(f"Person {person_id} not found")
 
         del self._persons[person_id]
+        self._unindex_person(person_id)
+        del self._index[person_id]
+        self._response_cache.pop(person_id, None)
         if person_id in self._consent_history:
             del self._consent_history[person_id]
 
-        await self._save_to_geneweb_db()
+        self._schedule_save()
 
     async def anonymize_person(
         self,
@@ -419,54 +633,70 @@ class PersonService:
             raise PersonNotFoundError(f"Person {person_id} not found")
 
         # Store anonymized data
+        self._set_index_entry(person_id, self._build_index_entry(anonymized_data))
         encrypted_data = self._encrypt_person_data(anonymized_data)
         self._persons[person_id] = encrypted_data
+        self._response_cache.pop(person_id, None)
 
-        await self._save_to_geneweb_db()
+        self._schedule_save()
 
     async def list_persons(
         self, filters: PersonSearchFilters, security_context: SecurityContext
     ) -> PersonListResponse:
         """List persons with filtering and pagination."""
 
-        # Filter persons based on criteria and access level
-        filtered_persons = []
-
-        for person_id, encrypted_data in self._persons.items():
-            # Skip deleted persons unless admin
-            if (
-                encrypted_data.get("is_deleted", False)
-                and security_context.user.role.value != "admin"
-            ):
-                continue
-
-            # Decrypt for filtering
-            person_data = self._decrypt_person_data(encrypted_data)
-
-            # Apply search filters
-            if self._matches_filters(person_data, filters):
-                # Filter data by access level
-                filtered_data = self._filter_person_data_by_access_level(
-                    person_data, security_context
-                )
-                filtered_persons.append(PersonSummary(**filtered_data))
-
-        # Sort results
-        if filters.sort_by == "last_name":
-            filtered_persons.sort(
-                key=lambda p: p.last_name, reverse=(filters.sort_order == "desc")
-            )
-        elif filters.sort_by == "birth_date":
-            filtered_persons.sort(
-                key=lambda p: p.birth_date or datetime.min.date(),
-                reverse=(filters.sort_order == "desc"),
+        # Filter on the plaintext index; only the page is decrypted
+        include_deleted = security_context.user.role.value == "admin"
+        reverse = filters.sort_order == "desc"
+        index = self._index
+        candidates = self._indexed_candidates(filters)
+        presorted = candidates is None and filters.sort_by == "last_name"
+        if presorted:
+            # Walk the last name view, so the matches need no sorting
+            person_ids: Iterable[UUID] = self._ids_by_last_name(reverse)
+        elif candidates is None:
+            person_ids = index
+        else:
+            person_ids = sorted(
+                candidates, key=lambda person_id: index[person_id]["position"]
             )
+        matched_ids = [
+            person_id
+            for person_id in person_ids
+            if (include_deleted or not index[person_id]["is_deleted"])
+            and self._matches_filters(index[person_id], filters)
+        ]
 
         # Pagination
-        total = len(filtered_persons)
+        total = len(matched_ids)
         start = (filters.page - 1) * filters.page_size
         end = start + filters.page_size
-        page_items = filtered_persons[start:end]
+
+        # Sort results, selecting only as many persons as the page needs
+        sort_key: Optional[Callable[[UUID], Any]] = None
+        if filters.sort_by == "last_name" and not presorted:
+            sort_key = self._last_name_sort_key
+        elif filters.sort_by == "birth_date":
+            sort_key = self._birth_date_sort_key
+        if sort_key is None:
+            page_ids = matched_ids[start:end]
+        else:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            page_ids = select(end, matched_ids, key=sort_key)[start:]
+
+        access_filter = self._build_access_filter(security_context)
+        page_items = []
+        for person_id in page_ids:
+            person_data = self._decrypt_person_data(self._persons[person_id])
+
+            # Filter data by access level
+            filtered_data = access_filter(person_data)
+
+            # Convert date objects to strings for Pydantic
+            _stringify_dates(filtered_data)
+
+            # Stored records were validated on write, so skip validation here
+            page_items.append(PersonSummary.model_construct(**filtered_data))
 
         total_pages = (total + filters.page_size - 1) // filters.page_size
 
@@ -480,42 +710,47 @@ class PersonService:
             has_previous=filters.page > 1,
         )
 
+    def _last_name_sort_key(self, person_id: UUID) -> str:
+        """Sort key for a person's last name."""
+        return self._index[person_id]["last_name"]
+
+    def _birth_date_sort_key(self, person_id: UUID) -> date:
+        """Sort key for a person's birth date, decrypting only that field."""
+        encrypted_data = self._persons[person_id]
+        if "birth_date_encrypted" not in encrypted_data:
+            return date.min
+        birth_date = self._decrypt_person_data(
+            {"birth_date_encrypted": encrypted_data["birth_date_encrypted"]}
+        ).get("birth_date")
+        return birth_date or date.min
+
     def _matches_filters(
-        self, person_data: Dict[str, Any], filters: PersonSearchFilters
+        self, entry: Dict[str, Any], filters: PersonSearchFilters
     ) -> bool:
-        """Check if person matches search filters."""
+        """Check if a person's index entry matches search filters."""
 
         if filters.first_name:
-            if (
-                not person_data.get("first_name", "")
-                .lower()
-                .startswith(filters.first_name.lower())
-            ):
+            if not entry["first_name_lc"].startswith(filters.first_name.lower()):
                 return False
 
         if filters.last_name:
-            if (
-                not person_data.get("last_name", "")
-                .lower()
-                .startswith(filters.last_name.lower())
-            ):
+            if not entry["last_name_lc"].startswith(filters.last_name.lower()):
                 return False
 
         if filters.sex:
-            if person_data.get("sex") != filters.sex:
+            if entry["sex"] != filters.sex:
                 return False
 
         if filters.birth_year_min or filters.birth_year_max:
-            birth_date = person_data.get("birth_date")
-            if birth_date:
-                birth_year = birth_date.year
+            birth_year = entry["birth_year"]
+            if birth_year is not None:
                 if filters.birth_year_min and birth_year < filters.birth_year_min:
                     return False
                 if filters.birth_year_max and birth_year > filters.birth_year_max:
                     return False
 
         if filters.is_living is not None:
-            if person_data.get("is_living") != filters.is_living:
+            if entry["is_living"] != filters.is_living:
                 return False
 
         return True
@@ -535,38 +770,58 @@ class PersonService:
         """Update GDPR consent for person."""
 
         # Update consent with timestamp and user info
+        # Statuses are plain strings, as GDPRConsent stores enum values
+        now = datetime.now(timezone.utc)
+        has_valid_consent = False
         for consent in consents:
-            if consent.status.value == "granted":
-                consent.granted_at = datetime.now(timezone.utc)
-            elif consent.status.value == "withdrawn":
-                consent.withdrawn_at = datetime.now(timezone.utc)
+            consent_status = consent.status
+            if consent_status == GDPRConsentStatus.GRANTED:
+                consent.granted_at = now
+                has_valid_consent = True
+            elif consent_status == GDPRConsentStatus.WITHDRAWN:
+                consent.withdrawn_at = now
 
             consent.ip_address = ip_address
             consent.user_agent = user_agent
 
         # Store consent history
-        if person_id not in self._consent_history:
-            self._consent_history[person_id] = []
-
-        self._consent_history[person_id].extend(consents)
+        self._consent_history.setdefault(person_id, []).extend(consents)
 
         # Update person's consent status
-        if person_id in self._persons:
-            has_valid_consent = any(
-                consent.status.value == "granted" for consent in consents
-            )
-            self._persons[person_id]["has_valid_consent"] = has_valid_consent
+        encrypted_data = self._persons.get(person_id)
+        if encrypted_data is not None:
+            encrypted_data["has_valid_consent"] = has_valid_consent
+            self._response_cache.pop(person_id, None)
 
             # Update consent status
             if has_valid_consent:
-                self._persons[person_id]["consent_status"] = "granted"
+                encrypted_data["consent_status"] = "granted"
             else:
-                self._persons[person_id]["consent_status"] = "withdrawn"
+                encrypted_data["consent_status"] = "withdrawn"
 
-        await self._save_to_geneweb_db()
+        self._schedule_save()
 
         return consents
 
+    def _schedule_save(self) -> None:
+        """Mark data as changed and save it shortly, once per burst of writes."""
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.get_running_loop().create_task(
+                self._save_after_delay()
+            )
+
+    async def _save_after_delay(self) -> None:
+        """Wait for further writes, then save them together."""
+        await asyncio.sleep(_SAVE_DELAY_SECONDS)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Save pending changes to the Geneweb database now."""
+        if self._dirty:
+            self._dirty = False
+            await self._save_to_geneweb_db()
+
     async def _save_to_geneweb_db(self):
         """Save current state to Geneweb database format."""
         try:
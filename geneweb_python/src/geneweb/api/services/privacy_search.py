@@ -2,6 +2,7 @@
 
 import logging
 from datetime import datetime
+from itertools import islice
 from typing import List, Optional
 
 from ...core.person import Person
@@ -24,8 +25,14 @@ class PrivacyAwareSearch:
     def __init__(self, database: Database):
         self.db = database
 
-    def is_person_living(self, person: Person) -> bool:
-        """Détermine si une personne est vivante."""
+    def is_person_living(
+        self, person: Person, current_year: Optional[int] = None
+    ) -> bool:
+        """Détermine si une personne est vivante.
+
+        ``current_year`` peut être fourni pour éviter de relire l'horloge
+        à chaque personne lors d'un traitement en lot.
+        """
         if person.death is not None:
             return False
 
@@ -40,7 +47,8 @@ class PrivacyAwareSearch:
                     birth_year = int(person.birth.split("-")[0])
 
                 if birth_year:
-                    current_year = datetime.now().year
+                    if current_year is None:
+                        current_year = datetime.now().year
                     age = current_year - birth_year
                     # Considérer vivant si moins de 100 ans
                     return age < 100
@@ -51,10 +59,14 @@ class PrivacyAwareSearch:
         return True
 
     def get_privacy_level(
-        self, person: Person, user_id: Optional[str] = None
+        self,
+        person: Person,
+        user_id: Optional[str] = None,
+        is_living: Optional[bool] = None,
     ) -> PrivacyLevel:
         """Détermine le niveau de confidentialité pour une personne."""
-        is_living = self.is_person_living(person)
+        if is_living is None:
+            is_living = self.is_person_living(person)
 
         if not is_living:
             # Personnes décédées : PUBLIC
@@ -70,10 +82,14 @@ class PrivacyAwareSearch:
         return PrivacyLevel.ANONYMIZED
 
     def anonymize_person(
-        self, person: Person, privacy_level: PrivacyLevel
+        self,
+        person: Person,
+        privacy_level: PrivacyLevel,
+        is_living: Optional[bool] = None,
     ) -> PersonSearchResult:
         """Anonymise les données d'une personne selon le niveau de confidentialité."""
-        is_living = self.is_person_living(person)
+        if is_living is None:
+            is_living = self.is_person_living(person)
 
         if privacy_level == PrivacyLevel.PUBLIC:
             # Toutes les informations disponibles
@@ -135,65 +151,33 @@ class PrivacyAwareSearch:
             f"user: {user_id or 'anonymous'}"
         )
 
-        all_persons = self.db.get_persons()
-        results = []
-
-        for person in all_persons:
-            # Filtrage de base
-            if not self._matches_query(person, query):
-                continue
-
-            # Vérifier si vivante
-            is_living = self.is_person_living(person)
-
-            # Filtrer les personnes vivantes si pas autorisé
-            if is_living and not query.include_living:
-                continue
-
-            # Déterminer niveau de confidentialité
-            privacy_level = self.get_privacy_level(person, user_id)
-
-            # Anonymiser si nécessaire
-            result = self.anonymize_person(person, privacy_level)
-            results.append(result)
-
-        # Pagination
-        start = query.offset
-        end = start + query.limit
-        return results[start:end]
-
-    def _matches_query(self, person: Person, query: SearchQuery) -> bool:
-        """Vérifie si une personne correspond aux critères de recherche."""
-        # Recherche texte libre
-        search_text = query.query.lower()
-        first_name = (person.first_name or "").lower()
-        surname = (person.surname or "").lower()
-
-        if search_text and search_text not in f"{first_name} {surname}":
-            return False
-
-        # Filtres spécifiques
-        if query.first_name and query.first_name.lower() not in first_name:
-            return False
-
-        if query.surname and query.surname.lower() not in surname:
-            return False
-
-        if query.sex and person.sex and person.sex.value != query.sex:
-            return False
-
-        # Filtres de date de naissance
-        if person.birth and query.birth_year_from:
-            try:
-                birth_year = int(str(person.birth.date).split("-")[0])
-                if birth_year < query.birth_year_from:
-                    return False
-                if query.birth_year_to and birth_year > query.birth_year_to:
-                    return False
-            except (ValueError, AttributeError):
-                pass
-
-        return True
+        matches = self.db.query_persons(
+            first_name=query.first_name,
+            surname=query.surname,
+            sex=query.sex,
+            birth_year_from=query.birth_year_from,
+            birth_year_to=query.birth_year_to,
+            text=query.query,
+        )
+        current_year = datetime.now().year
+
+        def visible():
+            # Le statut "vivant" est calculé une seule fois par personne
+            for person in matches:
+                is_living = self.is_person_living(person, current_year)
+                # Filtrer les personnes vivantes si pas autorisé
+                if is_living and not query.include_living:
+                    continue
+                yield person, is_living
+
+        # Pagination : on s'arrête dès que la page est complète
+        page = islice(visible(), query.offset, query.offset + query.limit)
+        return [
+            self.anonymize_person(
+                person, self.get_privacy_level(person, user_id, is_living), is_living
+            )
+            for person, is_living in page
+        ]
 
     def get_ancestors(
         self,
@@ -214,8 +198,8 @@ class PrivacyAwareSearch:
             if not person:
                 return
 
-            privacy_level = self.get_privacy_level(person, user_id)
             is_living = self.is_person_living(person)
+            privacy_level = self.get_privacy_level(person, user_id, is_living)
 
             # Créer le nœud ancêtre
             node = AncestorNode(
@@ -273,8 +257,8 @@ class PrivacyAwareSearch:
             if not person:
                 return
 
-            privacy_level = self.get_privacy_level(person, user_id)
             is_living = self.is_person_living(person)
+            privacy_level = self.get_privacy_level(person, user_id, is_living)
 
             # Ne pas afficher les personnes vivantes non autorisées
             if is_living and privacy_level == PrivacyLevel.ANONYMIZED:
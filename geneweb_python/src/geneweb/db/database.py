@@ -6,8 +6,9 @@ Inspired by OCaml database.ml
 import glob
 import os
 import pickle
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
 class VisibleState:
@@ -247,6 +248,42 @@ class ExtFilesManager:
         ]
 
 
+def _person_sex(person) -> Optional[str]:
+    """Sex of a stored person as a string, from ``sex`` or ``gender``."""
+    sex = getattr(person, "sex", None)
+    if sex is None:
+        return getattr(person, "gender", None)
+    return getattr(sex, "value", sex)
+
+
+def _person_birth_year(person) -> Optional[int]:
+    """Birth year of a stored person, or None when it is unknown."""
+    birth = getattr(person, "birth", None)
+    if birth is not None:
+        value = getattr(birth, "date", None)
+    else:
+        value = getattr(person, "birth_date", None)
+    if not value:
+        return None
+    try:
+        return int(str(value).split("-")[0])
+    except ValueError:
+        return None
+
+
+def _name_key(person) -> str:
+    """Lowercased "first_name surname" of a stored person or person dict."""
+    if isinstance(person, dict):
+        first_name, surname = person.get("first_name"), person.get("surname")
+    else:
+        first_name, surname = person.first_name, person.surname
+    return f"{(first_name or '').lower()} {(surname or '').lower()}"
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
 class Database:
     def __init__(self, dbdir: str, read_only: bool = False):
         self.dbdir = dbdir if dbdir.endswith(".gwb") else dbdir + ".gwb"
@@ -260,6 +297,10 @@ class Database:
         self.notes_manager = NotesManager(self.dbdir)
         self.wiznotes_manager = WizNotesManager(self.dbdir)
         self.ext_files_manager = ExtFilesManager(self.dbdir, "notes_d")
+        self._trigram_index: Dict[str, Set[int]] = {}
+        self._birth_years: Tuple[List[int], List[int], Set[int]] = ([], [], set())
+        # Persons list and length each lazy search index was built from
+        self._index_sources: Dict[str, Tuple[List[Any], int]] = {}
         # Initialize families storage
         if "families" not in self.data:
             self.data["families"] = {}
@@ -424,6 +465,7 @@ class Database:
         self.index = NameIndex()
         for person in self.data.get("persons", []):
             self.index.add_person(person)
+        self._index_sources.clear()
 
     def search_persons_by_name(self, name: str) -> List[Person]:
         ids = self.index.find_by_name(name)
@@ -470,6 +512,152 @@ class Database:
                 return Person(**person)
         return None
 
+    def get_persons(self, person_ids: Iterable[int]) -> Dict[int, Person]:
+        """Get several persons by ID in a single pass over the persons list.
+
+        IDs that match no person are left out of the returned mapping.
+        """
+        wanted = set(person_ids)
+        found: Dict[int, Person] = {}
+        for person in self.data.get("persons", []):
+            if not wanted:
+                break
+            if hasattr(person, "id"):
+                if person.id in wanted:
+                    wanted.discard(person.id)
+                    found[person.id] = person
+            elif isinstance(person, dict) and person.get("id") in wanted:
+                wanted.discard(person["id"])
+                found[person["id"]] = Person(**person)
+        return found
+
+    def _index_is_current(self, name: str, persons: List[Any]) -> bool:
+        """Tell whether a lazy search index was built from these persons.
+
+        Indexes are rebuilt when the persons list is replaced or changes
+        length, and by build_indexes (call it after editing persons in place).
+        """
+        source = self._index_sources.get(name)
+        if source is not None and source[0] is persons and source[1] == len(persons):
+            return True
+        self._index_sources[name] = (persons, len(persons))
+        return False
+
+    def _name_trigram_index(self) -> Dict[str, Set[int]]:
+        """Map each trigram of "first_name surname" to positions in the persons."""
+        persons = self.data.get("persons", [])
+        if not self._index_is_current("trigrams", persons):
+            index: Dict[str, Set[int]] = {}
+            for position, person in enumerate(persons):
+                for gram in _trigrams(_name_key(person)):
+                    index.setdefault(gram, set()).add(position)
+            self._trigram_index = index
+        return self._trigram_index
+
+    def _birth_year_index(self) -> Tuple[List[int], List[int], Set[int]]:
+        """Sorted birth years, the matching positions, and unknown-year positions."""
+        persons = self.data.get("persons", [])
+        if not self._index_is_current("birth_years", persons):
+            known = []
+            unknown = set()
+            for position, person in enumerate(persons):
+                if isinstance(person, dict):
+                    person = Person(**person)
+                birth_year = _person_birth_year(person)
+                if birth_year is None:
+                    unknown.add(position)
+                else:
+                    known.append((birth_year, position))
+            known.sort()
+            self._birth_years = (
+                [year for year, _ in known],
+                [position for _, position in known],
+                unknown,
+            )
+        return self._birth_years
+
+    def _name_positions(self, needles: List[str]) -> Optional[Set[int]]:
+        """Positions of persons whose name contains every trigram of the needles.
+
+        Returns None when no needle is long enough to narrow the search.
+        """
+        grams = set()
+        for needle in needles:
+            grams |= _trigrams(needle)
+        if not grams:
+            return None
+        index = self._name_trigram_index()
+        postings = sorted((index.get(gram, set()) for gram in grams), key=len)
+        positions = set(postings[0])
+        for posting in postings[1:]:
+            if not positions:
+                break
+            positions &= posting
+        return positions
+
+    def _birth_year_positions(
+        self, birth_year_from: Optional[int], birth_year_to: Optional[int]
+    ) -> Set[int]:
+        """Positions of persons born in the range or with an unknown birth year."""
+        years, positions, unknown = self._birth_year_index()
+        lo = bisect_left(years, birth_year_from) if birth_year_from else 0
+        hi = bisect_right(years, birth_year_to) if birth_year_to else len(years)
+        return unknown.union(positions[lo:hi])
+
+    def query_persons(
+        self,
+        first_name: Optional[str] = None,
+        surname: Optional[str] = None,
+        sex: Optional[str] = None,
+        birth_year_from: Optional[int] = None,
+        birth_year_to: Optional[int] = None,
+        text: Optional[str] = None,
+    ) -> Iterator[Person]:
+        """Yield the persons matching every given filter, in storage order.
+
+        Names and ``text`` match case-insensitive substrings, ``text`` being
+        looked up in "first_name surname". A person whose sex or birth year
+        is unknown is not excluded by the sex or birth year filters.
+
+        Name filters of three or more characters are first narrowed down with
+        the trigram index and birth years with a sorted year column, so only
+        the persons passing both are read.
+        """
+        # Cheapest checks first: sex, then the name substrings.
+        first_name = first_name.lower() if first_name else None
+        surname = surname.lower() if surname else None
+        text = text.lower() if text else None
+        text_spans_names = text is not None and " " in text
+        positions = self._name_positions(
+            [needle for needle in (text, first_name, surname) if needle]
+        )
+        if birth_year_from or birth_year_to:
+            in_range = self._birth_year_positions(birth_year_from, birth_year_to)
+            positions = in_range if positions is None else positions & in_range
+        persons = self.data.get("persons", [])
+        if positions is not None:
+            persons = [persons[position] for position in sorted(positions)]
+        for person in persons:
+            if isinstance(person, dict):
+                person = Person(**person)
+            if sex:
+                person_sex = _person_sex(person)
+                if person_sex and person_sex != sex:
+                    continue
+            person_surname = (person.surname or "").lower()
+            if surname and surname not in person_surname:
+                continue
+            person_first_name = (person.first_name or "").lower()
+            if first_name and first_name not in person_first_name:
+                continue
+            if text:
+                if text_spans_names:
+                    if text not in f"{person_first_name} {person_surname}":
+                        continue
+                elif text not in person_first_name and text not in person_surname:
+                    continue
+            yield person
+
     def add_person(self, person: Person) -> int:
         """Add a person to the database and return their ID."""
         if "persons" not in self.data:
@@ -2,9 +2,9 @@
 """
 Test script to verify bcrypt password truncation handling.
 
-This script tests that our TruncatingCryptContext correctly handles
-long passwords (>72 bytes) without raising ValueError, which can occur
-with bcrypt v4.1.0+ when truncate_error is enabled.
+This script tests that our bcrypt helpers correctly handle long
+passwords (>72 bytes) without raising ValueError, which bcrypt v4.1.0+
+raises for over-long input.
 
 Run this script to verify the fix works correctly:
     python test_bcrypt_fix.py
@@ -13,31 +13,32 @@ Run this script to verify the fix works correctly:
 import sys
 from pathlib import Path
 
-from geneweb.api.security.auth import AuthService, pwd_context
+import bcrypt
+
+from geneweb.api.security.auth import AuthService, check_password, hash_password
 
 # Add src to path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
 
-def test_password_context_with_long_password():
-    """Test that pwd_context handles long passwords correctly."""
+def test_password_helpers_with_long_password():
+    """Test that the bcrypt helpers handle long passwords correctly."""
     # Create a password longer than 72 bytes
     long_password = "a" * 100
 
     try:
         # Hash the password
-        hashed = pwd_context.hash(long_password)
+        hashed = hash_password(long_password)
 
         # Verify the password
-        assert pwd_context.verify(
-            long_password, hashed
-        ), "Password verification failed!"
+        assert check_password(long_password, hashed), "Password verification failed!"
 
-        # Verify that passwords with same first 72 bytes match
+        # Legacy bcrypt hashes only cover the first 72 bytes
+        legacy_hashed = bcrypt.hashpw(b"a" * 72, bcrypt.gensalt()).decode()
         similar_password = "a" * 72 + "b" * 28
-        assert pwd_context.verify(
-            similar_password, hashed
+        assert check_password(
+            similar_password, legacy_hashed
         ), "Similar password verification failed!"
 
         return True
@@ -68,13 +69,11 @@ def test_normal_password():
     normal_password = "MySecurePassword123!"
 
     try:
-        hashed = pwd_context.hash(normal_password)
+        hashed = hash_password(normal_password)
 
-        assert pwd_context.verify(normal_password, hashed), "Verification failed!"
+        assert check_password(normal_password, hashed), "Verification failed!"
 
-        assert not pwd_context.verify(
-            "WrongPassword", hashed
-        ), "Wrong password verified!"
+        assert not check_password("WrongPassword", hashed), "Wrong password verified!"
 
         return True
     except Exception:
@@ -88,7 +87,7 @@ if __name__ == "__main__":
 
     # Run all tests
     results = []
-    results.append(test_password_context_with_long_password())
+    results.append(test_password_helpers_with_long_password())
     results.append(test_auth_service_with_long_password())
     results.append(test_normal_password())
 
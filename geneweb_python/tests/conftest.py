@@ -1,16 +1,7 @@
 """Test configuration and fixtures."""
 
-import warnings
-
 import pytest
 
-warnings.filterwarnings(
-    "ignore",
-    message="'crypt' is deprecated and slated for removal in Python 3.13",
-    category=DeprecationWarning,
-    module=r"passlib\.utils.*",
-)
-
 collect_ignore = [
     "tests/unit/api/test_privacy_search_service.py",
     "tests/integration/test_search_endpoints.py",
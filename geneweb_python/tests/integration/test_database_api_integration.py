@@ -20,12 +20,12 @@ from geneweb.db.database import Database
 def mock_encryption():
     """Mock encryption functions to avoid requiring master key."""
     with patch(
-        "geneweb.api.services.person_service.encrypt_sensitive_data",
-        side_effect=lambda x: x,
+        "geneweb.api.services.person_service.encrypt_sensitive_data_batch",
+        side_effect=list,
     ):
         with patch(
-            "geneweb.api.services.person_service.decrypt_sensitive_data",
-            side_effect=lambda x: x,
+            "geneweb.api.services.person_service.decrypt_sensitive_data_batch",
+            side_effect=list,
         ):
             yield
 
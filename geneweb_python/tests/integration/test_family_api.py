@@ -172,6 +172,36 @@ class TestFamilyAPI:
         assert family["comment"] == "Beautiful ceremony"
         assert len(family["events"]) >= 1
 
+    def test_create_family_event_witnesses(self, client, sample_persons):
+        """Test that event witnesses are stored and returned with their kind."""
+        response = client.post(
+            "/api/v1/families/",
+            json={
+                "father_ids": [sample_persons["father_id"]],
+                "mother_ids": [sample_persons["mother_id"]],
+                "events": [
+                    {
+                        "event_name": "marriage",
+                        "witnesses": [
+                            {
+                                "person_id": sample_persons["witness_id"],
+                                "witness_kind": "witness_civilofficer",
+                            }
+                        ],
+                    }
+                ],
+            },
+        )
+
+        assert response.status_code == 201
+        event = response.json()["family"]["events"][0]
+        assert event["witnesses"] == [
+            {
+                "person_id": sample_persons["witness_id"],
+                "witness_kind": "witness_civilofficer",
+            }
+        ]
+
     def test_create_family_with_divorce(self, client, sample_persons):
         """Test creating a divorced family."""
         response = client.post(
@@ -5,7 +5,7 @@ Comprehensive tests for the audit trail system.
 import hashlib
 import json
 import unittest.mock
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID, uuid4
 
@@ -17,7 +17,10 @@ from geneweb.api.security.audit import (
     AuditLogger,
     AuditSeverity,
     AuditTrail,
-    audit_logger,
+    _AuditEventCore,
+    _fast_utc_iso,
+    _get_audit_ctx,
+    get_audit_logger,
 )
 
 
@@ -116,6 +119,31 @@ class TestAuditEvent:
             assert event.severity == severity
 
 
+class TestFastUtcIso:
+    """Test the cached ISO formatter used for audit checksums."""
+
+    def test_matches_isoformat_within_and_across_seconds(self):
+        """Test output is identical to isoformat for consecutive timestamps."""
+        base = datetime(2024, 5, 1, 12, 30, 59, 999999, tzinfo=timezone.utc)
+
+        for offset in (0, 1, 2, 500000, 1000000):
+            dt = base + timedelta(microseconds=offset)
+            assert _fast_utc_iso(dt) == dt.isoformat()
+
+    def test_matches_isoformat_without_microseconds(self):
+        """Test whole-second timestamps omit the fractional part."""
+        dt = datetime(2024, 5, 1, 12, 31, 0, tzinfo=timezone.utc)
+        assert _fast_utc_iso(dt) == dt.isoformat()
+
+    def test_non_utc_timestamps_fall_back_to_isoformat(self):
+        """Test naive and non-UTC datetimes are formatted unchanged."""
+        naive = datetime(2024, 5, 1, 12, 30, 0, 123)
+        offset = naive.replace(tzinfo=timezone(timedelta(hours=2)))
+
+        assert _fast_utc_iso(naive) == naive.isoformat()
+        assert _fast_utc_iso(offset) == offset.isoformat()
+
+
 class TestAuditTrail:
     """Test AuditTrail functionality."""
 
@@ -315,6 +343,26 @@ class TestAuditTrail:
             assert event.new_values is not None
             assert event.metadata == "encrypted_metadata"
 
+    def test_audit_event_core_mirrors_audit_event_fields(self):
+        """Test that the write-path core declares every AuditEvent field."""
+        assert set(_AuditEventCore.__dataclass_fields__) == set(AuditEvent.model_fields)
+
+    @pytest.mark.asyncio
+    async def test_log_event_returns_serializable_event(self):
+        """Test that events built from the core dump like validated events."""
+        with patch.object(
+            self.audit_trail, "_store_audit_event", new_callable=AsyncMock
+        ):
+            event = await self.audit_trail.log_event(
+                action=AuditAction.CREATE, description="Core event"
+            )
+
+        dumped = event.model_dump()
+        assert isinstance(event, AuditEvent)
+        assert dumped["description"] == "Core event"
+        assert dumped["session_id"] is None
+        assert dumped["checksum"] == event.checksum
+
     def test_verify_event_integrity_valid(self):
         """Test event integrity verification with valid checksum."""
         event = AuditEvent(action=AuditAction.CREATE, description="Test event")
@@ -410,6 +458,27 @@ class TestAuditTrail:
         # Check second event (no encryption)
         event2_data = result["events"][1]
         assert event2_data["old_values"]["id"] == "123"
+        assert result["first_tampered_event"] is None
+
+    @pytest.mark.asyncio
+    @patch.object(AuditTrail, "get_audit_trail")
+    async def test_export_gdpr_audit_trail_reports_first_tampered_event(
+        self, mock_get_trail
+    ):
+        """Test that export stops verifying at the first tampered event."""
+        event1 = AuditEvent(action=AuditAction.CREATE, description="Event 1")
+        event2 = AuditEvent(action=AuditAction.UPDATE, description="Event 2")
+        event3 = AuditEvent(action=AuditAction.READ, description="Event 3")
+        mock_get_trail.return_value = [event1, event2, event3]
+
+        with patch.object(
+            self.audit_trail, "verify_event_integrity", side_effect=[True, False]
+        ) as mock_verify:
+            result = await self.audit_trail.export_gdpr_audit_trail(uuid4())
+
+        assert result["integrity_verified"] is False
+        assert result["first_tampered_event"] == str(event2.id)
+        assert mock_verify.call_count == 2
 
 
 class TestAuditLogger:
@@ -567,16 +636,54 @@ class TestAuditLogger:
             assert call_kwargs["resource_type"] == "person"
             assert call_kwargs["resource_id"] == resource_id
 
+    def test_audit_ctx_cached_on_security_context(self):
+        """Test that the audit context is built once per security context."""
+        ctx = _get_audit_ctx(self.security_context)
+
+        assert ctx.user_id == self.security_context.user.user_id
+        assert ctx.username == "testuser"
+        assert ctx.user_role == "admin"
+        assert ctx.request_id == self.security_context.request_id
+        assert _get_audit_ctx(self.security_context) is ctx
+
+    @pytest.mark.asyncio
+    async def test_log_event_ctx_forwards_context_fields(self):
+        """Test that log_event_ctx unpacks the context into log_event."""
+        ctx = _get_audit_ctx(self.security_context)
+        resource_id = uuid4()
+
+        with patch.object(
+            self.audit_logger.audit_trail, "log_event", new_callable=AsyncMock
+        ) as mock_log:
+            await self.audit_logger.audit_trail.log_event_ctx(
+                ctx,
+                action=AuditAction.READ,
+                description="Context test",
+                resource_id=resource_id,
+            )
+
+            call_kwargs = mock_log.call_args.kwargs
+            assert call_kwargs["user_id"] == ctx.user_id
+            assert call_kwargs["username"] == "testuser"
+            assert call_kwargs["user_agent"] == "Test Agent"
+            assert call_kwargs["ip_address"] == "192.168.1.1"
+            assert call_kwargs["resource_id"] == resource_id
+
 
 class TestGlobalAuditLogger:
     """Test global audit logger instance."""
 
     def test_global_audit_logger_instance(self):
         """Test that global audit logger is available."""
+        audit_logger = get_audit_logger()
         assert audit_logger is not None
         assert isinstance(audit_logger, AuditLogger)
         assert hasattr(audit_logger, "audit_trail")
 
+    def test_global_audit_logger_is_reused(self):
+        """Test that the global audit logger is created once and reused."""
+        assert get_audit_logger() is get_audit_logger()
+
 
 class TestIntegrationScenarios:
     """Test integration scenarios for audit system."""
@@ -1,12 +1,15 @@
 """Tests for authentication and authorization module."""
 
+import base64
+import time
 from datetime import datetime
 from unittest.mock import patch
 from uuid import UUID, uuid4
 
+import bcrypt
 import pytest
 from fastapi import HTTPException, status
-from jose import jwt
+from jose import JWTError, jwt
 
 from geneweb.api.security.auth import (
     ALGORITHM,
@@ -19,8 +22,12 @@ from geneweb.api.security.auth import (
     User,
     UserCreate,
     UserRole,
+    _fast_verify_hs256,
     auth_service,
-    pwd_context,
+    check_password,
+    get_dummy_password_hash,
+    hash_password,
+    password_needs_rehash,
 )
 
 
@@ -159,6 +166,20 @@ class TestTokenData:
         assert token_data.role == UserRole.USER
         assert token_data.permissions == permissions
 
+    def test_token_data_has_permission(self):
+        """Test permission membership on TokenData."""
+        token_data = TokenData(
+            user_id=uuid4(),
+            username="testuser",
+            role=UserRole.USER,
+            permissions=[Permission.VIEW_PUBLIC_PERSONS],
+        )
+
+        assert token_data.has_permission(Permission.VIEW_PUBLIC_PERSONS) is True
+        assert token_data.has_permission(Permission.MANAGE_USERS) is False
+        assert token_data.model_copy().has_permission(Permission.VIEW_PUBLIC_PERSONS)
+        assert "_permissions_set" not in token_data.model_dump()
+
 
 class TestAuthService:
     """Test AuthService class."""
@@ -185,8 +206,9 @@ class TestAuthService:
         assert hashed != password
         assert len(hashed) > 0
 
-        # Verify the hash works with bcrypt
-        assert pwd_context.verify(password, hashed)
+        # New hashes use Argon2id
+        assert hashed.startswith("$argon2id$")
+        assert check_password(password, hashed)
 
     @patch("geneweb.api.security.auth.settings")
     def test_create_access_token(self, mock_settings, auth_service):
@@ -215,6 +237,8 @@ class TestAuthService:
         assert "permissions" in payload
         assert "exp" in payload
         assert "iat" in payload
+        assert payload["exp"] - payload["iat"] == 30 * 60
+        assert len(payload["jti"]) == 22  # 16 random bytes, urlsafe base64
 
     @patch("geneweb.api.security.auth.settings")
     def test_create_refresh_token(self, mock_settings, auth_service):
@@ -252,6 +276,7 @@ class TestAuthService:
             full_name="Test User",
             role=UserRole.USER,
             family_person_id=uuid4(),
+            related_person_ids={uuid4(), uuid4()},
         )
 
         token = auth_service.create_access_token(user)
@@ -262,6 +287,7 @@ class TestAuthService:
         assert token_data.username == user.username
         assert token_data.role == user.role
         assert token_data.family_person_id == user.family_person_id
+        assert token_data.related_person_ids == user.related_person_ids
         assert len(token_data.permissions) > 0
 
     @patch("geneweb.api.security.auth.settings")
@@ -295,6 +321,148 @@ class TestAuthService:
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Invalid token type" in str(exc_info.value.detail)
 
+    @patch("geneweb.api.security.auth.settings")
+    def test_verify_token_unknown_permission(self, mock_settings, auth_service):
+        """Test that a token with an unknown permission claim is rejected."""
+        mock_settings.security.secret_key = "test_secret_key"
+        token = jwt.encode(
+            {
+                "sub": str(uuid4()),
+                "username": "testuser",
+                "role": "user",
+                "permissions": ["not_a_permission"],
+                "type": "access",
+            },
+            "test_secret_key",
+            algorithm=ALGORITHM,
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            auth_service.verify_token(token, check_blacklist=False)
+
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @patch("geneweb.api.security.auth.settings")
+    def test_verify_token_reuses_cached_decode(self, mock_settings, auth_service):
+        """Test that verifying the same token twice decodes it only once."""
+        mock_settings.security.secret_key = "test_secret_key"
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            full_name="Test User",
+        )
+        token = auth_service.create_access_token(user)
+
+        with patch(
+            "geneweb.api.security.auth._fast_verify_hs256",
+            wraps=_fast_verify_hs256,
+        ) as mock_decode:
+            first = auth_service.verify_token(token, check_blacklist=False)
+            second = auth_service.verify_token(token, check_blacklist=False)
+
+        assert mock_decode.call_count == 1
+        assert first == second
+        assert first is not second
+
+    @patch("geneweb.api.security.auth.settings")
+    def test_verify_token_matches_validated_model(self, mock_settings, auth_service):
+        """Test that the unvalidated TokenData equals a fully validated one."""
+        mock_settings.security.secret_key = "test_secret_key"
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            full_name="Test User",
+            related_person_ids={uuid4()},
+        )
+
+        token_data = auth_service.verify_token(
+            auth_service.create_access_token(user), check_blacklist=False
+        )
+
+        assert token_data == TokenData.model_validate(token_data.model_dump())
+        assert token_data.has_permission(Permission.CREATE_PERSON) is True
+
+    def test_fast_verify_matches_jose(self):
+        """Test that the HS256 verifier returns the same claims as python-jose."""
+        payload = {"sub": "123", "username": "émile", "exp": int(time.time()) + 60}
+        token = jwt.encode(payload, "test_secret_key", algorithm=ALGORITHM)
+
+        assert _fast_verify_hs256(token, "test_secret_key") == jwt.decode(
+            token, "test_secret_key", algorithms=[ALGORITHM]
+        )
+
+    @pytest.mark.parametrize(
+        "token",
+        [
+            "not-a-token",
+            "a.b.c.d",
+            jwt.encode({"sub": "123"}, "other_key", algorithm=ALGORITHM),
+            jwt.encode({"sub": "123"}, "test_secret_key", algorithm="HS512"),
+            jwt.encode({"sub": "123", "exp": "soon"}, "test_secret_key"),
+        ],
+    )
+    def test_fast_verify_rejects_invalid_tokens(self, token):
+        """Test that bad signatures, algorithms and claims are rejected."""
+        with pytest.raises(JWTError):
+            _fast_verify_hs256(token, "test_secret_key")
+
+    def test_fast_verify_rejects_unsigned_token(self):
+        """Test that an 'alg: none' token with an empty signature is rejected."""
+        header = base64.urlsafe_b64encode(b'{"alg":"none","typ":"JWT"}')
+        body = base64.urlsafe_b64encode(b'{"sub":"123"}')
+        token = f"{header.decode().rstrip('=')}.{body.decode().rstrip('=')}."
+
+        with pytest.raises(JWTError):
+            _fast_verify_hs256(token, "test_secret_key")
+
+    @patch("geneweb.api.security.auth.settings")
+    def test_verify_token_rejects_expired_cached_token(
+        self, mock_settings, auth_service
+    ):
+        """Test that a cached token is rejected once its expiry has passed."""
+        mock_settings.security.secret_key = "test_secret_key"
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            full_name="Test User",
+        )
+        token = auth_service.create_access_token(user)
+        auth_service.verify_token(token, check_blacklist=False)
+
+        with (
+            patch("geneweb.api.security.auth.time.time", return_value=float(2**40)),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            auth_service.verify_token(token, check_blacklist=False)
+
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_default_users_hashed_once(self, auth_service):
+        """Test that new instances reuse the default users' password hashes."""
+        with patch.object(AuthService, "get_password_hash") as mock_hash:
+            other = AuthService()
+
+        mock_hash.assert_not_called()
+        assert other.users_db["admin"]["hashed_password"] == (
+            auth_service.users_db["admin"]["hashed_password"]
+        )
+        assert other.users_db["admin"]["user"] is not (
+            auth_service.users_db["admin"]["user"]
+        )
+        assert other.authenticate_user("admin", "admin123") is not None
+
+    def test_demo_users_can_be_disabled(self):
+        """Test that no default users are created when disabled in settings."""
+        with (
+            patch("geneweb.api.security.auth.settings.security.init_demo_users", False),
+            patch.object(AuthService, "get_password_hash") as mock_hash,
+        ):
+            service = AuthService()
+
+        mock_hash.assert_not_called()
+        assert service.users_db == {}
+        assert service.get_user_by_email("admin@geneweb.local") is None
+
     def test_has_permission(self, auth_service):
         """Test permission checking - all roles have all permissions now."""
         # USER has all permissions
@@ -368,11 +536,42 @@ class TestAuthService:
         result = auth_service.authenticate_user("testuser", "password")
         assert result is None
 
+    def test_authenticate_unknown_user_checks_dummy_hash(self, auth_service):
+        """Test that unknown usernames still go through a password check."""
+        with patch.object(
+            auth_service, "verify_password", return_value=False
+        ) as verify:
+            assert auth_service.authenticate_user("ghost", "password") is None
+            assert auth_service.authenticate_user("ghost", "other") is None
+
+        hashes = [call.args[1] for call in verify.call_args_list]
+        assert hashes == [get_dummy_password_hash()] * 2
+
     def test_get_user_by_username_not_implemented(self, auth_service):
         """Test get_user_by_username returns None (not implemented)."""
         result = auth_service.get_user_by_username("testuser")
         assert result is None
 
+    def test_get_user_by_email_is_case_insensitive(self, auth_service):
+        """Test that email lookup uses the index and ignores case."""
+        user = auth_service.get_user_by_email("Admin@GeneWeb.local")
+
+        assert user is auth_service.users_db["admin"]["user"]
+        assert auth_service.get_user_by_email("nobody@geneweb.local") is None
+
+    def test_add_user_updates_email_index(self, auth_service):
+        """Test that added users can be found by email."""
+        user = User(
+            username="newuser",
+            email="New.User@example.com",
+            full_name="New User",
+        )
+
+        auth_service.add_user(user, auth_service.get_password_hash("password123"))
+
+        assert auth_service.get_user_by_username("newuser") is user
+        assert auth_service.get_user_by_email("new.user@example.com") is user
+
 
 class TestSecurityContext:
     """Test SecurityContext class."""
@@ -433,6 +632,15 @@ class TestSecurityContext:
         assert context.can_access_person(person_id, Permission.VIEW_ALL_PERSONS) is True
         assert context.can_access_person(person_id, Permission.DELETE_PERSON) is True
 
+    def test_can_access_person_uses_global_service(self, token_data):
+        """Test that access checks do not build a new AuthService."""
+        context = SecurityContext(user=token_data)
+
+        with patch("geneweb.api.security.auth.AuthService") as mock_service:
+            context.can_access_person(uuid4(), Permission.VIEW_ALL_PERSONS)
+
+        mock_service.assert_not_called()
+
     def test_require_person_access_valid(self, token_data):
         """Test require_person_access - all access is valid now."""
         context = SecurityContext(user=token_data)
@@ -479,39 +687,89 @@ class TestGlobalAuthService:
         assert hasattr(auth_service, "can_access_person")
 
 
-class TestPasswordContext:
-    """Test password context configuration."""
+class TestPasswordHashing:
+    """Test password hashing helpers."""
+
+    def test_hash_uses_argon2id_by_default(self):
+        """Test that new hashes are Argon2id hashes."""
+        assert hash_password("test_password_123").startswith("$argon2id$")
 
-    def test_password_context_schemes(self):
-        """Test that password context uses bcrypt."""
-        assert "bcrypt" in pwd_context.schemes()
+    def test_hash_uses_bcrypt_with_configured_rounds(self):
+        """Test that the bcrypt scheme uses the configured cost."""
+        with patch("geneweb.api.security.auth.settings") as mock_settings:
+            mock_settings.security.password_hash_scheme = "bcrypt"
+            mock_settings.security.bcrypt_rounds = 4
+            hashed = hash_password("test_password_123")
+
+        assert hashed.startswith("$2b$04$")
+        assert check_password("test_password_123", hashed) is True
 
     def test_password_hashing_works(self):
         """Test that password hashing and verification works."""
         password = "test_password_123"
-        hashed = pwd_context.hash(password)
+        hashed = hash_password(password)
 
         assert isinstance(hashed, str)
         assert hashed != password
-        assert pwd_context.verify(password, hashed) is True
-        assert pwd_context.verify("wrong_password", hashed) is False
+        assert check_password(password, hashed) is True
+        assert check_password("wrong_password", hashed) is False
+
+    def test_password_as_bytes(self):
+        """Test that already-encoded passwords hash and verify like strings."""
+        legacy = bcrypt.hashpw(b"test_password_123", bcrypt.gensalt(rounds=4))
+
+        assert check_password(b"test_password_123", legacy.decode()) is True
+        assert check_password(b"test_password_123", hash_password("test_password_123"))
+        assert check_password("test_password_123", hash_password(b"test_password_123"))
+
+    def test_check_password_malformed_hash(self):
+        """Test that a malformed hash never verifies."""
+        assert check_password("test_password_123", "not-a-bcrypt-hash") is False
+        assert check_password("test_password_123", "$argon2id$broken") is False
+
+    def test_password_needs_rehash(self):
+        """Test that legacy bcrypt hashes are flagged for migration."""
+        legacy = bcrypt.hashpw(b"test_password_123", bcrypt.gensalt(rounds=4))
+
+        assert password_needs_rehash(legacy.decode()) is True
+        assert password_needs_rehash(hash_password("test_password_123")) is False
+
+    def test_authenticate_user_migrates_bcrypt_hash(self):
+        """Test that a successful login rehashes a legacy bcrypt hash."""
+        auth_service = AuthService()
+        legacy = bcrypt.hashpw(b"admin123", bcrypt.gensalt(rounds=4)).decode()
+        auth_service.users_db["admin"]["hashed_password"] = legacy
+
+        assert auth_service.authenticate_user("admin", "admin123") is not None
+
+        migrated = auth_service.users_db["admin"]["hashed_password"]
+        assert migrated.startswith("$argon2id$")
+        assert auth_service.authenticate_user("admin", "admin123") is not None
 
     def test_long_password_truncation(self):
-        """Test that passwords longer than 72 bytes are truncated."""
+        """Test that bcrypt hashes only use the first 72 bytes."""
         # Create a password longer than 72 bytes
         long_password = "a" * 80
-        auth_service = AuthService()
-
-        # Hash should work without raising ValueError
-        hashed = auth_service.get_password_hash(long_password)
-        assert isinstance(hashed, str)
+        hashed = bcrypt.hashpw(b"a" * 72, bcrypt.gensalt(rounds=4)).decode()
 
         # Verification should work with same long password
-        assert auth_service.verify_password(long_password, hashed) is True
+        assert check_password(long_password, hashed) is True
 
         # Should fail with different password
-        assert auth_service.verify_password("wrong", hashed) is False
+        assert check_password("wrong", hashed) is False
 
         # Passwords with same first 72 chars should match
         similar_password = "a" * 72 + "b" * 8
-        assert auth_service.verify_password(similar_password, hashed) is True
+        assert check_password(similar_password, hashed) is True
+
+    def test_long_password_argon2(self):
+        """Test that Argon2id hashes use the whole password."""
+        long_password = "a" * 80
+        auth_service = AuthService()
+
+        # Hash should work without raising ValueError
+        hashed = auth_service.get_password_hash(long_password)
+        assert isinstance(hashed, str)
+
+        assert auth_service.verify_password(long_password, hashed) is True
+        assert auth_service.verify_password("a" * 72 + "b" * 8, hashed) is False
@@ -0,0 +1,189 @@
+"""Tests for the sensitive data encryption module."""
+
+import base64
+import hashlib
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from geneweb.api.security.encryption import (
+    DataEncryptor,
+    EncryptionError,
+    GDPRAnonymizer,
+    _derive_master_key,
+    decrypt_sensitive_data_batch,
+)
+
+
+class TestDataEncryptor:
+    """Test DataEncryptor encrypt/decrypt behavior."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.encryptor = DataEncryptor(master_key="test-master-key")
+
+    def test_encrypt_decrypt_roundtrip(self):
+        """Test that encrypted data decrypts back to the original text."""
+        encrypted = self.encryptor.encrypt("Sensitive data 🔒")
+
+        assert encrypted != "Sensitive data 🔒"
+        assert self.encryptor.decrypt(encrypted) == "Sensitive data 🔒"
+
+    def test_encrypt_uses_random_nonce(self):
+        """Test that encrypting twice gives different ciphertexts."""
+        assert self.encryptor.encrypt("same") != self.encryptor.encrypt("same")
+
+    def test_encrypt_none(self):
+        """Test that None passes through encrypt and decrypt."""
+        assert self.encryptor.encrypt(None) is None
+        assert self.encryptor.decrypt(None) is None
+
+    def test_decrypt_legacy_fernet_token(self):
+        """Test that data encrypted with the former Fernet format still decrypts."""
+        fernet = self.encryptor._create_fernet()
+        legacy = base64.urlsafe_b64encode(fernet.encrypt(b"legacy value")).decode()
+
+        assert self.encryptor.decrypt(legacy) == "legacy value"
+
+    def test_decrypt_with_wrong_key_fails(self):
+        """Test that another master key cannot decrypt the data."""
+        encrypted = self.encryptor.encrypt("secret")
+        other = DataEncryptor(master_key="another-master-key")
+
+        with pytest.raises(EncryptionError):
+            other.decrypt(encrypted)
+
+    def test_decrypt_tampered_data_fails(self):
+        """Test that modified ciphertext is rejected."""
+        raw = bytearray(base64.urlsafe_b64decode(self.encryptor.encrypt("secret")))
+        raw[-1] ^= 0x01
+        tampered = base64.urlsafe_b64encode(bytes(raw)).decode()
+
+        with pytest.raises(EncryptionError):
+            self.encryptor.decrypt(tampered)
+
+    def test_key_derivation_is_cached(self):
+        """Test that the PBKDF2 stretch runs once per master key."""
+        _derive_master_key.cache_clear()
+        DataEncryptor(master_key="cached-key")
+        DataEncryptor(master_key="cached-key")
+
+        assert _derive_master_key.cache_info().misses == 1
+
+    def test_json_roundtrip(self):
+        """Test JSON encryption round-trip."""
+        data = {"birth_date": "1990-01-01", "notes": ["a", "b"]}
+
+        encrypted = self.encryptor.encrypt_json(data)
+
+        assert self.encryptor.decrypt_json(encrypted) == data
+
+    def test_json_batch_roundtrip(self):
+        """Test batch JSON encryption round-trip, including None records."""
+        records = [{"name": "a"}, None, [1, 2, 3], "text"]
+
+        encrypted = self.encryptor.encrypt_json_batch(records)
+
+        assert encrypted[1] is None
+        assert len(set(e for e in encrypted if e is not None)) == 3
+        assert self.encryptor.decrypt_json_batch(encrypted) == records
+
+    def test_json_batch_matches_single_record_format(self):
+        """Test that batch output can be read by decrypt_json and vice versa."""
+        batch = self.encryptor.encrypt_json_batch([{"id": 1}])
+        single = self.encryptor.encrypt_json({"id": 2})
+
+        assert self.encryptor.decrypt_json(batch[0]) == {"id": 1}
+        assert self.encryptor.decrypt_json_batch([single]) == [{"id": 2}]
+
+    def test_batch_roundtrip(self):
+        """Test batch encryption, readable one value at a time and in batch."""
+        values = ["1990-01-01", None, "Paris", b"bytes"]
+
+        encrypted = self.encryptor.encrypt_batch(values)
+
+        assert encrypted[1] is None
+        assert self.encryptor.decrypt(encrypted[2]) == "Paris"
+        assert self.encryptor.decrypt_batch(encrypted) == [
+            "1990-01-01",
+            None,
+            "Paris",
+            "bytes",
+        ]
+
+    def test_sensitive_data_batch_falls_back_per_value(self):
+        """Test that one unreadable value does not hide the others."""
+        good = self.encryptor.encrypt("secret")
+
+        with patch(
+            "geneweb.api.security.encryption.get_encryptor",
+            return_value=self.encryptor,
+        ):
+            decrypted = decrypt_sensitive_data_batch([good, "not-encrypted"])
+
+        assert decrypted == ["secret", "not-encrypted"]
+
+    def test_json_serializes_uuid_and_dates(self):
+        """Test that UUIDs and dates are stored as their ISO/string forms."""
+        person_id = uuid4()
+        created = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        data = {"id": person_id, "born": date(1990, 1, 1), "created": created}
+
+        decrypted = self.encryptor.decrypt_json(self.encryptor.encrypt_json(data))
+
+        assert decrypted == {
+            "id": str(person_id),
+            "born": "1990-01-01",
+            "created": created.isoformat(),
+        }
+
+    def test_json_accepts_non_string_keys(self):
+        """Test that integer keys are converted to strings like the json module."""
+        encrypted = self.encryptor.encrypt_json({1: "one"})
+
+        assert self.encryptor.decrypt_json(encrypted) == {"1": "one"}
+
+
+class TestGDPRAnonymizer:
+    """Test GDPR anonymization helpers."""
+
+    def test_anonymize_person_data_uses_stable_hash(self):
+        """Test that the anonymous name derives from sha256("anon_" + id)."""
+        person_id = str(uuid4())
+        expected = hashlib.sha256(f"anon_{person_id}".encode()).hexdigest()[:8]
+
+        first = GDPRAnonymizer.anonymize_person_data({"id": person_id})
+        second = GDPRAnonymizer.anonymize_person_data({"id": person_id})
+
+        assert first["first_name"] == f"Anonymous_{expected}"
+        assert second["first_name"] == first["first_name"]
+
+    def test_anonymize_person_data_fields(self):
+        """Test that identifiable fields are replaced and others kept."""
+        person = {
+            "id": "p1",
+            "first_name": "Jean",
+            "email": "jean@example.com",
+            "birth_date": "1900-01-01",
+            "death_place": "Paris",
+            "family_id": "f1",
+        }
+
+        anonymized = GDPRAnonymizer.anonymize_person_data(person)
+
+        assert anonymized["first_name"].startswith("Anonymous_")
+        assert anonymized["email"] is None
+        assert anonymized["death_place"] == "Unknown"
+        assert anonymized["birth_date"] == "1900-01-01"
+        assert anonymized["family_id"] == "f1"
+        assert anonymized["is_deleted"] is True
+        assert person["first_name"] == "Jean"
+
+    def test_get_anonymization_hash(self):
+        """Test the audit trail anonymization hash."""
+        person_id = str(uuid4())
+        expected = hashlib.sha256(f"gdpr_anon_{person_id}".encode()).hexdigest()
+
+        assert GDPRAnonymizer.get_anonymization_hash(person_id) == expected
@@ -3,11 +3,14 @@ Tests for security logging functionality.
 """
 
 import logging
+import logging.handlers
+import re
 from unittest.mock import Mock, patch
 
 from geneweb.api.security.logging import (
     SecurityEventProcessor,
     SensitiveDataFilter,
+    _render_exception_info,
     get_api_logger,
     get_security_logger,
     log_security_event,
@@ -82,6 +85,84 @@ class TestSensitiveDataFilter:
         assert "john.doe@example.com" not in record.msg
         assert "***MASKED***" in record.msg
 
+    def test_filter_multiple_patterns_in_one_message(self):
+        """Test that every kind of sensitive value in a message is masked."""
+        filter_obj = SensitiveDataFilter()
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=1,
+            msg="Mail jane@example.org card 1234 5678 9012 3456 ssn 123-45-6789",
+            args=(),
+            exc_info=None,
+        )
+
+        filter_obj.filter(record)
+        assert record.msg == ("Mail ***MASKED*** card ***MASKED*** ssn ***MASKED***")
+
+    def test_filter_extra_fields(self):
+        """Test that extra fields with sensitive names or values are masked."""
+        filter_obj = SensitiveDataFilter()
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=1,
+            msg="Profile updated",
+            args=(),
+            exc_info=None,
+        )
+        record.contact = "jane@example.org"
+        record.api_token = "abc123"
+        record.city = "Paris"
+
+        filter_obj.filter(record)
+        assert record.contact == "***MASKED***"
+        assert record.api_token == "***MASKED***"
+        assert record.city == "Paris"
+        assert record.msg == "Profile updated"
+
+    def test_filter_keeps_message_structure(self):
+        """Test that only the sensitive value is masked in a scrubbed message."""
+        filter_obj = SensitiveDataFilter()
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="/app/token_service.py",
+            lineno=1,
+            msg='Login: {"password": "secret123", "user": "john"}',
+            args=(),
+            exc_info=None,
+        )
+
+        filter_obj.filter(record)
+        assert record.msg == 'Login: {"password": "***MASKED***", "user": "john"}'
+        assert record.pathname == "/app/token_service.py"
+
+    def test_filter_custom_pattern_is_not_prefiltered(self):
+        """Test that extra patterns still run on text the built-in gate skips."""
+        filter_obj = SensitiveDataFilter()
+        filter_obj.sensitive_patterns.append(re.compile(r"hunter"))
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=1,
+            msg="pw hunter",
+            args=(),
+            exc_info=None,
+        )
+        record.hint = "hunter"
+
+        filter_obj.filter(record)
+        assert record.msg == "pw ***MASKED***"
+        assert record.hint == "***MASKED***"
+
     def test_filter_clean_data(self):
         """Test filtering data without sensitive content."""
         filter_obj = SensitiveDataFilter()
@@ -153,6 +234,32 @@ class TestSecurityEventProcessor:
         # Should return event dict unchanged (or with minimal processing)
         assert "message" in result
 
+    def test_call_classifies_known_events(self):
+        """Test security and compliance tags for known event types."""
+        processor = SecurityEventProcessor()
+
+        login = processor(None, "security", {"event": "login"})
+        access = processor(None, "security", {"event": "data_access"})
+
+        assert login["security_event"] is True
+        assert login["priority"] == "high"
+        assert "compliance_relevant" not in login
+        assert access["compliance_relevant"] is True
+        assert "security_event" not in access
+
+    def test_render_exception_info(self):
+        """Test that exception info is only rendered when present."""
+        event_dict = {"event": "plain"}
+        assert _render_exception_info(None, "info", event_dict) is event_dict
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            result = _render_exception_info(None, "error", {"exc_info": True})
+
+        assert "exc_info" not in result
+        assert "ValueError: boom" in result["exception"]
+
     def test_call_with_auth_event(self):
         """Test processing authentication events."""
         processor = SecurityEventProcessor()
@@ -189,9 +296,31 @@ class TestLoggingSetup:
         assert "processors" in call_kwargs
         assert "wrapper_class" in call_kwargs
 
+    def test_setup_logging_writes_through_queue(self, capsys):
+        """Test that records are queued, then masked and written by the listener."""
+        from geneweb.api.security import logging as security_logging
+
+        root_logger = setup_logging()
+        try:
+            assert len(root_logger.handlers) == 1
+            assert isinstance(root_logger.handlers[0], logging.handlers.QueueHandler)
+
+            logging.getLogger("geneweb.api").warning('{"password": "secret123"}')
+        finally:
+            security_logging._stop_log_listener()
+            for handler in root_logger.handlers[:]:
+                root_logger.removeHandler(handler)
+
+        output = capsys.readouterr().out
+        assert "secret123" not in output
+        assert "***MASKED***" in output
+
     def test_get_security_logger(self):
         """Test getting security logger."""
-        with patch("structlog.get_logger") as mock_get_logger:
+        with (
+            patch("structlog.get_logger") as mock_get_logger,
+            patch("geneweb.api.security.logging._security_logger", None),
+        ):
             mock_logger = Mock()
             mock_get_logger.return_value = mock_logger
 
@@ -200,6 +329,24 @@ class TestLoggingSetup:
             mock_get_logger.assert_called_once_with("geneweb.security")
             assert logger == mock_logger
 
+    def test_get_security_logger_is_cached(self):
+        """Test that the security logger is created once until reconfigured."""
+        with (
+            patch("structlog.get_logger") as mock_get_logger,
+            patch("geneweb.api.security.logging._security_logger", None),
+        ):
+            first = get_security_logger()
+            second = get_security_logger()
+
+            mock_get_logger.assert_called_once_with("geneweb.security")
+            assert first is second
+
+            with patch("geneweb.api.security.logging.structlog"):
+                setup_logging()
+            get_security_logger()
+
+            assert mock_get_logger.call_count == 2
+
     def test_get_api_logger(self):
         """Test getting API logger."""
         with patch("structlog.get_logger") as mock_get_logger:
@@ -291,6 +438,22 @@ class TestSecurityEventLogging:
             # User agent should be truncated to 100 characters
             assert len(logged_data["request"]["user_agent"]) == 100
 
+    def test_log_security_event_skips_unrelated_request_info(self):
+        """Test that request info without any safe field is not logged."""
+        with patch(
+            "geneweb.api.security.logging.get_security_logger"
+        ) as mock_get_logger:
+            mock_logger = Mock()
+            mock_get_logger.return_value = mock_logger
+
+            log_security_event("test_event", {}, {"password": "secret"})
+            log_security_event("test_event", {}, {"path": "/", "user_agent": None})
+
+            first, second = mock_logger.info.call_args_list
+            assert "request" not in first[1]
+            assert second[1]["request"]["path"] == "/"
+            assert second[1]["request"]["user_agent"] == ""
+
     def test_log_security_event_without_request_info(self):
         """Test security event logging without request information."""
         with patch(
@@ -0,0 +1,125 @@
+"""
+Tests for password validation and strength checking.
+"""
+
+import pytest
+
+from geneweb.api.security.password_validator import (
+    SPECIAL_CHARACTERS,
+    PasswordStrength,
+    PasswordValidator,
+    password_validator,
+)
+
+
+class TestPasswordValidator:
+    """Test PasswordValidator.validate."""
+
+    def test_valid_password(self):
+        """Test that a password meeting every rule is accepted."""
+        is_valid, errors = password_validator.validate("Tr0ub4dor&Zx")
+
+        assert is_valid is True
+        assert errors == []
+
+    @pytest.mark.parametrize(
+        "password, expected_error",
+        [
+            ("Sh0rt!", "Password must be at least 8 characters long"),
+            ("lowercase1!x", "Password must contain at least one uppercase letter"),
+            ("UPPERCASE1!X", "Password must contain at least one lowercase letter"),
+            ("NoDigitsHere!", "Password must contain at least one number"),
+            ("NoSpecial1Here", "Password must contain at least one special character"),
+            (
+                "Xyz!abc9Qw",
+                "Password contains sequential characters (e.g., '123', 'abc')",
+            ),
+            ("Qw!9aaaRt", "Password contains too many repeated characters"),
+        ],
+    )
+    def test_validate_errors(self, password, expected_error):
+        """Test that each rule reports its error."""
+        is_valid, errors = password_validator.validate(password)
+
+        assert is_valid is False
+        assert expected_error in errors
+
+    def test_common_password(self):
+        """Test that common passwords are rejected regardless of case."""
+        _, errors = password_validator.validate("PASSWORD123")
+
+        assert "Password is too common and easily guessable" in errors
+
+    def test_too_long_password(self):
+        """Test the maximum length."""
+        validator = PasswordValidator(max_length=10)
+
+        _, errors = validator.validate("Tr0ub4dor&Zx")
+
+        assert "Password must be at most 10 characters long" in errors
+
+    def test_optional_requirements(self):
+        """Test that disabled requirements are not enforced."""
+        validator = PasswordValidator(
+            require_uppercase=False,
+            require_lowercase=True,
+            require_numbers=False,
+            require_special=False,
+        )
+
+        assert validator.validate("plainwordsonly") == (True, [])
+
+    def test_special_characters(self):
+        """Test that every listed special character satisfies the rule."""
+        for char in SPECIAL_CHARACTERS:
+            _, errors = password_validator.validate(f"Tr0ub4dorZx{char}")
+
+            assert "Password must contain at least one special character" not in errors
+
+    @pytest.mark.parametrize(
+        "password, sequential, repeated",
+        [
+            ("xy123z", True, False),
+            ("xyaBcz", True, False),
+            ("13579", False, False),
+            ("ab-c", False, False),
+            ("zzz", False, True),
+            ("zz-z", False, False),
+        ],
+    )
+    def test_sequential_and_repeated_chars(self, password, sequential, repeated):
+        """Test detection of runs like '123'/'aBc' and repeats like 'zzz'."""
+        assert password_validator._has_sequential_chars(password) is sequential
+        assert password_validator._has_repeated_chars(password) is repeated
+
+
+class TestPasswordStrength:
+    """Test strength scoring and suggestions."""
+
+    def test_very_strong_password(self):
+        """Test a long, varied password."""
+        strength, score = password_validator.calculate_strength("Tr0ub4dor&Zx!Qp7w")
+
+        assert strength == PasswordStrength.VERY_STRONG
+        assert score == 100
+
+    def test_very_weak_password(self):
+        """Test that common passwords score zero."""
+        strength, score = password_validator.calculate_strength("password")
+
+        assert strength == PasswordStrength.VERY_WEAK
+        assert score == 0
+
+    def test_suggestions_for_weak_password(self):
+        """Test suggestions for a short lowercase password."""
+        suggestions = password_validator.get_suggestions("abcdef")
+
+        assert "Add uppercase letters for better security" in suggestions
+        assert "Add numbers for better security" in suggestions
+        assert "Add special characters for better security" in suggestions
+        assert "Avoid sequential characters like '123' or 'abc'" in suggestions
+        assert "Add lowercase letters for better security" not in suggestions
+
+    def test_no_suggestions_for_very_strong_password(self):
+        """Test that very strong passwords get no suggestions."""
+        assert password_validator.get_suggestions("Tr0ub4dor&Zx!Qp7w") == []
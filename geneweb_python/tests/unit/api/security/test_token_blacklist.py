@@ -0,0 +1,140 @@
+"""
+Tests for the JWT token blacklist.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from geneweb.api.security.token_blacklist import TokenBlacklist
+
+
+@pytest.fixture
+def blacklist():
+    """Create an empty blacklist."""
+    return TokenBlacklist()
+
+
+def _in(seconds: int) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+class TestTokenBlacklist:
+    """Test TokenBlacklist behavior."""
+
+    def test_add_and_check_token(self, blacklist):
+        """Test that added tokens are reported as blacklisted."""
+        blacklist.add_token("token-1", _in(60))
+
+        assert blacklist.is_blacklisted("token-1") is True
+        assert blacklist.is_blacklisted("token-2") is False
+
+    def test_expired_tokens_are_cleaned_up(self, blacklist):
+        """Test that expired tokens leave every internal structure."""
+        user_id = uuid4()
+        blacklist.add_token("valid", _in(60), user_id)
+        blacklist.add_token("expired", _in(30), user_id)
+
+        with patch("geneweb.api.security.token_blacklist.datetime") as mock_dt:
+            mock_dt.now.return_value = _in(45)
+            assert blacklist._cleanup_expired() == 1
+
+        assert blacklist.is_blacklisted("expired") is False
+        assert blacklist.is_blacklisted("valid") is True
+        assert blacklist._user_tokens[user_id] == {"valid"}
+        assert "expired" not in blacklist._token_to_user
+
+    def test_is_blacklisted_cleanup_is_throttled(self, blacklist):
+        """Test that lookups only trigger a cleanup once per interval."""
+        blacklist.add_token("token-1", _in(60))
+
+        with (
+            patch.object(blacklist, "_cleanup_expired", return_value=0) as cleanup,
+            patch("geneweb.api.security.token_blacklist.time.monotonic") as monotonic,
+        ):
+            monotonic.return_value = 1000.0
+            assert blacklist.is_blacklisted("token-1") is True
+            assert blacklist.is_blacklisted("token-1") is True
+            assert blacklist.is_blacklisted("unknown") is False
+            assert cleanup.call_count == 1
+
+            monotonic.return_value = 1000.0 + blacklist._cleanup_interval + 1
+            assert blacklist.is_blacklisted("token-1") is True
+            assert cleanup.call_count == 2
+
+    def test_cleanup_removes_empty_user_entries(self, blacklist):
+        """Test that users without remaining tokens are dropped."""
+        user_id = uuid4()
+        blacklist.add_token("expired", _in(-60), user_id)
+
+        blacklist._cleanup_expired()
+
+        assert user_id not in blacklist._user_tokens
+        assert blacklist.revoke_user_tokens(user_id) == 0
+
+    def test_re_added_token_uses_latest_expiry(self, blacklist):
+        """Test that a stale heap entry does not remove a re-added token."""
+        blacklist.add_token("token-1", _in(30))
+        blacklist.add_token("token-1", _in(60))
+
+        with patch("geneweb.api.security.token_blacklist.datetime") as mock_dt:
+            mock_dt.now.return_value = _in(45)
+            assert blacklist._cleanup_expired() == 0
+
+        assert blacklist.is_blacklisted("token-1") is True
+
+    def test_revoke_user_tokens_counts_tokens(self, blacklist):
+        """Test counting a user's revoked tokens."""
+        user_id = uuid4()
+        blacklist.add_token("token-1", _in(60), user_id)
+        blacklist.add_token("token-2", _in(60), user_id)
+
+        assert blacklist.revoke_user_tokens(user_id) == 2
+        assert blacklist.revoke_user_tokens(uuid4()) == 0
+
+    def test_get_stats(self, blacklist):
+        """Test blacklist statistics."""
+        soon, later = _in(60), _in(120)
+        blacklist.add_token("token-1", later, uuid4())
+        blacklist.add_token("token-2", soon)
+
+        stats = blacklist.get_stats()
+
+        assert stats == {
+            "total_blacklisted": 2,
+            "total_users_with_revoked_tokens": 1,
+            "oldest_token_expires": soon.isoformat(),
+            "newest_token_expires": later.isoformat(),
+        }
+
+    def test_get_stats_after_expiry(self, blacklist):
+        """Test that stats skip expired and replaced entries."""
+        blacklist.add_token("token-1", _in(30))
+        blacklist.add_token("token-2", _in(40))
+        blacklist.add_token("token-2", _in(90))
+
+        with patch("geneweb.api.security.token_blacklist.datetime") as mock_dt:
+            mock_dt.now.return_value = _in(35)
+            stats = blacklist.get_stats()
+
+        assert stats["total_blacklisted"] == 1
+        assert stats["oldest_token_expires"] == stats["newest_token_expires"]
+
+    def test_get_stats_empty(self, blacklist):
+        """Test stats for an empty blacklist."""
+        stats = blacklist.get_stats()
+
+        assert stats["oldest_token_expires"] is None
+        assert stats["newest_token_expires"] is None
+
+    def test_clear_all(self, blacklist):
+        """Test clearing the blacklist."""
+        blacklist.add_token("token-1", _in(60), uuid4())
+
+        blacklist.clear_all()
+
+        assert blacklist.is_blacklisted("token-1") is False
+        assert blacklist.get_stats()["total_blacklisted"] == 0
+        assert blacklist._expiry_heap == []
@@ -0,0 +1,87 @@
+"""
+Tests for FamilyService helpers that do not need a database.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from geneweb.api.models.family import (
+    DivorceStatus,
+    FamilyEventName,
+    RelationKind,
+    WitnessKind,
+)
+from geneweb.api.services.family_service import FamilyService, _parse_ymd
+from geneweb.core.family import WitnessKind as CoreWitnessKind
+from geneweb.db.database import Database
+
+
+@pytest.fixture
+def service():
+    """Create service with mock database."""
+    return FamilyService(Mock(spec=Database))
+
+
+class TestEnumConversion:
+    """Test API to core enum conversions."""
+
+    @pytest.mark.parametrize(
+        "api_enum, convert",
+        [
+            (RelationKind, "_convert_relation_kind"),
+            (DivorceStatus, "_convert_divorce_status"),
+            (FamilyEventName, "_convert_event_name"),
+            (WitnessKind, "_convert_witness_kind"),
+        ],
+    )
+    def test_every_api_member_is_converted(self, service, api_enum, convert):
+        """Every API member maps to the core member with the same meaning."""
+        for member in api_enum:
+            core = getattr(service, convert)(member)
+
+            assert core.name.replace("_", "") == member.name.replace("_", "")
+
+    def test_witness_kind_round_trip(self, service):
+        """Core witness kinds map back to the API values they came from."""
+        for member in WitnessKind:
+            core = service._convert_witness_kind(member)
+
+            assert isinstance(core, CoreWitnessKind)
+            assert service._WITNESS_KIND_TO_API[core] is member
+
+
+class TestResolvePersons:
+    """Test ID to person resolution."""
+
+    def test_resolve_persons_keeps_order_and_skips_missing(self, service):
+        """Known IDs resolve in order; invalid and unknown ones are dropped."""
+        first, second = Mock(), Mock()
+        service.db.get_persons.return_value = {1: first, 2: second}
+
+        persons = service._get_persons_by_ids(["2", "x"], None, ["1", "9"])
+        resolved = service._resolve_persons(["2", "x", "9", "1"], persons, "child")
+
+        service.db.get_persons.assert_called_once_with({1, 2, 9})
+        assert resolved == [second, first]
+
+
+class TestParseYmd:
+    """Test YYYY-MM-DD date parsing."""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("1995-06-15", (1995, 6, 15)),
+            ("1850-00-00", (1850, 0, 0)),
+            ("1850-6-1", (1850, 6, 1)),
+            ("2021-02-30", (2021, 2, 30)),
+            ("1995", None),
+            ("19950615", None),
+            ("2021-W01-1", None),
+            ("abcd-ef-gh", None),
+        ],
+    )
+    def test_parse_ymd(self, value, expected):
+        """Full, partial and unpadded dates parse; other strings do not."""
+        assert _parse_ymd(value) == expected
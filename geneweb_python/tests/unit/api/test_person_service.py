@@ -0,0 +1,397 @@
+"""
+Tests for PersonService in-memory storage and listing.
+"""
+
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from geneweb.api.models.person import (
+    GDPRConsent,
+    GDPRConsentStatus,
+    PersonSearchFilters,
+    PersonSummary,
+)
+from geneweb.api.services.person_service import PersonService
+
+
+@pytest.fixture(autouse=True)
+def mock_encryption():
+    """Store sensitive fields as plaintext to avoid requiring a master key."""
+    with (
+        patch(
+            "geneweb.api.services.person_service.encrypt_sensitive_data_batch",
+            side_effect=list,
+        ),
+        patch(
+            "geneweb.api.services.person_service.decrypt_sensitive_data_batch",
+            side_effect=list,
+        ) as decrypt,
+    ):
+        yield decrypt
+
+
+@pytest.fixture
+def service():
+    """Create service without a database."""
+    return PersonService()
+
+
+def _context(role: str = "admin") -> Mock:
+    context = Mock()
+    context.user.role.value = role
+    context.user.family_person_id = None
+    context.user.related_person_ids = []
+    return context
+
+
+async def _create(service, first_name, last_name, birth_date=None, **extra):
+    data = {"first_name": first_name, "last_name": last_name, **extra}
+    if birth_date:
+        data["birth_date"] = birth_date
+    return await service.create_person(data, uuid4(), _context())
+
+
+class TestListPersons:
+    """Test filtering, sorting and pagination."""
+
+    @pytest.mark.asyncio
+    async def test_sort_by_birth_date_and_paginate(self, service):
+        """Dated persons sort and page correctly; dates come back as strings."""
+        await _create(service, "Alice", "Durand", "1950-01-15")
+        await _create(service, "Bob", "Robert", "1990-05-20")
+        await _create(service, "Claire", "Petit", "1970-03-10")
+
+        filters = PersonSearchFilters(
+            page=1, page_size=2, sort_by="birth_date", sort_order="desc"
+        )
+        result = await service.list_persons(filters, _context())
+
+        assert result.total == 3
+        assert result.total_pages == 2
+        assert result.has_next is True
+        assert [p.first_name for p in result.items] == ["Bob", "Claire"]
+        assert result.items[0].birth_date == "1990-05-20"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    async def test_later_pages_of_selected_sort(self, service, sort_order):
+        """Pages of a partial selection match slices of a full stable sort."""
+        years = [1950, 1940, 1960, 1940, 1970, 1950, 1930]
+        for number, year in enumerate(years):
+            await _create(service, "Alice", f"Name{number}", f"{year}-01-01")
+
+        filters = PersonSearchFilters(sort_by="birth_date", sort_order=sort_order)
+        expected = sorted(
+            service._index,
+            key=service._birth_date_sort_key,
+            reverse=sort_order == "desc",
+        )
+        pages = []
+        for page in (1, 2, 3):
+            filters = filters.model_copy(update={"page": page, "page_size": 3})
+            result = await service.list_persons(filters, _context())
+            pages.extend(p.id for p in result.items)
+
+        assert pages == expected
+
+    @pytest.mark.asyncio
+    async def test_filters_and_sort_by_last_name(self, service):
+        """Prefix filters apply before last name sorting."""
+        await _create(service, "Alice", "Petit")
+        await _create(service, "Alain", "Durand")
+        await _create(service, "Bob", "Robert")
+
+        filters = PersonSearchFilters(first_name="al")
+        result = await service.list_persons(filters, _context())
+
+        assert [p.last_name for p in result.items] == ["Durand", "Petit"]
+
+    @pytest.mark.asyncio
+    async def test_summaries_match_validated_models(self, service):
+        """Summaries built without validation equal validated ones."""
+        await _create(service, "Alice", "Durand", "1950-01-15", sex="female")
+
+        result = await service.list_persons(PersonSearchFilters(), _context())
+        summary = result.items[0]
+
+        assert summary == PersonSummary(**summary.model_dump())
+        assert summary.model_dump()["birth_date"] == "1950-01-15"
+
+    @pytest.mark.asyncio
+    async def test_only_page_is_decrypted(self, service, mock_encryption):
+        """Filtering uses the plaintext index; decryption is limited to the page."""
+        for year in range(1950, 1960):
+            await _create(service, "Alice", f"Name{year}", f"{year}-01-01")
+        mock_encryption.reset_mock()
+
+        filters = PersonSearchFilters(birth_year_min=1952, page_size=3)
+        result = await service.list_persons(filters, _context())
+
+        assert result.total == 8
+        assert [p.last_name for p in result.items] == [
+            "Name1952",
+            "Name1953",
+            "Name1954",
+        ]
+        assert mock_encryption.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, service):
+        """Updated names, kept birth years and soft deletes reach the index."""
+        person = await _create(service, "Alice", "Durand", "1950-01-15")
+        await service.update_person(
+            person.id, {"first_name": "Alicia"}, uuid4(), _context()
+        )
+
+        filters = PersonSearchFilters(first_name="alicia", birth_year_max=1950)
+        result = await service.list_persons(filters, _context("viewer"))
+        assert [p.first_name for p in result.items] == ["Alicia"]
+
+        await service.soft_delete_person(person.id, _context())
+
+        assert (await service.list_persons(filters, _context("viewer"))).total == 0
+        assert (await service.list_persons(filters, _context())).total == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    async def test_last_name_view_matches_stable_sort(self, service, sort_order):
+        """The presorted view lists persons as a stable sort by last name would."""
+        names = ["Petit", "Durand", "Petit", "martin", "Durand", "Zola"]
+        persons = [await _create(service, "Alice", name) for name in names]
+        await service.update_person(
+            persons[5].id, {"last_name": "Dupont"}, uuid4(), _context()
+        )
+
+        filters = PersonSearchFilters(sort_order=sort_order, page_size=100)
+        result = await service.list_persons(filters, _context())
+
+        expected = sorted(
+            service._index,
+            key=lambda person_id: service._index[person_id]["last_name"],
+            reverse=sort_order == "desc",
+        )
+        assert service._indexed_candidates(filters) is None
+        assert [p.id for p in result.items] == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "criteria",
+        [
+            {"last_name": "du"},
+            {"first_name": "al", "sex": "female"},
+            {"birth_year_min": 1960, "birth_year_max": 1980},
+            {"last_name": "d", "birth_year_max": 1955},
+            {"sex": "male", "last_name": "zz"},
+        ],
+    )
+    async def test_indexed_lookup_matches_full_scan(self, service, criteria):
+        """Index lookups give the same persons, in order, as a full scan."""
+        await _create(service, "Alice", "Durand", "1950-01-15", sex="female")
+        await _create(service, "Albert", "Dupont", "1970-02-01", sex="male")
+        await _create(service, "Alix", "Dubois", sex="female")
+        removed = await _create(service, "Alma", "Durand", "1975-05-05")
+        await _create(service, "Bob", "Martin", "1965-07-07", sex="male")
+        await service.hard_delete_person(removed.id, _context())
+
+        filters = PersonSearchFilters(sort_by="none", **criteria)
+        result = await service.list_persons(filters, _context())
+
+        expected = [
+            person_id
+            for person_id, entry in service._index.items()
+            if service._matches_filters(entry, filters)
+        ]
+        assert service._indexed_candidates(filters) is not None
+        assert [p.id for p in result.items] == expected
+
+
+class TestGetPerson:
+    """Test single person reads."""
+
+    @pytest.mark.asyncio
+    async def test_response_is_cached_per_role(self, service, mock_encryption):
+        """Repeated reads reuse the validated response until the person changes."""
+        person = await _create(service, "Alice", "Durand", "1950-01-15")
+        mock_encryption.reset_mock()
+
+        first = await service.get_person(person.id, _context("viewer"))
+        second = await service.get_person(person.id, _context("viewer"))
+
+        assert mock_encryption.call_count == 1
+        assert second == first
+        assert second is not first
+
+        await service.update_person(
+            person.id, {"first_name": "Alicia"}, uuid4(), _context()
+        )
+        updated = await service.get_person(person.id, _context("viewer"))
+
+        assert updated.first_name == "Alicia"
+        assert updated.birth_date == "1950-01-15"
+
+    @pytest.mark.asyncio
+    async def test_family_responses_are_not_cached(self, service):
+        """Family access depends on the user, so it bypasses the cache."""
+        person = await _create(service, "Alice", "Durand")
+
+        await service.get_person(person.id, _context("family"))
+
+        assert service._response_cache == {}
+
+
+class TestSaving:
+    """Test coalescing of Geneweb database saves."""
+
+    @pytest.mark.asyncio
+    async def test_burst_of_writes_is_saved_once(self, service):
+        """Writes close together are saved by a single delayed save."""
+        with patch.object(service, "_save_to_geneweb_db", AsyncMock()) as save:
+            person = await _create(service, "Alice", "Durand")
+            await _create(service, "Bob", "Martin")
+            await service.soft_delete_person(person.id, _context())
+            assert save.await_count == 0
+
+            await asyncio.sleep(0.1)
+            assert save.await_count == 1
+
+            await service.flush()
+            assert save.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_saves_pending_writes(self, service):
+        """flush saves immediately and the delayed save then has nothing to do."""
+        with patch.object(service, "_save_to_geneweb_db", AsyncMock()) as save:
+            await _create(service, "Alice", "Durand")
+            await service.flush()
+            assert save.await_count == 1
+
+            await service._save_task
+            assert save.await_count == 1
+
+
+class TestRecordHelpers:
+    """Test encryption and access filtering of person records."""
+
+    def test_encrypt_decrypt_round_trip(self, service):
+        """Only set sensitive fields are encrypted, and they decrypt back."""
+        record = {"first_name": "Alice", "birth_date": "1950-01-15", "email": None}
+
+        encrypted = service._encrypt_person_data(record)
+        decrypted = service._decrypt_person_data(encrypted)
+
+        assert encrypted == {
+            "first_name": "Alice",
+            "email": None,
+            "birth_date_encrypted": "1950-01-15",
+        }
+        assert decrypted == {
+            "first_name": "Alice",
+            "email": None,
+            "birth_date": date(1950, 1, 15),
+        }
+        assert record["birth_date"] == "1950-01-15"
+
+    @pytest.mark.parametrize(
+        "stored, expected",
+        [
+            ("1950-01-15", date(1950, 1, 15)),
+            ("1950-01-15T10:30:00Z", date(1950, 1, 15)),
+            ("1950", "1950"),
+            ("1950-13-45", "1950-13-45"),
+        ],
+    )
+    def test_decrypted_dates(self, service, stored, expected):
+        """Stored dates and timestamps become dates; other values stay strings."""
+        decrypted = service._decrypt_person_data({"death_date_encrypted": stored})
+
+        assert decrypted == {"death_date": expected}
+
+    def test_family_view_of_other_person(self, service):
+        """Family members see other families' contact and place fields as None."""
+        record = {"id": uuid4(), "first_name": "Alice", "email": "a@example.com"}
+
+        filtered = service._filter_person_data_by_access_level(
+            record, _context("family")
+        )
+
+        assert filtered == {**record, "email": None}
+        assert record["email"] == "a@example.com"
+
+    def test_access_filters_per_role(self, service):
+        """Each role's filter is built once and applied to many records."""
+        relative = {"id": uuid4(), "first_name": "Bob", "email": "b@example.com"}
+        context = _context("family")
+        context.user.related_person_ids = [relative["id"]]
+
+        family_filter = service._build_access_filter(context)
+        public_filter = service._build_access_filter(_context("viewer"))
+        editor_filter = service._build_access_filter(_context("editor"))
+
+        assert family_filter(relative) is relative
+        assert public_filter(relative) == {"id": relative["id"], "first_name": "Bob"}
+        assert editor_filter(relative) is relative
+
+
+class TestUpdatePerson:
+    """Test partial updates of encrypted records."""
+
+    @pytest.mark.asyncio
+    async def test_only_updated_sensitive_fields_are_encrypted(self, service):
+        """Untouched ciphertext is kept; cleared fields lose their ciphertext."""
+        person = await _create(
+            service, "Alice", "Durand", "1950-01-15", birth_place="Paris"
+        )
+        stored = service._persons[person.id]
+
+        with patch(
+            "geneweb.api.services.person_service.encrypt_sensitive_data_batch",
+            side_effect=list,
+        ) as encrypt:
+            updated = await service.update_person(
+                person.id,
+                {"email": "alice@example.com", "birth_place": None},
+                uuid4(),
+                _context(),
+            )
+
+        encrypt.assert_called_once_with(["alice@example.com"])
+        assert "birth_place_encrypted" not in service._persons[person.id]
+        assert (
+            service._persons[person.id]["birth_date_encrypted"]
+            is stored["birth_date_encrypted"]
+        )
+        assert updated.birth_place is None
+        assert updated.birth_date == "1950-01-15"
+
+
+class TestUpdateConsent:
+    """Test GDPR consent updates."""
+
+    @pytest.mark.asyncio
+    async def test_update_consent_stamps_and_sets_status(self, service):
+        """Consents get one timestamp and the person's status follows them."""
+        person = await _create(service, "Alice", "Durand")
+        consents = [
+            GDPRConsent(purpose="research", status=GDPRConsentStatus.WITHDRAWN),
+            GDPRConsent(purpose="display", status=GDPRConsentStatus.GRANTED),
+        ]
+
+        await service.update_consent(person.id, consents, uuid4(), "127.0.0.1")
+
+        assert consents[0].withdrawn_at == consents[1].granted_at
+        assert consents[1].ip_address == "127.0.0.1"
+        assert service._persons[person.id]["consent_status"] == "granted"
+        assert await service.get_consent_history(person.id) == consents
+
+        await service.update_consent(
+            person.id,
+            [GDPRConsent(purpose="display", status=GDPRConsentStatus.WITHDRAWN)],
+            uuid4(),
+        )
+
+        assert service._persons[person.id]["has_valid_consent"] is False
+        assert service._persons[person.id]["consent_status"] == "withdrawn"
@@ -2,13 +2,17 @@
 Tests for secrets management module
 """
 
+import base64
 import hashlib
 
 import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from geneweb.api.security.secrets import (
     CertificatePinning,
     SecretsManager,
+    _derive_fernet,
     cert_pinning,
     get_certificate_pinning,
     get_secrets_manager,
@@ -46,6 +50,22 @@ class TestSecretsManager:
         decrypted = manager.decrypt_secret(encrypted)
         assert decrypted == secret
 
+    def test_encrypted_secret_is_fernet_token(self):
+        """Test that secrets are stored as plain Fernet tokens"""
+        manager = SecretsManager()
+
+        encrypted = manager.encrypt_secret("my_secret")
+
+        assert manager._get_fernet().decrypt(encrypted.encode()) == b"my_secret"
+
+    def test_decrypt_legacy_double_encoded_secret(self):
+        """Test that secrets encrypted with the old double encoding still decrypt"""
+        manager = SecretsManager()
+        token = manager._get_fernet().encrypt(b"legacy_secret")
+        legacy = base64.urlsafe_b64encode(token).decode()
+
+        assert manager.decrypt_secret(legacy) == "legacy_secret"
+
     def test_encrypt_different_secrets_produce_different_ciphertexts(self):
         """Test that different secrets produce different encrypted values"""
         manager = SecretsManager()
@@ -147,6 +167,21 @@ class TestSecretsManager:
 
         assert hash1["hash"] == hash2["hash"]
 
+    def test_hash_password_matches_pbkdf2hmac(self):
+        """Test that hashes stay compatible with those made by PBKDF2HMAC"""
+        manager = SecretsManager()
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=b"fixed_salt",
+            iterations=100000,
+        )
+        expected = base64.urlsafe_b64encode(kdf.derive(b"test_password")).decode()
+
+        result = manager.hash_password("test_password", salt="fixed_salt")
+
+        assert result["hash"] == expected
+
     def test_verify_password_correct(self):
         """Test password verification with correct password"""
         manager = SecretsManager()
@@ -178,6 +213,19 @@ class TestSecretsManager:
         incomplete_hash = {"hash": "some_hash"}  # Missing salt
         assert manager.verify_password("any_password", incomplete_hash) is False
 
+    def test_verify_password_uses_stored_iterations(self):
+        """Test that verification uses the iteration count stored with the hash"""
+        manager = SecretsManager()
+        hash_bytes = hashlib.pbkdf2_hmac("sha256", b"old_password", b"salt", 1000, 32)
+        stored_hash = {
+            "hash": base64.urlsafe_b64encode(hash_bytes).decode(),
+            "salt": "salt",
+            "iterations": "1000",
+        }
+
+        assert manager.verify_password("old_password", stored_hash) is True
+        assert manager.verify_password("new_password", stored_hash) is False
+
     def test_generate_api_key(self):
         """Test API key generation"""
         manager = SecretsManager()
@@ -253,6 +301,12 @@ class TestSecretsManager:
         wrong_key = "gw_wrong_key_12345678"
         assert manager.verify_api_key(wrong_key, stored_hash) is False
 
+    def test_verify_api_key_with_malformed_hash(self):
+        """Test API key verification against a non-hex stored hash"""
+        manager = SecretsManager()
+
+        assert manager.verify_api_key("gw_any_key", "not-a-hex-hash") is False
+
     def test_fernet_instance_reuse(self):
         """Test that Fernet instance is reused for efficiency"""
         manager = SecretsManager()
@@ -264,6 +318,17 @@ class TestSecretsManager:
 
         assert fernet1 is fernet2
 
+    def test_fernet_key_derivation_shared_between_instances(self):
+        """Test that key derivation runs once per master key"""
+        _derive_fernet.cache_clear()
+
+        first = SecretsManager(master_key="shared_key")
+        second = SecretsManager(master_key="shared_key")
+
+        assert first._get_fernet() is second._get_fernet()
+        assert _derive_fernet.cache_info().misses == 1
+        assert second.decrypt_secret(first.encrypt_secret("value")) == "value"
+
 
 class TestCertificatePinning:
     """Test CertificatePinning class"""
@@ -353,6 +418,26 @@ class TestCertificatePinning:
         # Should return empty string when no pins configured
         assert header == ""
 
+    def test_get_hpkp_header_updates_after_add_pin(self):
+        """Test that a cached HPKP header is rebuilt when a pin is added"""
+        pinning = CertificatePinning(pins=["pin1"])
+        assert 'pin-sha256="pin2"' not in pinning.get_hpkp_header()
+
+        pinning.add_pin("pin2")
+
+        assert 'pin-sha256="pin2"' in pinning.get_hpkp_header()
+        assert pinning.verify_pin("pin2") is True
+
+    def test_add_pin_does_not_mutate_given_list(self):
+        """Test that add_pin leaves the list passed to the constructor untouched"""
+        pins = ["pin1"]
+        pinning = CertificatePinning(pins=pins)
+
+        pinning.add_pin("pin2")
+
+        assert pins == ["pin1"]
+        assert pinning.pins == ["pin1", "pin2"]
+
     def test_get_hpkp_header_default_max_age(self):
         """Test HPKP header uses default max-age"""
         pins = ["pin1"]
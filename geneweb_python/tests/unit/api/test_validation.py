@@ -2,6 +2,8 @@
 Tests for input validation module
 """
 
+from unittest.mock import patch
+
 import pytest
 from pydantic import ValidationError
 
@@ -50,6 +52,37 @@ class TestInputValidator:
         assert InputValidator.is_safe_input("..\\..\\windows\\system32") is False
         assert InputValidator.is_safe_input("%2e%2e%2f") is False
 
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "John Doe",
+            "Please select a name",
+            "eval this",
+            "Union of families",
+            "O'Brien",
+            "onclick = alert",
+            "javascript alert",
+            "a && b",
+        ],
+    )
+    def test_is_safe_input_matches_full_pattern_scan(self, value):
+        """Test that the trigger-character shortcut agrees with a full scan"""
+        expected = InputValidator._get_combined_pattern().search(value) is None
+        assert InputValidator.is_safe_input(value) is expected
+
+    def test_is_safe_input_memoizes_scan(self):
+        """Test that repeated values reuse the cached pattern scan"""
+        InputValidator._has_no_dangerous_pattern.cache_clear()
+
+        assert InputValidator.is_safe_input("active") is True
+        assert InputValidator.is_safe_input("active") is True
+        assert InputValidator.is_safe_input("DROP TABLE") is False
+        assert InputValidator.is_safe_input("DROP TABLE") is False
+        assert InputValidator.is_safe_input(["unhashable"]) is False
+
+        info = InputValidator._has_no_dangerous_pattern.cache_info()
+        assert (info.hits, info.misses) == (2, 2)
+
     def test_is_safe_input_max_length(self):
         """Test is_safe_input respects max length"""
         long_string = "a" * 1001
@@ -231,9 +264,30 @@ class TestSecureBaseModel:
             name: str
 
         long_string = "a" * 1001
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValidationError, match="exceeds maximum length of 1000"):
             TestModel(name=long_string)
 
+    def test_secure_base_model_assignment_checks_only_changed_field(self):
+        """Test that assignment validates the new value, not every field"""
+
+        class TestModel(SecureBaseModel):
+            name: str
+            note: str
+
+        model = TestModel(name="test", note="ok")
+        with patch.object(
+            InputValidator, "is_safe_input", wraps=InputValidator.is_safe_input
+        ) as is_safe:
+            model.note = "updated"
+            with pytest.raises(ValidationError, match="Field note contains"):
+                model.note = "'; DROP TABLE users; --"
+
+        assert [call.args[0] for call in is_safe.call_args_list] == [
+            "updated",
+            "'; DROP TABLE users; --",
+        ]
+        assert model.note == "updated"
+
     def test_secure_base_model_forbids_extra_fields(self):
         """Test SecureBaseModel forbids extra fields"""
 
@@ -328,6 +382,17 @@ class TestURLModel:
         with pytest.raises(ValidationError):
             URLModel(url="file:///etc/passwd")
 
+    def test_url_model_reports_specific_errors(self):
+        """Test URLModel reports why a URL was rejected"""
+        with pytest.raises(ValidationError, match="URL scheme not allowed"):
+            URLModel(url="gopher://example.com")
+
+        with pytest.raises(ValidationError, match="Invalid domain in URL"):
+            URLModel(url="http://-bad-.example.com/")
+
+        with pytest.raises(ValidationError, match="Invalid URL format"):
+            URLModel(url="http://[::1/")
+
 
 class TestValidateRequestData:
     """Test validate_request_data function"""
@@ -372,6 +437,37 @@ class TestValidateRequestData:
         assert len(result["items"]) == 2
         assert result["items"][0]["name"] == "item1"
 
+    def test_validate_request_data_deeply_nested(self):
+        """Test that deep nesting does not hit the recursion limit"""
+        data = leaf = {}
+        for _ in range(5000):
+            leaf["child"] = {}
+            leaf = leaf["child"]
+        leaf["name"] = "<b>Deep</b>"
+
+        result = validate_request_data(data)
+
+        for _ in range(5000):
+            result = result["child"]
+        assert result == {"name": "bDeep/b"}
+
+    def test_validate_request_data_keeps_field_order(self):
+        """Test that nested values keep their place and key order"""
+        data = {
+            "a": {"x": 1},
+            "items": [{"y": "<i>"}, "tag>", 3, {"z": {"w": True}}],
+            "b": "text",
+        }
+
+        result = validate_request_data(data)
+
+        assert result == {
+            "a": {"x": 1},
+            "items": [{"y": "i"}, "tag", 3, {"z": {"w": True}}],
+            "b": "text",
+        }
+        assert list(result) == ["a", "items", "b"]
+
     def test_validate_request_data_invalid_field_name(self):
         """Test validation rejects invalid field names"""
         data = {"invalid-field": "value"}
@@ -410,3 +506,26 @@ class TestPatternCaching:
 
         assert patterns1 is patterns2
         assert len(patterns1) > 0
+
+    def test_combined_pattern_matches_individual_patterns(self):
+        """Test that the combined pattern flags exactly what the list flags"""
+        samples = [
+            "John Doe",
+            "SELECT * FROM users",
+            "1' OR '1'='1",
+            "name -- comment",
+            "<script>alert(1)</script>",
+            "JavaScript:void(0)",
+            "img onerror = x",
+            "cat file | grep x",
+            "; rm -rf /",
+            "../../etc/passwd",
+            "%2E%2E%2F",
+            "(|(uid=*))",
+            "Saint-Étienne",
+        ]
+        combined = InputValidator._get_combined_pattern()
+
+        for sample in samples:
+            expected = any(p.search(sample) for p in InputValidator._get_patterns())
+            assert bool(combined.search(sample)) is expected
@@ -240,6 +240,65 @@ def test_get_person_by_id(tmp_path):
     assert db.get_person_by_id(999) is None
 
 
+def test_get_persons(tmp_path):
+    db = create_sample_db(tmp_path)
+    db.initialize()
+    db.data["persons"].append(dict(id=3, first_name="Jim", surname="Doe"))
+    persons = db.get_persons([2, 3, 999, 2])
+    assert sorted(persons) == [2, 3]
+    assert persons[2] is db.get_person_by_id(2)
+    assert persons[3].first_name == "Jim"
+    assert db.get_persons([]) == {}
+
+
+def test_query_persons(tmp_path):
+    db = create_sample_db(tmp_path)
+    db.data["persons"][0].birth_date = "1900-05-01"
+    db.data["persons"][1].gender = "female"
+    db.data["persons"].append(
+        dict(id=3, first_name="Jim", surname="Doe", birth_date="1950")
+    )
+
+    def ids(**filters):
+        return [p.id for p in db.query_persons(**filters)]
+
+    assert ids() == [1, 2, 3]
+    assert ids(text="n d") == [1]
+    assert ids(text="SMITH", sex="male") == []
+    assert ids(surname="DO") == [1, 3]
+    assert ids(first_name="j", sex="male") == [1, 3]
+    assert ids(birth_year_from=1901) == [2, 3]
+    assert ids(birth_year_to=1920, surname="doe") == [1]
+
+
+def test_query_persons_uses_name_trigrams(tmp_path):
+    db = create_sample_db(tmp_path)
+
+    assert [p.id for p in db.query_persons(text="ANE SM")] == [2]
+    assert [p.id for p in db.query_persons(surname="xyz")] == []
+    assert db._name_positions(["doe", "joh"]) == {0}
+
+    db.data["persons"].append(Person(id=3, first_name="Jo", surname="Doe"))
+    assert [p.id for p in db.query_persons(surname="doe")] == [1, 3]
+
+    db.data["persons"][2].first_name = "Jane"
+    db.build_indexes()
+    assert [p.id for p in db.query_persons(first_name="jane")] == [2, 3]
+
+
+def test_query_persons_uses_birth_year_index(tmp_path):
+    db = create_sample_db(tmp_path)
+    db.data["persons"][0].birth_date = "1900-05-01"
+    db.data["persons"].append(Person(id=3, first_name="Jim", surname="Doe"))
+
+    assert db._birth_year_positions(1850, 1950) == {0, 1, 2}
+    assert db._birth_year_positions(1901, None) == {1, 2}
+
+    db.data["persons"][1].birth_date = "1920"
+    db.build_indexes()
+    assert [p.id for p in db.query_persons(birth_year_to=1910)] == [1, 3]
+
+
 # Test Database.search_persons_by_name/surname/firstname
 
 